@@ -0,0 +1,123 @@
+"""
+Benchmark of bot response classification: the previous chain of substring checks against the compiled rules
+of BotResponse.classify, on a corpus of kick messages, with the built-in rules and with 50 extra registered rules.
+
+Run from the repository root: python benchmarks/bench_bot_response.py [corpus size]
+"""
+import os
+import random
+import sys
+import time
+from typing import Callable, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from rstatus.utils.response import BotResponse  # noqa: E402
+
+# Kick messages seen by the bot, the most common ones first
+KICK_MESSAGES: List[str] = [
+    'You are not whitelisted on this server!',
+    'multiplayer.disconnect.not_whitelisted',
+    'The server is in online mode',
+    'Connected',
+    'multiplayer.disconnect.incompatible: 1.20.4',
+    'If you wish to use IP forwarding, please enable it in your BungeeCord config as well!',
+    'You have to join through the proxy.',
+    'Unable to authenticate - no data was forwarded by the proxy.',
+    'This server has mods that require Forge to be installed on the client.',
+    'Please disable your VPN or proxy to join this server.',
+    'multiplayer.disconnect.banned.reasonwith: Cheating',
+    '&cThe server is full! &7Buy a rank at &estore.example.net &7to join anytime.',
+    '&c&lExample Network &8» &7Please rejoin to verify that you are not a bot. &8(&7Sentinel check&8)',
+    '&cYou are connecting too fast, please wait a few seconds before reconnecting.',
+    'Server is restarting, join again in a minute!',
+    '&4Maintenance &8| &7We are updating the network to 1.20.4, follow &b@ExampleMC &7for updates.',
+]
+
+
+def legacy_custom_response(bot_response: str) -> str:
+    """ custom_response before the compiled rules """
+    if 'If you wish to use IP forwarding, please enable it in your BungeeCord config as well!' in bot_response:
+        return BotResponse.IP_FORWARDING
+    if 'You have to join through' in bot_response:
+        return BotResponse.IPWHITELIST
+    if 'Unable to authenticate' in bot_response:
+        return BotResponse.BUNGEEGUARD
+    if 'Please join to the server via' in bot_response:
+        return BotResponse.PROTECTED
+    if 'FML/Forge' in bot_response or 'has mods that require Forge' in bot_response:
+        return BotResponse.FORGE
+    if 'VPN' in bot_response:
+        return BotResponse.ANTI_VPN
+    if 'multiplayer.disconnect.invalid_public_key_signature' in bot_response:
+        return BotResponse.PREMIUM
+    if 'multiplayer.disconnect.authservers_down' in bot_response:
+        return BotResponse.AUTHSERVERS_DOWN
+    if 'multiplayer.disconnect.incompatible' in bot_response:
+        return BotResponse.INCOMPATIBLE
+    if 'multiplayer.disconnect.not_whitelisted' in bot_response or 'You are not whitelisted on this server!' in bot_response:
+        return BotResponse.WHITELIST
+    if 'multiplayer.disconnect.banned.reasonwith' in bot_response:
+        return BotResponse.BANNED
+    if bot_response == 'The server is in online mode':
+        return BotResponse.PREMIUM
+    if bot_response == 'Connected':
+        return BotResponse.CONNECTED
+    if bot_response == 'Connected with BungeeHack':
+        return BotResponse.BUNGEEHACK
+    return bot_response
+
+
+def extra_patterns(count: int) -> List[str]:
+    """ Substrings of plugin kick messages, as a user would register them """
+    return [f'Kicked by plugin{index}: reason {index}' for index in range(count)]
+
+
+def chained(patterns: List[str]) -> Callable[[str], str]:
+    """ The previous classifier extended with one substring check per extra pattern """
+    def custom_response(bot_response: str) -> str:
+        response: str = legacy_custom_response(bot_response)
+
+        if response is not bot_response:
+            return response
+
+        for pattern in patterns:
+            if pattern in bot_response:
+                return '&cPlugin'
+
+        return bot_response
+
+    return custom_response
+
+
+def throughput(function: Callable[[str], object], corpus: List[str]) -> float:
+    start: float = time.perf_counter()
+
+    for message in corpus:
+        function(message)
+
+    return len(corpus) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    corpus_size: int = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    corpus: List[str] = random.Random(0).choices(KICK_MESSAGES, weights=range(len(KICK_MESSAGES), 0, -1), k=corpus_size)
+
+    # The results must be the same as the previous classifier
+    assert all(BotResponse.custom_response(message) == legacy_custom_response(message) for message in KICK_MESSAGES)
+
+    print(f'Corpus of {corpus_size} kick messages')
+    print(f'  {"built-in rules, substring chain":>38}: {throughput(legacy_custom_response, corpus) / 1e6:5.2f} M messages/s')
+    print(f'  {"built-in rules, compiled":>38}: {throughput(BotResponse.custom_response, corpus) / 1e6:5.2f} M messages/s')
+    print(f'  {"built-in rules, compiled (classify)":>38}: {throughput(BotResponse.classify, corpus) / 1e6:5.2f} M messages/s')
+
+    patterns: List[str] = extra_patterns(50)
+    BotResponse.register('plugin', '&cPlugin', patterns)
+    print(f'  {"+50 rules, substring chain":>38}: {throughput(chained(patterns), corpus) / 1e6:5.2f} M messages/s')
+    print(f'  {"+50 rules, compiled":>38}: {throughput(BotResponse.custom_response, corpus) / 1e6:5.2f} M messages/s')
+    print(f'  {"+50 rules, compiled (classify)":>38}: {throughput(BotResponse.classify, corpus) / 1e6:5.2f} M messages/s')
+    BotResponse.unregister('plugin')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark of chat component rendering: the previous recursive parse_chat (string concatenation, recursion
+through extra) against the iterative ChatRenderer, on MOTDs shaped like the ones sent by gradient plugins.
+
+Run from the repository root: python benchmarks/bench_chat_renderer.py
+"""
+import os
+import sys
+import timeit
+from typing import Callable, Dict, Tuple, Union
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from rstatus.utils.chat import ChatRenderer  # noqa: E402
+
+
+def recursive_parse_chat(chat_data: Union[Dict, str]) -> str:
+    """ parse_chat before the ChatRenderer """
+    if isinstance(chat_data, str):
+        return chat_data
+
+    elif isinstance(chat_data, dict):
+        text: str = ''
+
+        if 'text' in chat_data:
+            text += chat_data['text']
+
+        if 'extra' in chat_data and isinstance(chat_data['extra'], list):
+            for item in chat_data['extra']:
+                text += recursive_parse_chat(item)
+
+        if 'translate' in chat_data:
+            translate_key = chat_data['translate']
+            with_list = chat_data.get('with', [])
+            translated_text = f"{translate_key}: {' '.join(map(str, with_list))}"
+            text += translated_text
+
+        return text
+
+    else:
+        return str(chat_data)
+
+
+def gradient(text: str, start: int = 0) -> list:
+    """ One component per character with its own hex color, like a gradient plugin """
+    return [{'text': character, 'color': f'#{(start + index * 4) % 256:02x}80ff', 'bold': index % 2 == 0} for index, character in enumerate(text)]
+
+
+def flat_gradient_motd() -> dict:
+    """ Two gradient lines as siblings (about 100 components) """
+    return {'text': '', 'extra': gradient('  Welcome to the Example Network  ') + ['\n'] + gradient('Survival | Skyblock | Factions | Prison | 1.8-1.20', 64)}
+
+
+def nested_gradient_motd() -> dict:
+    """ Gradient where each character is nested in the previous one (about 100 levels) """
+    component: dict = {'text': ''}
+
+    for part in reversed(gradient('Survival | Skyblock | Factions | Prison | Creative | Minigames | 1.8-1.20 | Join now!')):
+        component = {**part, 'extra': [component]}
+
+    return component
+
+
+def deep_motd(depth: int) -> dict:
+    """ Degenerate MOTD nested deeper than the recursion limit """
+    component: dict = {'text': 'x'}
+
+    for _ in range(depth):
+        component = {'text': '', 'extra': [component]}
+
+    return component
+
+
+def bench(name: str, function: Callable[[dict], str], motd: dict, iterations: int) -> None:
+    try:
+        seconds: float = timeit.timeit(lambda: function(motd), number=iterations)
+        print(f'  {name:>22}: {seconds / iterations * 1e6:8.1f} us/MOTD')
+
+    except RecursionError:
+        print(f'  {name:>22}: RecursionError')
+
+
+def main() -> None:
+    # MOTD name -> (MOTD, iterations)
+    motds: Dict[str, Tuple[dict, int]] = {
+        'flat gradient': (flat_gradient_motd(), 5000),
+        'nested gradient': (nested_gradient_motd(), 5000),
+        'nested 5000 levels': (deep_motd(5000), 20),
+    }
+
+    for motd_name, (motd, iterations) in motds.items():
+        print(motd_name, flush=True)
+        bench('recursive parse_chat', recursive_parse_chat, motd, iterations)
+        bench('ChatRenderer.plain', ChatRenderer.plain, motd, iterations)
+        bench('ChatRenderer.legacy', ChatRenderer.legacy, motd, iterations)
+        bench('ChatRenderer.spans', ChatRenderer.spans, motd, iterations)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Throughput benchmark of ClearResponse.clear_response: the previous implementation (whitespace replace and regex,
+then two str.replace passes per MiniMessage code) against the single-scan translation.
+
+Run from the repository root: python benchmarks/bench_clear_response.py
+"""
+import os
+import re
+import sys
+import timeit
+from typing import Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from rstatus.utils.clear import ClearResponse  # noqa: E402
+
+LEGACY_CODES: Dict[str, str] = {
+    '<reset><black>': '0', '<reset><dark_blue>': '1', '<reset><dark_green>': '2', '<reset><dark_aqua>': '3',
+    '<reset><dark_red>': '4', '<reset><dark_purple>': '5', '<reset><gold>': '6', '<reset><gray>': '7',
+    '<reset><dark_gray>': '8', '<reset><blue>': '9', '<reset><green>': 'a', '<reset><aqua>': 'b', '<reset><red>': 'c',
+    '<reset><light_purple>': 'd', '<reset><yellow>': 'e', '<reset><white>': 'f', '<obfuscated>': 'k', '<bold>': 'l',
+    '<strikethrough>': 'm', '<underlined>': 'n', '<italic>': 'o', '<reset>': 'r',
+}
+
+
+def legacy_clear_response(bot_response: str) -> str:
+    """ clear_response before the single-scan translation """
+    bot_response = bot_response.replace('\n', ' ')
+    bot_response = re.sub(r' +', ' ', bot_response)
+
+    for code in LEGACY_CODES.items():
+        bot_response = bot_response.replace(code[0], f'&{code[1]}').replace(code[0], f'&{code[1]}')
+
+    return bot_response.replace('<newline>', '\n')
+
+
+# Typical inputs: MOTDs and version names without tags, bot responses, MiniMessage MOTDs
+CORPUS: Dict[str, List[str]] = {
+    'plain': ['A Minecraft Server', 'Paper 1.20.4', 'Welcome to Example Network | Survival, Skyblock, Factions', 'Connected'],
+    'multiline': ['       Example Network\n    Survival  |  Skyblock  |  Factions', 'You are not whitelisted\n\non this server!'],
+    'minimessage': [
+        '<reset><gold><bold>Example Network</bold><reset><gray> | <reset><aqua>Survival<newline><reset><yellow>Join now!',
+        '<reset><red>You are banned from this server.<newline><reset><gray>Reason: <reset><white>Cheating',
+    ],
+}
+
+
+def main() -> None:
+    iterations: int = 20000
+
+    for name, strings in CORPUS.items():
+        print(name)
+
+        for function in (legacy_clear_response, ClearResponse.clear_response):
+            seconds: float = timeit.timeit(lambda: [function(string) for string in strings], number=iterations)
+            print(f'  {function.__qualname__:>28}: {iterations * len(strings) / seconds / 1e6:6.2f} M strings/s')
+
+
+if __name__ == '__main__':
+    main()
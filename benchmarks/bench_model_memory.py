@@ -0,0 +1,131 @@
+"""
+Memory benchmark of the result models: bytes retained per JavaServerResponse with the previous models
+(dataclasses with a __dict__, full raw response kept) against the slotted models, with and without
+the raw response, player sample and mod list.
+
+The results are measured on a sample of the scan and extrapolated to a 1M-result scan.
+
+Run from the repository root: python benchmarks/bench_model_memory.py [sample size]
+"""
+import json
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from rstatus import RStatusClient  # noqa: E402
+
+SCAN_SIZE: int = 1_000_000
+
+
+# Models before they were slotted
+@dataclass
+class LegacyMOTD:
+    text: str
+    original: str
+
+
+@dataclass
+class LegacyVersion:
+    text: str
+    original: str
+    protocol: int
+    version_name: str
+
+
+@dataclass
+class LegacyPlayers:
+    online: int
+    max: int
+    players: str
+    sample: list
+
+
+@dataclass
+class LegacyModInfo:
+    type: str
+    mod_list: list
+
+
+@dataclass
+class LegacyJavaServerResponse:
+    ip_address: str
+    port: int
+    motd: LegacyMOTD
+    version: LegacyVersion
+    players: LegacyPlayers
+    mod_info: LegacyModInfo
+    favicon: str
+    ping: int
+    bot_response: str
+    brand: str
+    plugin_channels: str
+    raw_response: dict
+
+
+def build_status_json(index: int) -> str:
+    """ Build the status JSON of a typical server (small player sample, a few mods, no favicon) """
+    status: dict = {
+        'version': {'name': 'Paper 1.20.4', 'protocol': 765},
+        'players': {'online': 12, 'max': 100, 'sample': [{'name': f'player{index}_{i}', 'id': f'{index:016x}{i:016x}'} for i in range(5)]},
+        'description': {'text': f'Server {index} ', 'extra': [{'text': 'survival', 'color': 'gold', 'bold': True}]},
+        'modinfo': {'type': 'FML', 'modList': [{'modid': f'mod{i}', 'version': '1.0.0'} for i in range(10)]},
+    }
+    return json.dumps(status)
+
+
+def to_legacy(client: RStatusClient, status_json: str) -> LegacyJavaServerResponse:
+    """ Build the server data with the previous models """
+    server_data = client._build_status_response(json.loads(status_json), '')
+    return LegacyJavaServerResponse(
+        ip_address=server_data.ip_address,
+        port=server_data.port,
+        motd=LegacyMOTD(server_data.motd.text, server_data.motd.original),
+        version=LegacyVersion(server_data.version.text, server_data.version.original, server_data.version.protocol, server_data.version.version_name),
+        players=LegacyPlayers(server_data.players.online, server_data.players.max, server_data.players.players, server_data.players.sample),
+        mod_info=LegacyModInfo(server_data.mod_info.type, server_data.mod_info.mod_list),
+        favicon=server_data.favicon,
+        ping=server_data.ping,
+        bot_response=server_data.bot_response,
+        brand=server_data.brand,
+        plugin_channels=server_data.plugin_channels,
+        raw_response=server_data.raw_response,
+    )
+
+
+def measure(build: Callable[[str], object], status_jsons: List[str]) -> float:
+    """ Measure the memory retained by the results, in bytes per result """
+    tracemalloc.start()
+    before: int = tracemalloc.get_traced_memory()[0]
+    results: list = [build(status_json) for status_json in status_jsons]
+    retained: int = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del results
+    return retained / len(status_jsons)
+
+
+def main() -> None:
+    sample_size: int = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    status_jsons: List[str] = [build_status_json(index) for index in range(sample_size)]
+
+    full_client: RStatusClient = RStatusClient('127.0.0.1:25565')
+    compact_client: RStatusClient = RStatusClient('127.0.0.1:25565', retain_raw_response=False, retain_sample=False, retain_mod_list=False)
+
+    cases: list = [
+        ('dataclasses, everything retained (before)', lambda status_json: to_legacy(full_client, status_json)),
+        ('slotted, everything retained', lambda status_json: full_client._build_status_response(json.loads(status_json), '')),
+        ('slotted, no raw response/sample/mod list', lambda status_json: compact_client._build_status_response(json.loads(status_json), '')),
+    ]
+
+    print(f'Sample of {sample_size} results, extrapolated to a {SCAN_SIZE:,} result scan')
+
+    for name, build in cases:
+        bytes_per_result: float = measure(build, status_jsons)
+        print(f'{name:45s} {bytes_per_result:8.0f} bytes/result  {bytes_per_result * SCAN_SIZE / 1024 ** 3:6.2f} GiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Micro-benchmark of status packet decoding: slicing the data before each field read
+(the previous approach) against the PacketReader cursor.
+
+Run from the repository root: python benchmarks/bench_packet_reader.py
+"""
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from rstatus.packets.base import MinecraftPacket  # noqa: E402
+from rstatus.packets.reader import PacketReader  # noqa: E402
+
+
+def build_status_packet() -> bytes:
+    """ Build a large status response packet (big favicon and mod list) """
+    status: dict = {
+        'version': {'name': 'Forge 1.20.1', 'protocol': 763},
+        'players': {'online': 120, 'max': 500, 'sample': [{'name': f'player{i}', 'id': f'{i:032x}'} for i in range(12)]},
+        'description': {'text': 'A modded server'},
+        'modinfo': {'type': 'FML', 'modList': [{'modid': f'mod{i}', 'version': '1.0.0'} for i in range(400)]},
+        'favicon': 'data:image/png;base64,' + 'A' * 20000,
+    }
+    return MinecraftPacket.encode_varint(0x00) + MinecraftPacket.encode_string_varint(json.dumps(status))
+
+
+def decode_with_slices(data: bytes) -> str:
+    _, index = MinecraftPacket.read_varint_from_data(data)
+    response_json, _ = MinecraftPacket.read_string_from_data(data[index:])
+    return response_json
+
+
+def decode_with_reader(data: bytes) -> str:
+    reader: PacketReader = PacketReader(data)
+    reader.read_varint()
+    return reader.read_string()
+
+
+def peak_allocation(function, data: bytes) -> int:
+    """ Peak memory allocated by a single call, in bytes """
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    function(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    data: bytes = build_status_packet()
+    iterations: int = 2000
+    print(f'Status packet size: {len(data)} bytes')
+
+    for name, function in (('slices', decode_with_slices), ('PacketReader', decode_with_reader)):
+        seconds: float = timeit.timeit(lambda: function(data), number=iterations)
+        print(f'{name:>12}: {seconds / iterations * 1e6:8.1f} us/packet, peak allocation {peak_allocation(function, data):>8} bytes')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,9 @@
 from .main_client import RStatusClient
+from .async_main_client import AsyncRStatusClient
+from .handlers import BedrockSweeper, ConnectSweeper
 from .protocol.version import ProtocolVersion
+from .utils.proxy_pool import Proxy, ProxyPool
+from .utils.targets import TargetGenerator
+from .utils.timeouts import AdaptiveTimeouts, Timeouts
 
-__all__ = ['RStatusClient', 'ProtocolVersion']
+__all__ = ['RStatusClient', 'AsyncRStatusClient', 'BedrockSweeper', 'ConnectSweeper', 'ProtocolVersion', 'Proxy', 'ProxyPool', 'TargetGenerator', 'Timeouts', 'AdaptiveTimeouts']
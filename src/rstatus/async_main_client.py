@@ -0,0 +1,350 @@
+import asyncio
+import copy
+from typing import Awaitable, Callable, FrozenSet, Iterable, Optional, Set, Tuple, Union
+
+from .utils.async_client import AsyncMinecraftClient
+from .utils.framing import MAX_PACKET_SIZE
+from .utils.compression import CompressionHandler
+from .utils.proxy_pool import ProxyPool
+from .utils.resolver import Resolver
+from .utils.result_cache import ResultCache
+from .utils.timeouts import AdaptiveTimeouts, Timeouts
+from .handlers import AsyncJavaHandler, AsyncBedrockHandler
+from .handlers.java_handler import FAVICON_MODES
+from .models import JavaServerResponse, BedrockServerResponse
+
+
+class AsyncRStatusClient(AsyncMinecraftClient, AsyncJavaHandler, AsyncBedrockHandler):
+    # Background refreshes of stale cached results, referenced until they end
+    _revalidations: Set[asyncio.Task] = set()
+
+    def __init__(
+        self,
+        target: str,
+        timeout: int = 5,
+        bungeehack: bool = False,
+        proxy_type: Optional[str] = None,
+        proxy_address: Optional[str] = None,
+        proxy_port: Optional[int] = None,
+        debug: bool = False,
+        max_packet_size: int = MAX_PACKET_SIZE,
+        result_cache: Optional[ResultCache] = None,
+        favicon: str = 'inline',
+        retain_raw_response: bool = True,
+        retain_sample: bool = True,
+        retain_mod_list: bool = True,
+        proxy_pool: Optional[ProxyPool] = None,
+        timeouts: Union[Timeouts, AdaptiveTimeouts, None] = None,
+    ) -> None:
+        """
+        asyncio version of RStatusClient.
+        The target is resolved on the first query, so the client can be created outside of the event loop.
+        """
+        self.target: str = target
+        self.server_port: Optional[int] = None
+        self.resolved: bool = False
+        self.result_cache: Optional[ResultCache] = result_cache
+
+        if favicon not in FAVICON_MODES:
+            raise ValueError(f'Invalid favicon mode: {favicon} (expected one of {", ".join(FAVICON_MODES)})')
+
+        self.target, self.server_port = Resolver.split_target(target)
+
+        # Initialize AsyncMinecraftClient
+        AsyncMinecraftClient.__init__(
+            self,
+            server_address=self.target,
+            server_port=self.server_port,
+            timeout=timeout,
+            bungeehack=bungeehack,
+            proxy_type=proxy_type,
+            proxy_address=proxy_address,
+            proxy_port=proxy_port,
+            debug=debug,
+            max_packet_size=max_packet_size,
+            proxy_pool=proxy_pool,
+            timeouts=timeouts
+        )
+
+        # Initialize AsyncJavaHandler
+        AsyncJavaHandler.__init__(self, self)
+
+        # Initialize AsyncBedrockHandler
+        AsyncBedrockHandler.__init__(self, self)
+
+        # Fields of the server data that are kept
+        self.favicon_mode = favicon
+        self.retain_raw_response = retain_raw_response
+        self.retain_sample = retain_sample
+        self.retain_mod_list = retain_mod_list
+
+    async def resolve(self) -> None:
+        """
+        This method is used to resolve the target address and port.
+        It is called automatically by the query methods.
+        """
+        if self.resolved:
+            return
+
+        target: str = self.target if self.server_port is None else f'{self.target}:{self.server_port}'
+        endpoint: Optional[Tuple[str, int]] = await Resolver.async_resolve_endpoint(target)
+
+        if endpoint is None:
+            raise ValueError(f'Could not resolve domain: {self.target}')
+
+        self.server_address, self.server_port = endpoint
+        self.resolved = True
+
+    async def get_server_data(
+        self,
+        bot: bool = True,
+        race: bool = False,
+        fields: Optional[Iterable[str]] = None
+    ) -> Union[JavaServerResponse, BedrockServerResponse, None]:
+        """
+        This method is used to get the status of a server.
+        By default the Java edition is queried first and the Bedrock edition only if it fails.
+        With race, both editions are queried at the same time and the first valid response is returned.
+
+        :param bool bot: Determines if the bot connection should be used.
+        :param bool race: Determines if both editions should be queried concurrently.
+        :param Optional[Iterable[str]] fields: The Java fields to build ("players.online", "version"...), every field if not provided.
+        :return Union[JavaServerResponse, BedrockServerResponse]: The server status data.
+        """
+        fields = self.projection(fields)
+        bot = bot and self._wants(fields, 'bot_response')
+
+        if self.result_cache is not None:
+            return await self._cached_server_data(bot=bot, race=race, fields=fields)
+
+        return await self._server_data(bot=bot, race=race, fields=fields)
+
+    async def get_all_server_data(
+        self,
+        bot: bool = True,
+        fields: Optional[Iterable[str]] = None
+    ) -> Tuple[Optional[JavaServerResponse], Optional[BedrockServerResponse]]:
+        """
+        This method is used to get the status of both editions of a server, querying them concurrently.
+
+        :param bool bot: Determines if the bot connection should be used.
+        :param Optional[Iterable[str]] fields: The Java fields to build ("players.online", "version"...), every field if not provided.
+        :return Tuple[Optional[JavaServerResponse], Optional[BedrockServerResponse]]: The Java and Bedrock server status data.
+        """
+        fields = self.projection(fields)
+        return await self._probe_editions(bot=bot and self._wants(fields, 'bot_response'), first_only=False, fields=fields)
+
+    async def get_java_server_data(self, bot: bool = True, fields: Optional[Iterable[str]] = None) -> Optional[JavaServerResponse]:
+        """
+        This method is used to get the status of a Java server.
+
+        :param bool bot: Determines if the bot connection should be used.
+        :param Optional[Iterable[str]] fields: The fields to build ("players.online", "version"...), every field if not provided.
+        :return Optional[JavaServerResponse]: The server status data or None if an error occurred.
+        """
+        await self.resolve()
+        return await self._java_server_status(bot=bot, fields=self.projection(fields))
+
+    async def get_bedrock_server_data(self) -> Optional[BedrockServerResponse]:
+        """
+        This method is used to get the status of a Bedrock server.
+
+        :return Optional[BedrockServerResponse]: The server status data or None if an error occurred.
+        """
+        await self.resolve()
+        return await self._bedrock_server_status(port=self._bedrock_port())
+
+    async def get_bot_response(self, version: Union[str, int, None] = None) -> str:
+        """
+        This method is used to get the server response for the bot connection.
+        Only works with Java servers.
+
+        :param Union[str, int, None] version: The version of the server to get the response from.
+        :return str: The server response.
+        """
+        await self.resolve()
+        return await self._bot_response(version=version)
+
+    async def _server_data(self, bot: bool, race: bool, fields: Optional[FrozenSet[str]] = None) -> Union[JavaServerResponse, BedrockServerResponse, None]:
+        """
+        Query the status of the server, without the result cache.
+
+        :param bool bot: Determines if the bot connection should be used.
+        :param bool race: Determines if both editions should be queried concurrently.
+        :param Optional[FrozenSet[str]] fields: The Java fields to build (every field if not provided).
+        :return Union[JavaServerResponse, BedrockServerResponse]: The server status data.
+        """
+        if race:
+            java_data, bedrock_data = await self._probe_editions(bot=bot, first_only=True, fields=fields)
+            return java_data or bedrock_data
+
+        server_data: Optional[JavaServerResponse] = await self.get_java_server_data(bot=bot, fields=fields)
+
+        if server_data is None:
+            server_data: Optional[BedrockServerResponse] = await self.get_bedrock_server_data()
+
+        return server_data
+
+    async def _cached_server_data(self, bot: bool, race: bool, fields: Optional[FrozenSet[str]] = None) -> Union[JavaServerResponse, BedrockServerResponse, None]:
+        """
+        Get the status of the server from the result cache, querying the server if the result is missing or expired.
+        The status and the bot response are cached separately.
+
+        :param bool bot: Determines if the bot connection should be used.
+        :param bool race: Determines if both editions should be queried concurrently.
+        :param Optional[FrozenSet[str]] fields: The Java fields to build (every field if not provided).
+        :return Union[JavaServerResponse, BedrockServerResponse]: The server status data.
+        """
+        await self.resolve()
+
+        status_key: str = self.result_cache.status_key(self.server_address, self.server_port, race, fields)
+        server_data, stale = self.result_cache.get_status(status_key)
+
+        if server_data is None:
+            server_data = await self._server_data(bot=False, race=race, fields=fields)
+
+            if server_data is not None:
+                self.result_cache.put_status(status_key, server_data)
+
+        elif stale:
+            self._revalidate(status_key, lambda client: self._refresh_status(client, status_key, race, fields))
+
+        if not bot or not isinstance(server_data, JavaServerResponse):
+            return server_data
+
+        bot_key: str = self.result_cache.bot_key(self.server_address, self.server_port)
+        bot_response, stale = self.result_cache.get_bot(bot_key)
+        version: int = server_data.version.protocol
+
+        if bot_response is None:
+            self._set_bot_response(server_data, await self._bot_response(version=version))
+            self.result_cache.put_bot(bot_key, server_data.bot_response)
+
+        else:
+            if stale:
+                self._revalidate(bot_key, lambda client: self._refresh_bot_response(client, bot_key, version))
+
+            server_data.bot_response = bot_response
+
+        return server_data
+
+    def _probe_client(self) -> 'AsyncRStatusClient':
+        """
+        Copy the client with its own streams, so a query can run concurrently with the queries of this client.
+
+        :return AsyncRStatusClient: The copy of the client.
+        """
+        client: AsyncRStatusClient = copy.copy(self)
+        client.client = client
+        client.reader = None
+        client.writer = None
+        client.sock = None
+        client.proxy = None
+        client.compression_handler = CompressionHandler()
+        client.bot_connection_attempts = 0
+        return client
+
+    def _revalidate(self, key: str, refresh: Callable[['AsyncRStatusClient'], Awaitable[None]]) -> None:
+        """
+        Refresh a stale cached result in a background task, on a copy of the client.
+
+        :param str key: The key of the result.
+        :param Callable[[AsyncRStatusClient], Awaitable[None]] refresh: Coroutine function that queries the server with
+            the copy of the client and caches the result.
+        """
+        if not self.result_cache.claim_revalidation(key):
+            return
+
+        async def run() -> None:
+            try:
+                await refresh(self._probe_client())
+
+            except Exception as e:
+                if self.debug:
+                    print(f'Error refreshing cached result {key}: {e}')
+
+            finally:
+                self.result_cache.release_revalidation(key)
+
+        task: asyncio.Task = asyncio.ensure_future(run())
+        self._revalidations.add(task)
+        task.add_done_callback(self._revalidations.discard)
+
+    async def _refresh_status(self, client: 'AsyncRStatusClient', status_key: str, race: bool, fields: Optional[FrozenSet[str]] = None) -> None:
+        """
+        Query the status of the server and cache it.
+
+        :param AsyncRStatusClient client: The client used to query the server.
+        :param str status_key: The key of the status result.
+        :param bool race: Determines if both editions should be queried concurrently.
+        :param Optional[FrozenSet[str]] fields: The Java fields to build (every field if not provided).
+        """
+        server_data: Union[JavaServerResponse, BedrockServerResponse, None] = await client._server_data(bot=False, race=race, fields=fields)
+
+        if server_data is not None:
+            self.result_cache.put_status(status_key, server_data)
+
+    async def _refresh_bot_response(self, client: 'AsyncRStatusClient', bot_key: str, version: int) -> None:
+        """
+        Connect the bot to the server and cache its response.
+
+        :param AsyncRStatusClient client: The client used to connect the bot.
+        :param str bot_key: The key of the bot response.
+        :param int version: The protocol version of the server.
+        """
+        self.result_cache.put_bot(bot_key, self._format_bot_response(await client._bot_response(version=version)))
+
+    def _bedrock_port(self) -> int:
+        """
+        Get the port used for Bedrock queries, the default Java port is replaced by the default Bedrock port.
+
+        :return int: The Bedrock port.
+        """
+        return 19132 if self.server_port == 25565 else self.server_port
+
+    async def _probe_editions(
+        self,
+        bot: bool,
+        first_only: bool,
+        fields: Optional[FrozenSet[str]] = None
+    ) -> Tuple[Optional[JavaServerResponse], Optional[BedrockServerResponse]]:
+        """
+        Query the Java and Bedrock editions of the server concurrently.
+        The Java query uses the stream of the client and the Bedrock query runs on a copy of the client with its own
+        datagram endpoint or UDP association, so they do not share any state.
+
+        :param bool bot: Determines if the bot connection should be used.
+        :param bool first_only: Stop at the first valid response and cancel the other query.
+        :param Optional[FrozenSet[str]] fields: The Java fields to build (every field if not provided).
+        :return Tuple[Optional[JavaServerResponse], Optional[BedrockServerResponse]]: The Java and Bedrock server status data.
+        """
+        await self.resolve()
+
+        java_task: asyncio.Task = asyncio.ensure_future(self._java_server_status(bot=False, fields=fields))
+        bedrock_task: asyncio.Task = asyncio.ensure_future(self._probe_client()._bedrock_server_status(port=self._bedrock_port()))
+        pending: Set[asyncio.Task] = {java_task, bedrock_task}
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                if first_only and any(task.result() is not None for task in done):
+                    break
+
+        finally:
+            # Cancel the query that lost the race and wait for it to close its connection
+            for task in pending:
+                task.cancel()
+
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        java_data: Optional[JavaServerResponse] = None if java_task in pending else java_task.result()
+        bedrock_data: Optional[BedrockServerResponse] = None if bedrock_task in pending else bedrock_task.result()
+
+        if self.debug:
+            print(f'Edition probes: Java {"found" if java_data else "not found"}, Bedrock {"found" if bedrock_data else "not found"}')
+
+        if java_data is not None and bot:
+            self._set_bot_response(java_data, await self._bot_response(version=java_data.version.protocol))
+
+        return java_data, bedrock_data
@@ -0,0 +1,633 @@
+import argparse
+import asyncio
+import functools
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, TextIO, Tuple, Union
+
+from .async_main_client import AsyncRStatusClient
+from .handlers.connect_sweeper import ConnectSweeper, ERROR, OPEN, REFUSED, TIMEOUT
+from .models import JavaServerResponse, BedrockServerResponse
+from .models.serialization import to_dict
+from .utils.proxy_pool import ProxyPool
+from .utils.resolver import Resolver
+from .utils.targets import TargetGenerator
+from .utils.timeouts import AdaptiveTimeouts, Timeouts
+
+EDITIONS: Tuple[str, ...] = ('auto', 'java', 'bedrock', 'both')
+
+# Number of targets sent to a worker process at once
+BATCH_SIZE: int = 256
+
+Batch = Tuple[int, List[str]]  # (index, targets)
+
+
+@dataclass
+class ScanOptions:
+    """ Options of a scan, sent to every worker process """
+    __slots__ = ('edition', 'bot', 'race', 'timeout', 'timeouts', 'adaptive', 'precheck', 'concurrency', 'fields', 'favicon', 'proxies',
+                 'include_offline')
+
+    edition: str
+    bot: bool
+    race: bool
+    timeout: float
+    timeouts: Timeouts
+    adaptive: bool  # Derive the connect timeouts from the round trips observed by the process
+    precheck: bool  # Check the TCP ports with a ConnectSweeper before querying them
+    concurrency: int  # Queries in flight in each process
+    fields: Optional[List[str]]
+    favicon: str
+    proxies: List[str]
+    include_offline: bool
+
+
+class ScanProgress:
+    """
+    Progress of a scan, and its resume cursor.
+
+    The batches complete out of order (over the workers and the queries in flight), so the cursor only counts the
+    targets of the batches before the first batch that is not complete: resuming from it skips no target, at the cost
+    of querying some targets again.
+    """
+    __slots__ = ('skip', 'scanned', 'online', 'ports', 'fed', 'frontier', 'done')
+
+    def __init__(self, skip: int = 0):
+        """
+        Initialize a new ScanProgress.
+
+        :param skip: The number of targets skipped at the start of the scan.
+        """
+        self.skip: int = skip
+        self.scanned: int = 0
+        self.online: int = 0
+        self.ports: Dict[str, int] = {}  # Number of targets in each state of the connect sweep (with precheck)
+        self.fed: int = 0  # Targets sent to the workers
+        self.frontier: int = 0  # Index of the first batch that is not complete
+        self.done: Set[int] = set()  # Complete batches after the frontier
+
+    def batch_done(self, index: int) -> None:
+        """
+        Record a complete batch.
+
+        :param index: The index of the batch.
+        :return None: This function does not return a value.
+        """
+        self.done.add(index)
+
+        while self.frontier in self.done:
+            self.done.discard(self.frontier)
+            self.frontier += 1
+
+    def add_ports(self, counts: Dict[str, int]) -> None:
+        """
+        Add the counts of the connect sweep of a worker.
+
+        :param counts: The number of targets in each state.
+        :return None: This function does not return a value.
+        """
+        for state, count in counts.items():
+            self.ports[state] = self.ports.get(state, 0) + count
+
+    @property
+    def completed(self) -> int:
+        """
+        Get the resume cursor.
+
+        :return int: The number of targets from the start of the input (skipped targets included) that were all queried.
+        """
+        return self.skip + min(self.frontier * BATCH_SIZE, self.fed)
+
+
+class QueryEngine:
+    """
+    asyncio engine of a worker process: queries the targets of the batches with a bounded number of queries in flight.
+    Results are encoded to JSON lines in the worker, so the parsing and the encoding use every core.
+    """
+    def __init__(self, options: ScanOptions, emit: Callable[[str], None], batch_done: Optional[Callable[[int], None]] = None):
+        """
+        Initialize a new QueryEngine.
+
+        :param options: The options of the scan.
+        :param emit: Called with the JSON line of each result.
+        :param batch_done: Called with the index of each batch once every target of the batch was queried.
+        """
+        self.options: ScanOptions = options
+        self.emit: Callable[[str], None] = emit
+        self.batch_done: Optional[Callable[[int], None]] = batch_done
+        self.proxy_pool: Optional[ProxyPool] = ProxyPool(options.proxies) if options.proxies else None
+        self.timeouts: Union[Timeouts, AdaptiveTimeouts] = AdaptiveTimeouts(options.timeouts) if options.adaptive else options.timeouts
+        # The sweep holds as many sockets as the queries at most, twice the concurrency in total
+        self.sweeper: Optional[ConnectSweeper] = ConnectSweeper(
+            timeout=options.timeouts.connect, max_pending=options.concurrency
+        ) if options.precheck else None
+        self.scanned: int = 0
+        self.online: int = 0
+
+    async def run(self, next_batch: Callable[[], Optional[Batch]]) -> None:
+        """
+        Query the targets of every batch until there are no batches left.
+
+        :param next_batch: Blocking function returning the next (index, targets) batch, or None at the end.
+        :return None: This function does not return a value.
+        """
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(self.options.concurrency)
+        tasks: Set[asyncio.Task] = set()
+        remaining: Dict[int, int] = {}  # Batch index -> targets of the batch still being queried
+
+        def target_done(index: int) -> None:
+            remaining[index] -= 1
+
+            if not remaining[index]:
+                del remaining[index]
+
+                if self.batch_done is not None:
+                    self.batch_done(index)
+
+        def done(index: int, task: asyncio.Task) -> None:
+            tasks.discard(task)
+            semaphore.release()
+            target_done(index)
+
+        targets: AsyncIterator[Tuple[int, str]] = self._swept_targets(next_batch, remaining, target_done) if self.sweeper \
+            else self._targets(next_batch, remaining)
+
+        async for index, target in targets:
+            await semaphore.acquire()
+            task: asyncio.Task = asyncio.ensure_future(self.query(target))
+            tasks.add(task)
+            task.add_done_callback(functools.partial(done, index))
+
+        if tasks:
+            await asyncio.wait(tasks)
+
+    @staticmethod
+    async def _targets(next_batch: Callable[[], Optional[Batch]], remaining: Dict[int, int]) -> AsyncIterator[Tuple[int, str]]:
+        """
+        Get the targets of every batch.
+
+        :param next_batch: Blocking function returning the next (index, targets) batch, or None at the end.
+        :param remaining: Receives the number of targets of each batch.
+        :return AsyncIterator[Tuple[int, str]]: The (batch index, target) pairs.
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+        while True:
+            batch: Optional[Batch] = await loop.run_in_executor(None, next_batch)
+
+            if batch is None:
+                return
+
+            index, targets = batch
+            remaining[index] = len(targets)
+
+            for target in targets:
+                yield index, target
+
+    async def _swept_targets(
+            self,
+            next_batch: Callable[[], Optional[Batch]],
+            remaining: Dict[int, int],
+            target_done: Callable[[int], None],
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """
+        Get the targets of every batch whose TCP port is open.
+        The sweep runs in a thread, thousands of connects are in flight while the event loop queries the open ports.
+        The other targets are recorded as offline without being queried.
+
+        :param next_batch: Blocking function returning the next (index, targets) batch, or None at the end.
+        :param remaining: Receives the number of targets of each batch.
+        :param target_done: Called with the batch index of each target that is not queried.
+        :return AsyncIterator[Tuple[int, str]]: The (batch index, target) pairs of the open ports and unresolved targets.
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        # Bounded, so the sweep does not run ahead of the queries
+        results: asyncio.Queue = asyncio.Queue(maxsize=self.options.concurrency)
+
+        def put(item: object) -> None:
+            asyncio.run_coroutine_threadsafe(results.put(item), loop).result()
+
+        def batch_targets() -> Iterator[Tuple[int, str]]:
+            while True:
+                batch: Optional[Batch] = next_batch()
+
+                if batch is None:
+                    return
+
+                index, targets = batch
+                # Runs on the event loop before the results of the batch are read
+                loop.call_soon_threadsafe(remaining.__setitem__, index, len(targets))
+
+                for target in targets:
+                    yield index, target
+
+        def sweep() -> None:
+            try:
+                for item, state in self.sweeper.sweep_targets(batch_targets(), resolve=lambda item: Resolver.resolve_endpoint(item[1])):
+                    put((item, state))
+
+                put(None)
+
+            except Exception as e:
+                put(e)
+
+        threading.Thread(target=sweep, daemon=True).start()
+
+        while True:
+            result: Union[Tuple[Tuple[int, str], Optional[str]], Exception, None] = await results.get()
+
+            if result is None:
+                return
+
+            if isinstance(result, Exception):
+                raise result
+
+            (index, target), state = result
+
+            # Unresolved targets are queried, so their result holds the error
+            if state == OPEN or state is None:
+                yield index, target
+
+            else:
+                self._record(target, None, None, None)
+                target_done(index)
+
+    async def query(self, target: str) -> None:
+        """
+        Query a target and emit its result.
+
+        :param target: The target (domain or IP:port).
+        :return None: This function does not return a value.
+        """
+        java_data: Optional[JavaServerResponse] = None
+        bedrock_data: Optional[BedrockServerResponse] = None
+        error: Optional[str] = None
+
+        try:
+            client: AsyncRStatusClient = AsyncRStatusClient(
+                target,
+                timeout=self.options.timeout,
+                favicon=self.options.favicon,
+                proxy_pool=self.proxy_pool,
+                timeouts=self.timeouts,
+            )
+
+            if self.options.edition == 'both':
+                java_data, bedrock_data = await client.get_all_server_data(bot=self.options.bot, fields=self.options.fields)
+
+            elif self.options.edition == 'java':
+                java_data = await client.get_java_server_data(bot=self.options.bot, fields=self.options.fields)
+
+            elif self.options.edition == 'bedrock':
+                bedrock_data = await client.get_bedrock_server_data()
+
+            else:
+                server_data: Union[JavaServerResponse, BedrockServerResponse, None] = await client.get_server_data(
+                    bot=self.options.bot, race=self.options.race, fields=self.options.fields
+                )
+
+                if isinstance(server_data, JavaServerResponse):
+                    java_data = server_data
+
+                else:
+                    bedrock_data = server_data
+
+        except Exception as e:
+            # Invalid or unresolvable targets
+            error = str(e)
+
+        self._record(target, java_data, bedrock_data, error)
+
+    def _record(
+            self,
+            target: str,
+            java_data: Optional[JavaServerResponse],
+            bedrock_data: Optional[BedrockServerResponse],
+            error: Optional[str],
+    ) -> None:
+        """
+        Count the result of a target and emit it.
+
+        :param target: The target.
+        :param java_data: The Java server data, if the server answered.
+        :param bedrock_data: The Bedrock server data, if the server answered.
+        :param error: The error of an invalid target.
+        :return None: This function does not return a value.
+        """
+        self.scanned += 1
+
+        if java_data is not None or bedrock_data is not None:
+            self.online += 1
+
+        elif not self.options.include_offline:
+            return
+
+        result: dict = {
+            'target': target,
+            'java': None if java_data is None else to_dict(java_data),
+            'bedrock': None if bedrock_data is None else to_dict(bedrock_data),
+        }
+
+        if error is not None:
+            result['error'] = error
+
+        self.emit(json.dumps(result, ensure_ascii=False, separators=(',', ':')))
+
+
+def read_targets(file: TextIO) -> Iterator[str]:
+    """
+    Read the targets of a file, one per line.
+
+    :param file: The file (or stdin).
+    :return Iterator[str]: The targets, without empty lines and comments.
+    """
+    for line in file:
+        target: str = line.strip()
+
+        if target and not target.startswith('#'):
+            yield target
+
+
+def batches(targets: Iterable[str], size: int = BATCH_SIZE) -> Iterator[Batch]:
+    """
+    Split the targets into numbered batches.
+
+    :param targets: The targets.
+    :param size: The number of targets of each batch.
+    :return Iterator[Batch]: The (index, targets) batches.
+    """
+    iterator: Iterator[str] = iter(targets)
+
+    for index in itertools.count():
+        batch: List[str] = list(itertools.islice(iterator, size))
+
+        if not batch:
+            return
+
+        yield index, batch
+
+
+def _worker(options: ScanOptions, batch_queue: multiprocessing.Queue, result_queue: multiprocessing.Queue) -> None:
+    """
+    Entry point of a worker process: runs a QueryEngine on the batches of the queue.
+    The results are sent as JSON lines, the index of each complete batch as an int,
+    and a (scanned, online, port states) tuple when the queue is exhausted.
+
+    :param options: The options of the scan.
+    :param batch_queue: The batches of targets, None marks the end.
+    :param result_queue: The results of the worker.
+    :return None: This function does not return a value.
+    """
+    engine: QueryEngine = QueryEngine(options, result_queue.put, result_queue.put)
+
+    try:
+        asyncio.run(engine.run(batch_queue.get))
+
+    finally:
+        result_queue.put((engine.scanned, engine.online, engine.sweeper.counts if engine.sweeper else {}))
+
+
+def scan(targets: Iterable[str], options: ScanOptions, processes: int, output: TextIO, progress: Optional[ScanProgress] = None) -> ScanProgress:
+    """
+    Scan the targets on worker processes and write the results to the output as they complete.
+
+    :param targets: The targets.
+    :param options: The options of the scan.
+    :param processes: The number of worker processes (1 runs the engine in this process).
+    :param output: The output of the JSON lines.
+    :param progress: Updated as the scan goes, so the resume cursor is known when the scan is interrupted.
+    :return ScanProgress: The progress of the scan.
+    """
+    progress = progress or ScanProgress()
+
+    def write(line: str) -> None:
+        output.write(line + '\n')
+        output.flush()
+
+    def next_batch(target_batches: Iterator[Batch]) -> Optional[Batch]:
+        batch: Optional[Batch] = next(target_batches, None)
+
+        if batch is not None:
+            progress.fed += len(batch[1])
+
+        return batch
+
+    if processes == 1:
+        engine: QueryEngine = QueryEngine(options, write, progress.batch_done)
+
+        try:
+            asyncio.run(engine.run(functools.partial(next_batch, batches(targets))))
+
+        finally:
+            progress.scanned, progress.online = engine.scanned, engine.online
+
+            if engine.sweeper is not None:
+                progress.add_ports(engine.sweeper.counts)
+
+        return progress
+
+    # Bounded, so a long target list is read as fast as the workers query it
+    batch_queue: multiprocessing.Queue = multiprocessing.Queue(maxsize=processes * 4)
+    result_queue: multiprocessing.Queue = multiprocessing.Queue()
+    workers: List[multiprocessing.Process] = [
+        multiprocessing.Process(target=_worker, args=(options, batch_queue, result_queue), daemon=True) for _ in range(processes)
+    ]
+
+    def feed() -> None:
+        target_batches: Iterator[Batch] = batches(targets)
+
+        while True:
+            # Counted before it is sent, the cursor never moves past a target that was not queried
+            batch: Optional[Batch] = next_batch(target_batches)
+
+            if batch is None:
+                break
+
+            batch_queue.put(batch)
+
+        for _ in workers:
+            batch_queue.put(None)
+
+    for worker in workers:
+        worker.start()
+
+    threading.Thread(target=feed, daemon=True).start()
+    running: int = len(workers)
+
+    try:
+        while running:
+            try:
+                message: Union[str, int, Tuple[int, int, Dict[str, int]]] = result_queue.get(timeout=1)
+
+            except queue.Empty:
+                # A worker that crashed never sends its counts
+                if not any(worker.is_alive() for worker in workers):
+                    break
+
+                continue
+
+            if isinstance(message, str):
+                write(message)
+
+            elif isinstance(message, int):
+                progress.batch_done(message)
+
+            else:
+                progress.scanned += message[0]
+                progress.online += message[1]
+                progress.add_ports(message[2])
+                running -= 1
+
+    finally:
+        for worker in workers:
+            if running:
+                worker.terminate()
+
+            worker.join()
+
+    return progress
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the parser of the command-line arguments.
+
+    :return argparse.ArgumentParser: The parser.
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        prog='rstatus',
+        description='Query the status of many Minecraft servers and write the results as JSON lines. '
+                    'The targets are fanned out over worker processes, each running an asyncio query engine.',
+    )
+    parser.add_argument('input', nargs='?', default='-', help='file with one target per line (domain or IP:port), stdin if omitted or "-"')
+    parser.add_argument('-r', '--range', action='append', default=[], metavar='CIDR',
+                        help='scan an IPv4 block (10.0.0.0/8) instead of the input, repeat to scan several blocks')
+    parser.add_argument('--ports', default='25565', help='ports of the --range blocks, as ports and ranges ("25565-25575,19132", default: 25565)')
+    parser.add_argument('--seed', type=int, help='seed of the order of the --range targets, random if omitted (printed to resume the scan)')
+    parser.add_argument('--skip', type=int, default=0, metavar='N', help='skip the first N targets, to resume an interrupted scan')
+    parser.add_argument('-e', '--edition', choices=EDITIONS, default='auto',
+                        help='edition to query: auto (Java, then Bedrock), java, bedrock or both (default: auto)')
+    parser.add_argument('--race', action='store_true', help='with --edition auto, query both editions at once and keep the first answer')
+    parser.add_argument('--bot', action='store_true', help='connect a bot to Java servers to get their bot response')
+    parser.add_argument('-t', '--timeout', type=float, default=5, help='timeout of each connection in seconds (default: 5)')
+    parser.add_argument('--connect-timeout', type=float, help='timeout of the connect and of the Bedrock ping in seconds (default: --timeout)')
+    parser.add_argument('--read-timeout', type=float, help='timeout of each receive in seconds (default: --timeout)')
+    parser.add_argument('--total-timeout', type=float, help='timeout of each whole connection in seconds (default: unbounded)')
+    parser.add_argument('--adaptive-timeouts', action='store_true',
+                        help='shorten the connect timeouts to the round trips observed in the network of each server')
+    parser.add_argument('--precheck', action='store_true',
+                        help='with --edition java, check the TCP ports with non-blocking connects first and only query the open ports')
+    parser.add_argument('-c', '--concurrency', type=int, default=256, help='queries in flight in each process (default: 256)')
+    parser.add_argument('-p', '--processes', type=int, default=os.cpu_count() or 1, help='worker processes (default: number of CPUs)')
+    parser.add_argument('-f', '--fields', help='comma-separated Java fields to build ("players.online,version"...), every field if omitted')
+    parser.add_argument('--favicon', choices=('inline', 'none'), default='none', help='keep the favicons in the results (default: none)')
+    parser.add_argument('--proxy', action='append', default=[], metavar='URL',
+                        help='SOCKS proxy (socks5://host:port), repeat to spread the queries over a pool of proxies')
+    parser.add_argument('-a', '--all', action='store_true', help='also write the targets that did not answer')
+    parser.add_argument('-q', '--quiet', action='store_true', help='do not write the summary to stderr')
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Entry point of the rstatus command.
+
+    :param argv: The command-line arguments (sys.argv if not provided).
+    :return int: The exit status.
+    """
+    parser: argparse.ArgumentParser = build_parser()
+    args: argparse.Namespace = parser.parse_args(argv)
+
+    if args.concurrency < 1 or args.processes < 1:
+        parser.error('the concurrency and the number of processes must be at least 1')
+
+    if args.skip < 0:
+        parser.error('the number of targets to skip must not be negative')
+
+    if args.range and args.input != '-':
+        parser.error('--range replaces the input file, do not use both')
+
+    if args.precheck and (args.edition != 'java' or args.proxy):
+        # Bedrock servers do not listen on TCP, and the sweep connects without the proxies
+        parser.error('--precheck needs --edition java and cannot be used with --proxy')
+
+    options: ScanOptions = ScanOptions(
+        edition=args.edition,
+        bot=args.bot,
+        race=args.race,
+        timeout=args.timeout,
+        timeouts=Timeouts(
+            connect=args.timeout if args.connect_timeout is None else args.connect_timeout,
+            read=args.timeout if args.read_timeout is None else args.read_timeout,
+            total=args.total_timeout,
+        ),
+        adaptive=args.adaptive_timeouts,
+        precheck=args.precheck,
+        concurrency=args.concurrency,
+        fields=[field.strip() for field in args.fields.split(',')] if args.fields else None,
+        favicon=args.favicon,
+        proxies=args.proxy,
+        include_offline=args.all,
+    )
+
+    generator: Optional[TargetGenerator] = None
+
+    try:
+        # Fail now on invalid fields and proxies, not in every worker
+        AsyncRStatusClient.projection(options.fields)
+
+        if options.proxies:
+            ProxyPool(options.proxies)
+
+        if args.range:
+            generator = TargetGenerator(args.range, args.ports, TargetGenerator.random_seed() if args.seed is None else args.seed)
+
+    except ValueError as e:
+        parser.error(str(e))
+
+    start_time: float = time.monotonic()
+    file: Optional[TextIO] = None
+    targets: Iterable[str]
+
+    if generator is not None:
+        # Skipped in constant time, the targets are computed from their position
+        targets = generator.targets(start=args.skip)
+
+    else:
+        file = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8')
+        targets = itertools.islice(read_targets(file), args.skip, None)
+
+    progress: ScanProgress = ScanProgress(args.skip)
+
+    try:
+        scan(targets, options, args.processes, sys.stdout, progress)
+
+    except KeyboardInterrupt:
+        resume: str = f'--skip {progress.completed}' if generator is None else f'--seed {generator.seed} --skip {progress.completed}'
+        print(f'Interrupted, resume with {resume}', file=sys.stderr)
+        return 130
+
+    except BrokenPipeError:
+        # The output was closed (rstatus ... | head), stop quietly
+        sys.stderr.close()
+        return 0
+
+    finally:
+        if file is not None and file is not sys.stdin:
+            file.close()
+
+    if not args.quiet:
+        print(f'Scanned {progress.scanned} targets, {progress.online} online in {time.monotonic() - start_time:.1f} seconds', file=sys.stderr)
+
+        if progress.ports:
+            print(f'Ports: {progress.ports.get(OPEN, 0)} open, {progress.ports.get(REFUSED, 0)} refused, '
+                  f'{progress.ports.get(TIMEOUT, 0)} timed out, {progress.ports.get(ERROR, 0)} unreachable', file=sys.stderr)
+
+    return 0
@@ -1,4 +1,8 @@
 from .java_handler import JavaHandler
 from .bedrock_handler import BedrockHandler
+from .async_java_handler import AsyncJavaHandler
+from .async_bedrock_handler import AsyncBedrockHandler
+from .bedrock_sweeper import BedrockSweeper
+from .connect_sweeper import ConnectSweeper
 
-__all__ = ['JavaHandler', 'BedrockHandler']
+__all__ = ['JavaHandler', 'BedrockHandler', 'AsyncJavaHandler', 'AsyncBedrockHandler', 'BedrockSweeper', 'ConnectSweeper']
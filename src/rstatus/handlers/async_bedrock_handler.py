@@ -0,0 +1,138 @@
+import asyncio
+import time
+from typing import Optional, Tuple
+
+from .bedrock_handler import BedrockHandler
+from ..utils.async_client import AsyncMinecraftClient, wait_with_timeout
+from ..utils.timeouts import Timeouts
+from ..utils.udp_relay import MAX_HEADER_SIZE, UdpAssociation
+from ..models.bedrock_server_data import BedrockServerResponse
+
+
+class BedrockPingProtocol(asyncio.DatagramProtocol):
+    """ Datagram protocol that waits for the unconnected pong of a single server """
+    def __init__(self, server: Tuple[str, int]):
+        self.server: Tuple[str, int] = server
+        self.response: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        # Ignore datagrams that do not come from the queried server
+        if addr[0] == self.server[0] and not self.response.done():
+            self.response.set_result(data)
+
+    def error_received(self, exc: Exception) -> None:
+        if not self.response.done():
+            self.response.set_exception(exc)
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        if not self.response.done():
+            self.response.set_exception(exc or ConnectionError('Connection closed before receiving the pong'))
+
+
+class AsyncBedrockHandler(BedrockHandler):
+    """
+    asyncio version of BedrockHandler.
+    The unconnected ping is sent through a datagram endpoint of the running event loop.
+    """
+    def __init__(self, client: AsyncMinecraftClient):
+        super().__init__(client)
+
+    async def _bedrock_server_status(self, port: Optional[int] = None) -> Optional[BedrockServerResponse]:
+        """
+        Get the status of a Bedrock server by sending a ping request and parsing the response.
+
+        :param port: The port to ping (the port of the client if not provided).
+        :return Optional[BedrockServerResponse]: The parsed server response data or None if an error occurred.
+        """
+        transport: Optional[asyncio.DatagramTransport] = None
+
+        try:
+            start_time: float = time.time()  # The start time of the request
+            server: Tuple[str, int] = (self.client.server_address, port or self.client.server_port)
+            timestamp: int = int(time.time() * 1000)
+
+            if self.client.has_proxy():
+                # Ping through a UDP association of the proxy
+                await self.client.connect(server_type='bedrock')
+                data: bytes = await wait_with_timeout(
+                    self._relay_ping(server, timestamp), timeout=self.client._remaining(self.client.current_timeouts.connect)
+                )
+
+            else:
+                timeouts: Timeouts = self.client._start_timeouts()
+
+                # Start the datagram endpoint
+                transport, protocol = await asyncio.get_running_loop().create_datagram_endpoint(
+                    lambda: BedrockPingProtocol(server),
+                    remote_addr=server
+                )
+
+                # Send the ping packet
+                transport.sendto(self._build_ping_packet(timestamp))
+
+                # Receive the response
+                sent_at: float = time.monotonic()
+
+                try:
+                    data = await wait_with_timeout(protocol.response, timeout=timeouts.connect)
+
+                except asyncio.TimeoutError:
+                    # The round trip was at least the timeout
+                    self.client._observe_rtt(timeouts.connect)
+                    raise
+
+                self.client._observe_rtt(time.monotonic() - sent_at)
+
+            if self.client.debug:
+                print(f'Received data: {data}')
+
+            # Calculate the response time in milliseconds
+            response_time = (time.time() - start_time) * 1000
+
+            # Parse the status response data
+            server_data: Optional[BedrockServerResponse] = self._parse_bedrock_response(data, server[1])
+
+            if server_data:
+                server_data.ping = int(response_time)
+
+            return server_data
+
+        except Exception as e:
+            if self.client.debug:
+                print(f'Error getting server status: {e}')
+
+            return None
+
+        finally:
+            if transport is not None:
+                transport.close()
+
+            if self.client.has_proxy():
+                await self.client.close()
+
+    async def _relay_ping(self, server: Tuple[str, int], timestamp: int) -> bytes:
+        """
+        Send the ping through the UDP association of the client and wait for the pong of the server.
+
+        :param server: The (address, port) of the server.
+        :param timestamp: The time sent in the ping.
+        :return bytes: The response.
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        association: UdpAssociation = self.client.sock
+        await loop.sock_sendall(association.sock, association.pack(self._build_ping_packet(timestamp), server))
+
+        while True:
+            try:
+                data, _ = association.unpack(await loop.sock_recv(association.sock, 4096 + MAX_HEADER_SIZE))
+
+            except OSError as e:
+                # ICMP errors and invalid datagrams of the relay, the pong may still come
+                if self.client.debug:
+                    print(f'Error receiving pong: {e}')
+
+                continue
+
+            # Ignore the late pongs of previous pings of the association
+            if not self._is_stale_pong(data, timestamp):
+                return data
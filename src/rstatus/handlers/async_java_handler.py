@@ -0,0 +1,216 @@
+import asyncio
+import time
+from typing import FrozenSet, Optional, Union
+
+from .java_handler import JavaHandler, RETRY_DELAY
+from ..packets import PacketReader
+from ..utils.async_client import AsyncMinecraftClient
+from ..models.java_server_data import JavaServerResponse
+from ..utils.clear import ClearResponse
+from ..utils.retry import RetryLater
+
+
+class AsyncJavaHandler(JavaHandler):
+    """
+    asyncio version of JavaHandler.
+    Packet building and parsing are shared with JavaHandler, only the I/O is awaited.
+    """
+    def __init__(self, client: AsyncMinecraftClient):
+        super().__init__(client)
+
+    async def _java_server_status(self, bot: bool = True, fields: Optional[FrozenSet[str]] = None) -> Optional[JavaServerResponse]:
+        """
+        Get the status of the server and return the result.
+
+        :param bot: Determines if the bot connection should be used.
+        :param fields: The fields of the server data to build (every field if not provided, see projection).
+        :return Optional[JavaServerResponse]: The server status data or None if an error occurred.
+        """
+        try:
+            start_time: float = time.time()  # The start time of the request
+
+            # Start the connection
+            await self.client.connect()
+
+            # Send the handshake packet with next state 1 (status) and the status request packet
+            await self.client.send(self._status_request_packets())
+
+            # Receive the response packet
+            response_data: bytes = await self.client._receive_packet()
+
+            # Calculate the response time in milliseconds
+            response_time = (time.time() - start_time) * 1000
+
+            # The status connection is not needed anymore, close it before the bot connects
+            await self.client.close()
+
+            # Parse the status response data
+            original_server_data: dict = self._decode_status_response(response_data)
+            bot_response: str = ''
+
+            if bot and self._wants(fields, 'bot_response'):
+                version_protocol: int = original_server_data.get('version', {}).get('protocol', 0)
+                bot_response = ClearResponse.clear_response(await self._bot_response(version=version_protocol))
+
+            server_data: JavaServerResponse = self._build_status_response(original_server_data, bot_response, fields)
+
+            # Add the ping time to the server data and return it
+            server_data.ping = int(response_time)
+            return server_data
+
+        except Exception as e:
+            if self.client.debug:
+                print(f'Error getting server status: {e}')
+
+            return None
+
+        finally:
+            await self.client.close()
+
+    async def _bot_response(self, version: Union[str, int, None] = None) -> str:
+        """
+        Connect the bot to the server and return the result of the connection.
+
+        :param version: The version of the server protocol to use (Version name or protocol number).
+        :return str: The result of the bot connection.
+        """
+        if self.bot_connection_attempts >= 10:
+            return f'Connection failed (Max attempts reached) - {self.last_bot_response}'
+
+        username: str = 'Tarima'
+
+        if version is None:
+            server_status: Optional[JavaServerResponse] = await self._java_server_status(bot=False)
+
+            if server_status is None:
+                return 'Could not get server status.'
+
+            version = server_status.version.protocol
+
+        elif str(version) == '120':
+            return 'Connection failed (TCPShield Detected)'
+
+        protocol_version: int = self._protocol_from_version(version)
+        self.bot_response_protocol = protocol_version
+
+        # Start with the login mode that worked last time for this server or protocol version
+        if self.bot_connection_attempts == 0:
+            cached_mode: Optional[int] = self.login_modes.get(protocol_version, self._server_key())
+
+            if cached_mode is not None:
+                self.login_packet_mode = cached_mode
+                self.cached_login_mode = cached_mode
+
+        if self.login_packet_mode == 5:
+            self.login_packet_mode = -1
+            protocol_version = 47
+            self.backoff.backoff(self._server_key(), RETRY_DELAY)
+
+        # Wait for the end of the backoff of the server (or defer the attempt)
+        await self._wait_for_backoff(protocol_version)
+
+        if self.client.debug:
+            print(f'Connecting bot with protocol version: {protocol_version}')
+
+        try:
+            # Start the connection
+            await self.client.connect()
+
+            # Send the handshake packet with next state 2 (login) and the login start packet
+            await self.client.send(self._login_packets(protocol_version, username))
+
+            # Handle the login response
+            self.login_accepted = False
+            result: str = await self._handle_login_response()
+            self.last_bot_response = result
+
+            if self.client.debug:
+                print(f'Bot connection result: {result}')
+
+            if not self._is_throttled(result):
+                self.backoff.reset(self._server_key())
+
+                # Only a mode the server accepted is cached, the forced protocol 47 retry (mode -1) is a last resort
+                if self.login_accepted and self.login_packet_mode >= 0:
+                    self.login_modes.put(protocol_version, self.login_packet_mode, self._server_key())
+
+        except Exception as e:
+            if self.client.debug:
+                print(f'Error connecting bot: {e}')
+
+            return 'Connection failed'
+
+        finally:
+            await self.client.close()
+
+        if 'ip forwarding' in result.lower():
+            if self.client.debug:
+                print('Detected Network Port (IP Forwarding). Retrying connection with BungeeHack.')
+
+            self.client.bungeehack = True
+            self.bot_connection_attempts += 1
+            result = await self._bot_response(version=protocol_version)
+
+        if 'io.netty.handler.codec' in result.lower():
+            self.login_packet_mode = self._next_login_mode()
+            self.bot_connection_attempts += 1
+            result = await self._bot_response(version=protocol_version)
+
+        if self._is_throttled(result):
+            delay: float = self.backoff.backoff(self._server_key(), RETRY_DELAY)
+
+            if self.client.debug:
+                print(f'Connection throttled. Retrying connection in {delay:.2f} seconds.')
+
+            self.bot_connection_attempts += 1
+            result = await self._bot_response(version=protocol_version)
+
+        return result
+
+    async def _wait_for_backoff(self, version: Union[str, int]) -> None:
+        """
+        Wait until the backoff of the server ends, without blocking the event loop.
+        If defer_retries is enabled, RetryLater is raised instead.
+
+        :param version: The version the bot has to be called with to resume the attempt.
+        """
+        delay: float = self.backoff.remaining(self._server_key())
+
+        if delay <= 0:
+            return
+
+        if self.defer_retries:
+            raise RetryLater(delay, version)
+
+        if self.client.debug:
+            print(f'Waiting {delay:.2f} seconds for the backoff of the server.')
+
+        await asyncio.sleep(delay)
+
+    async def _handle_login_response(self) -> str:
+        """
+        Handles the login response from the server.
+
+        :return str: The result of the login response.
+        """
+        while True:
+            reader: PacketReader = PacketReader(await self.client._receive_packet())
+            packet_id: int = reader.read_varint()
+
+            if self.client.debug:
+                print(f'Received packet with ID: {packet_id}')
+
+            if packet_id in (0x00, 0x01, 0x02):  # Disconnect, Encryption Request or Login Success
+                return self._login_result(packet_id, reader)
+
+            elif packet_id == 0x03:  # Set Compression
+                self._handle_set_compression(reader)
+
+            elif packet_id == 0x04:  # Login Plugin Request
+                await self.client.send(self._build_login_plugin_response(reader))
+
+            else:
+                if self.client.debug:
+                    print(f'Unknown packet ID: {packet_id}')
+
+                return f'Connection failed - Unknown packet ID'
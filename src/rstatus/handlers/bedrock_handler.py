@@ -1,11 +1,15 @@
+import socket
 import struct
 import time
 
 from typing import Optional
 
+from ..packets import PacketReader
 from ..utils.client import MinecraftClient
 from ..models.bedrock_server_data import BedrockServerResponse, MOTD, Version, Players
 
+MAGIC: bytes = b'\x00\xff\xff\x00\xfe\xfe\xfe\xfe\xfd\xfd\xfd\xfd\x12\x34\x56\x78'
+
 
 class BedrockHandler:
     def __init__(self, client: MinecraftClient):
@@ -17,13 +21,17 @@ class BedrockHandler:
         self.client = client
         self.bot_response_protocol: int = 0
         self.extra_bool = False
+        self.retain_raw_response: bool = True
 
-    def _bedrock_server_status(self) -> Optional[BedrockServerResponse]:
+    def _bedrock_server_status(self, port: Optional[int] = None) -> Optional[BedrockServerResponse]:
         """
         Get the status of a Bedrock server by sending a ping request and parsing the response.
 
+        :param port: The port to ping (the port of the client if not provided).
         :return Optional[BedrockServerResponse]: The parsed server response data or None if an error occurred.
         """
+        port = port or self.client.server_port
+
         try:
             start_time: float = time.time()  # The start time of the request
 
@@ -31,26 +39,30 @@ class BedrockHandler:
             self.client.connect(server_type='bedrock')
 
             # Send the ping packet
-            PACKET_ID_UNCONNECTED_PING: bytes = b'\x01'
             timestamp: int = int(time.time() * 1000)
-            time_bytes: bytes = struct.pack('>Q', timestamp)
-            MAGIC: bytes = b'\x00\xff\xff\x00\xfe\xfe\xfe\xfe\xfd\xfd\xfd\xfd\x12\x34\x56\x78'
-            client_guid: int = 0
-            client_guid_bytes: bytes = struct.pack('>Q', client_guid)
-            ping_packet: bytes = PACKET_ID_UNCONNECTED_PING + time_bytes + MAGIC + client_guid_bytes
-            self.client.sock.sendto(ping_packet, (self.client.server_address, self.client.server_port))
+            self.client.sock.sendto(self._build_ping_packet(timestamp), (self.client.server_address, port))
 
             # Receive the response
-            data, _ = self.client.sock.recvfrom(4096)
+            sent_at: float = time.monotonic()
+
+            try:
+                data: bytes = self._receive_pong(timestamp)
+
+            except socket.timeout:
+                # The round trip was at least the timeout
+                self.client._observe_rtt(self.client.current_timeouts.connect)
+                raise
 
-            if self.debug:
+            self.client._observe_rtt(time.monotonic() - sent_at)
+
+            if self.client.debug:
                 print(f'Received data: {data}')
 
             # Calculate the response time in milliseconds
             response_time = (time.time() - start_time) * 1000
 
             # Parse the status response data
-            server_data: Optional[BedrockServerResponse] = self._parse_bedrock_response(data)
+            server_data: Optional[BedrockServerResponse] = self._parse_bedrock_response(data, port)
 
             if server_data:
                 server_data.ping = int(response_time)
@@ -66,52 +78,112 @@ class BedrockHandler:
         finally:
             self.client.close()
 
-    def _parse_bedrock_response(self, data: bytes) -> Optional[BedrockServerResponse]:
+    def _receive_pong(self, timestamp: int) -> bytes:
+        """
+        Receive the response to the ping.
+        A UDP association of a proxy is reused across queries, so it may still receive the late pong of a previous
+        ping; pongs that do not echo the time of this ping are skipped.
+
+        :param timestamp: The time sent in the ping.
+        :return bytes: The response.
+        """
+        deadline: float = time.monotonic() + self.client._remaining(self.client.current_timeouts.connect)
+
+        self.client.sock.settimeout(deadline - time.monotonic())
+
+        while True:
+            data, _ = self.client.sock.recvfrom(4096)
+
+            if not self._is_stale_pong(data, timestamp):
+                return data
+
+            remaining: float = deadline - time.monotonic()
+
+            if remaining <= 0:
+                raise socket.timeout('timed out')
+
+            self.client.sock.settimeout(remaining)
+
+    @staticmethod
+    def _is_stale_pong(data: bytes, timestamp: int) -> bool:
+        """
+        Check if a datagram is an unconnected pong to another ping.
+
+        :param data: The datagram.
+        :param timestamp: The time sent in the ping.
+        :return bool: True if the datagram is a pong that does not echo the time of the ping.
+        """
+        return len(data) >= 9 and data[0] == 0x1c and struct.unpack_from('>Q', data, 1)[0] != timestamp
+
+    @staticmethod
+    def _build_ping_packet(timestamp: int) -> bytes:
+        """
+        Build an unconnected ping packet.
+
+        :param timestamp: The time sent in the ping, echoed back by the server in the pong.
+        :return bytes: The unconnected ping packet.
+        """
+        PACKET_ID_UNCONNECTED_PING: bytes = b'\x01'
+        time_bytes: bytes = struct.pack('>Q', timestamp)
+        client_guid: int = 0
+        client_guid_bytes: bytes = struct.pack('>Q', client_guid)
+        return PACKET_ID_UNCONNECTED_PING + time_bytes + MAGIC + client_guid_bytes
+
+    def _parse_bedrock_response(self, data: bytes, port: Optional[int] = None) -> Optional[BedrockServerResponse]:
         """
         Parse the response received from the Bedrock server.
 
         :param data: The raw byte data received from the server.
+        :param port: The port that was pinged (the port of the client if not provided).
+        :return Optional[BedrockServerResponse]: A structured response object or None if parsing fails.
+        """
+        server_data: Optional[BedrockServerResponse] = self.parse_unconnected_pong(
+            data, self.client.server_address, port or self.client.server_port, self.client.debug
+        )
+
+        if server_data is not None and not self.client.retain_raw_response:
+            server_data.raw_response = []
+
+        return server_data
+
+    @staticmethod
+    def parse_unconnected_pong(data: bytes, ip_address: str, port: int, debug: bool = False) -> Optional[BedrockServerResponse]:
+        """
+        Parse an unconnected pong packet received from a Bedrock server.
+
+        :param data: The raw byte data received from the server.
+        :param ip_address: The IP address of the server that sent the pong.
+        :param port: The port of the server that sent the pong.
+        :param debug: Flag to enable debug logging.
         :return Optional[BedrockServerResponse]: A structured response object or None if parsing fails.
         """
-        offset: int = 0
+        reader: PacketReader = PacketReader(data)
 
         try:
             # Check if the packet is a unconnected pong packet
-            if data[offset] != 0x1c:
-                if self.debug:
+            if reader.read_unsigned_byte() != 0x1c:
+                if debug:
                     print('Invalid packet type (Unconnected Pong)')
                 return None
 
-            offset += 1
-
             # Read the time sent (8 bytes)
-            time_sent, = struct.unpack_from('>Q', data, offset)
-            offset += 8
+            time_sent: int = reader.read_unsigned_long()
 
             # Read server GUID (8 bytes)
-            server_guid, = struct.unpack_from('>Q', data, offset)
-            offset += 8
+            server_guid: int = reader.read_unsigned_long()
 
             # Read the magic bytes (16 bytes)
-            MAGIC: bytes = b'\x00\xff\xff\x00\xfe\xfe\xfe\xfe\xfd\xfd\xfd\xfd\x12\x34\x56\x78'
-            magic: bytes = data[offset:offset + 16]
+            magic: memoryview = reader.read_bytes(16)
 
             if magic != MAGIC:
-                if self.debug:
+                if debug:
                     print('Invalid magic bytes. Expected: 0x00FFFFFF00FEFEFEFEFDFDFD12345678')
                 return None
 
-            offset += 16
-
-            # Read the length of the server ID string (2 bytes)
-            server_id_length, = struct.unpack_from('>H', data, offset)
-            offset += 2
-
-            # Read the server ID string
-            server_id: str = data[offset:offset + server_id_length].decode('utf-8')
-            offset += server_id_length
+            # Read the length of the server ID string (2 bytes) and the server ID string
+            server_id: str = str(reader.read_bytes(reader.read_unsigned_short()), 'utf-8')
 
-            if self.debug:
+            if debug:
                 print(f'Received server ID: {server_id}')
 
             # Split the server ID string
@@ -119,7 +191,7 @@ class BedrockHandler:
 
             # Check if the response data is valid
             if len(response_data) < 6:
-                if self.debug:
+                if debug:
                     print('Invalid response data')
                 return None
 
@@ -128,8 +200,8 @@ class BedrockHandler:
             version: Version = Version(text=response_data[3], original=response_data[3], protocol=int(response_data[2]))
             players: Players = Players(online=int(response_data[4]), max=int(response_data[5]))
             server_data: BedrockServerResponse = BedrockServerResponse(
-                ip_address=self.client.server_address,
-                port=self.client.server_port,
+                ip_address=ip_address,
+                port=port,
                 motd=motd,
                 version=version,
                 players=players,
@@ -143,7 +215,7 @@ class BedrockHandler:
             return server_data
 
         except Exception as e:
-            if self.debug:
+            if debug:
                 print(f'Error parsing Bedrock server response: {e}')
 
             return None
@@ -0,0 +1,255 @@
+import random
+import selectors
+import socket
+import struct
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .bedrock_handler import BedrockHandler
+from ..models.bedrock_server_data import BedrockServerResponse
+from ..utils.proxy_pool import Proxy, ProxyPool
+from ..utils.udp_relay import UdpAssociation, UdpAssociationPool, udp_association_pool
+
+Target = Tuple[str, int]
+
+
+class BedrockSweeper:
+    """
+    Ping many Bedrock servers from a single UDP socket.
+
+    Unconnected ping/pong is connectionless, so every ping is sent from the same socket
+    and each pong is matched to its target by the source address and the echoed time field,
+    which holds a token unique to the ping instead of a timestamp.
+    With a proxy pool, the pings are spread over one UDP association of each SOCKS5 proxy instead.
+    """
+    # Idle SOCKS5 UDP associations, shared with the Bedrock queries of the clients
+    udp_associations: UdpAssociationPool = udp_association_pool
+
+    def __init__(
+            self,
+            timeout: float = 2,
+            rate: int = 5000,
+            max_pending: int = 65536,
+            receive_buffer: int = 4 * 1024 * 1024,
+            debug: bool = False,
+            proxy_pool: Optional[ProxyPool] = None,
+    ):
+        """
+        Initialize a new BedrockSweeper.
+
+        :param timeout: Time in seconds to wait for the pong of each target.
+        :param rate: Maximum number of pings sent per second.
+        :param max_pending: Maximum number of targets waiting for a pong at the same time.
+        :param receive_buffer: Size of the socket receive buffer (SO_RCVBUF) in bytes.
+        :param debug: Flag to enable debug logging.
+        :param proxy_pool: Pool of proxies to send the pings through, every available SOCKS5 proxy gets a UDP association.
+        """
+        if rate <= 0:
+            raise ValueError('The ping rate must be greater than 0')
+
+        self.timeout: float = timeout
+        self.rate: int = rate
+        self.max_pending: int = max_pending
+        self.receive_buffer: int = receive_buffer
+        self.debug: bool = debug
+        self.proxy_pool: Optional[ProxyPool] = proxy_pool
+
+    def sweep(self, targets: Iterable[Target]) -> Iterator[Tuple[Target, Optional[BedrockServerResponse]]]:
+        """
+        Ping every target and yield the results as soon as they are known.
+        Targets must be (IPv4 address, port) tuples, domains have to be resolved first.
+        Targets that do not answer before the timeout are yielded with None.
+        A target that appears again while it is still waiting for its pong is ignored.
+
+        :param targets: The (IP address, port) pairs to ping.
+        :return Iterator[Tuple[Target, Optional[BedrockServerResponse]]]: (target, server data) pairs.
+        """
+        targets_iterator: Iterator[Target] = iter(targets)
+        pending: Dict[Target, Tuple[int, float]] = {}  # Target -> (token, send time)
+        deadlines: Deque[Tuple[float, Target, int]] = deque()  # Ordered by deadline, the timeout is the same for every target
+        send_interval: float = 1 / self.rate
+        next_send: float = time.monotonic()
+        unsent: Optional[Target] = None  # Target that could not be sent because the socket buffer was full
+        exhausted: bool = False
+        token: int = random.getrandbits(64)
+        proxies: List[Proxy] = []
+        sockets: List[Union[socket.socket, UdpAssociation]] = []
+        sent: int = 0  # Number of pings sent, the pings are spread over the sockets in turn
+        selector: selectors.BaseSelector = selectors.DefaultSelector()
+
+        try:
+            if self.proxy_pool is not None:
+                proxies = self.proxy_pool.acquire_all(proxy_type='socks5')
+                sockets.extend(self._open_associations(proxies))
+
+                if not sockets:
+                    raise Exception('No SOCKS5 proxy of the pool could open a UDP association')
+
+            else:
+                sockets.append(socket.socket(socket.AF_INET, socket.SOCK_DGRAM))
+
+            for sock in sockets:
+                sock.setblocking(False)
+
+                try:
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.receive_buffer)
+
+                except OSError:
+                    pass
+
+                selector.register(sock, selectors.EVENT_READ)
+
+            while not exhausted or unsent is not None or pending:
+                now: float = time.monotonic()
+
+                # Do not send a burst to catch up after the consumer was slow
+                next_send = max(next_send, now - send_interval)
+
+                # Send the pings allowed by the pacing
+                while next_send <= now and len(pending) < self.max_pending:
+                    if unsent is not None:
+                        target, unsent = unsent, None
+
+                    else:
+                        target = next(targets_iterator, None)
+
+                        if target is None:
+                            exhausted = True
+                            break
+
+                        target = (target[0], int(target[1]))
+
+                    if target in pending:
+                        continue
+
+                    token = (token + 1) & 0xFFFFFFFFFFFFFFFF
+
+                    try:
+                        sockets[sent % len(sockets)].sendto(BedrockHandler._build_ping_packet(token), target)
+
+                    except BlockingIOError:
+                        unsent = target
+                        break
+
+                    except OSError as e:
+                        if self.debug:
+                            print(f'Error sending ping to {target[0]}:{target[1]}: {e}')
+
+                        yield target, None
+                        continue
+
+                    pending[target] = (token, now)
+                    deadlines.append((now + self.timeout, target, token))
+                    next_send += send_interval
+                    sent += 1
+
+                # Wait for pongs until the next ping must be sent or the next target expires
+                wait_until: float = deadlines[0][0] if deadlines else now + self.timeout
+
+                if (not exhausted or unsent is not None) and len(pending) < self.max_pending:
+                    wait_until = min(wait_until, next_send)
+
+                for key, _ in selector.select(max(0.0, wait_until - time.monotonic())):
+                    yield from self._receive_pongs(key.fileobj, pending)
+
+                # Expire the targets that did not answer in time
+                now = time.monotonic()
+
+                while deadlines and deadlines[0][0] <= now:
+                    _, target, target_token = deadlines.popleft()
+                    entry: Optional[Tuple[int, float]] = pending.get(target)
+
+                    # The target may have answered already, or it was pinged again after answering
+                    if entry is not None and entry[0] == target_token:
+                        del pending[target]
+                        yield target, None
+
+        finally:
+            selector.close()
+
+            for sock in sockets:
+                if isinstance(sock, UdpAssociation):
+                    self.udp_associations.checkin(sock)
+
+                else:
+                    sock.close()
+
+            for proxy in proxies:
+                self.proxy_pool.release(proxy)
+
+    def _open_associations(self, proxies: List[Proxy]) -> List[UdpAssociation]:
+        """
+        Take a UDP association of each proxy, the handshakes run concurrently.
+        The outcome of each handshake is reported to the pool.
+
+        :param proxies: The SOCKS5 proxies taken from the pool.
+        :return List[UdpAssociation]: The associations of the proxies that answered.
+        """
+        def checkout(proxy: Proxy) -> Optional[UdpAssociation]:
+            start_time: float = time.monotonic()
+
+            try:
+                association: UdpAssociation = self.udp_associations.checkout(proxy.address, proxy.port, self.timeout)
+
+            except Exception as e:
+                if self.debug:
+                    print(f'Error opening a UDP association with proxy {proxy.address}:{proxy.port}: {e}')
+
+                self.proxy_pool.report_failure(proxy)
+                return None
+
+            if association.checkouts == 1:
+                self.proxy_pool.report_success(proxy, time.monotonic() - start_time)
+
+            return association
+
+        if not proxies:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(len(proxies), 32)) as executor:
+            return [association for association in executor.map(checkout, proxies) if association is not None]
+
+    def _receive_pongs(self, sock: Union[socket.socket, UdpAssociation], pending: Dict[Target, Tuple[int, float]]) -> Iterator[Tuple[Target, BedrockServerResponse]]:
+        """
+        Read every datagram available in the socket and yield the pongs of pending targets.
+
+        :param sock: The sweep socket, or a UDP association of a proxy.
+        :param pending: The targets waiting for a pong, with their token and send time.
+        :return Iterator[Tuple[Target, BedrockServerResponse]]: (target, server data) pairs.
+        """
+        while True:
+            try:
+                data, address = sock.recvfrom(4096)
+
+            except BlockingIOError:
+                return
+
+            except OSError as e:
+                # ICMP errors can be reported on the socket, they do not affect the other targets
+                if self.debug:
+                    print(f'Error receiving pong: {e}')
+
+                continue
+
+            received_at: float = time.monotonic()
+            target: Target = (address[0], address[1])
+            entry: Optional[Tuple[int, float]] = pending.get(target)
+
+            # Ignore datagrams from unknown sources and pongs that do not echo the token of the ping
+            if entry is None or len(data) < 9 or struct.unpack_from('>Q', data, 1)[0] != entry[0]:
+                if self.debug:
+                    print(f'Ignoring unexpected datagram from {target[0]}:{target[1]}')
+
+                continue
+
+            server_data: Optional[BedrockServerResponse] = BedrockHandler.parse_unconnected_pong(data, target[0], target[1], self.debug)
+
+            if server_data is None:
+                # Not a valid pong, the target keeps waiting until its deadline
+                continue
+
+            del pending[target]
+            server_data.ping = int((received_at - entry[1]) * 1000)
+            yield target, server_data
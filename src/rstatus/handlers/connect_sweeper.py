@@ -0,0 +1,287 @@
+import errno
+import selectors
+import socket
+import struct
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..utils.resolver import Resolver
+
+Target = Tuple[str, int]
+
+# States of a swept port
+OPEN: str = 'open'
+REFUSED: str = 'refused'  # The host answered with a reset, nothing listens on the port
+TIMEOUT: str = 'timeout'  # No answer, the host is down or the port is filtered
+ERROR: str = 'error'  # Any other error (host or network unreachable...)
+STATES: Tuple[str, ...] = (OPEN, REFUSED, TIMEOUT, ERROR)
+
+# Close the sockets with a reset, so thousands of checked ports do not leave connections in TIME_WAIT
+LINGER_RESET: bytes = struct.pack('ii', 1, 0)
+
+
+class ConnectSweeper:
+    """
+    Check the TCP ports of many servers with non-blocking connects, before querying them.
+
+    Each port only costs a connect: thousands of them are in flight at once and a selector waits for all of them,
+    so the status protocol only runs on the open ports instead of waiting for the timeout of every dead host.
+    """
+    def __init__(self, timeout: float = 2, rate: int = 10000, max_pending: int = 512, debug: bool = False):
+        """
+        Initialize a new ConnectSweeper.
+
+        :param timeout: Time in seconds to wait for the connect of each target.
+        :param rate: Maximum number of connects started per second.
+        :param max_pending: Maximum number of connects in flight at the same time (each one holds a file descriptor).
+        :param debug: Flag to enable debug logging.
+        """
+        if rate <= 0:
+            raise ValueError('The connect rate must be greater than 0')
+
+        self.timeout: float = timeout
+        self.rate: int = rate
+        self.max_pending: int = max_pending
+        self.debug: bool = debug
+        self.counts: Dict[str, int] = dict.fromkeys(STATES, 0)  # Number of targets in each state, reset by each sweep
+
+    def sweep(self, targets: Iterable[Target]) -> Iterator[Tuple[Target, str]]:
+        """
+        Connect to every target and yield the state of its port as soon as it is known.
+        Targets must be (IPv4 address, port) tuples, domains have to be resolved first.
+
+        :param targets: The (IP address, port) pairs to check.
+        :return Iterator[Tuple[Target, str]]: (target, state) pairs, the state is one of STATES.
+        """
+        for target, state in self._sweep(targets):
+            if target is not None:
+                yield target, state
+
+    def _sweep(self, targets: Iterable[Optional[Target]]) -> Iterator[Tuple[Optional[Target], Optional[str]]]:
+        """
+        Sweep the targets, see sweep.
+        A None target stops the reading of the targets until a connect completes, and is yielded back as (None, None)
+        so the caller can empty its buffers in the meantime (see sweep_targets).
+
+        :param targets: The (IP address, port) pairs to check, or None to pause.
+        :return Iterator[Tuple[Optional[Target], Optional[str]]]: (target, state) pairs, and (None, None) for each pause.
+        """
+        self.counts = dict.fromkeys(STATES, 0)
+        targets_iterator: Iterator[Target] = iter(targets)
+        pending: Dict[socket.socket, Target] = {}
+        deadlines: Deque[Tuple[float, socket.socket]] = deque()  # Ordered by deadline, the timeout is the same for every target
+        send_interval: float = 1 / self.rate
+        next_send: float = time.monotonic()
+        unsent: Optional[Target] = None  # Target that could not be started because no file descriptor was left
+        exhausted: bool = False
+        stalled: bool = False  # The targets paused, no target is read until a connect completes
+        selector: selectors.BaseSelector = selectors.DefaultSelector()
+
+        try:
+            while not exhausted or unsent is not None or pending:
+                now: float = time.monotonic()
+
+                # Do not send a burst to catch up after the consumer was slow
+                next_send = max(next_send, now - send_interval)
+
+                # Start the connects allowed by the pacing
+                while next_send <= now and len(pending) < self.max_pending and not stalled:
+                    if unsent is not None:
+                        target, unsent = unsent, None
+
+                    else:
+                        try:
+                            target = next(targets_iterator)
+
+                        except StopIteration:
+                            exhausted = True
+                            break
+
+                        if target is None:
+                            stalled = True
+                            yield None, None
+                            break
+
+                        target = (target[0], int(target[1]))
+
+                    try:
+                        sock: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+
+                    except OSError as e:
+                        if e.errno not in (errno.EMFILE, errno.ENFILE) or not pending:
+                            raise
+
+                        # Out of file descriptors, wait for the connects in flight
+                        unsent = target
+                        break
+
+                    sock.setblocking(False)
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, LINGER_RESET)
+                    next_send += send_interval
+
+                    try:
+                        code: int = sock.connect_ex(target)
+
+                    except OSError as e:
+                        # Invalid addresses
+                        code = e.errno or errno.EINVAL
+
+                    if code in (errno.EINPROGRESS, errno.EWOULDBLOCK):
+                        pending[sock] = target
+                        deadlines.append((now + self.timeout, sock))
+                        selector.register(sock, selectors.EVENT_WRITE)
+                        continue
+
+                    # Connects to the local host may complete or fail at once
+                    sock.close()
+                    yield target, self._record(target, code)
+
+                # Wait for connects until the next one must be started or the next target expires
+                wait_until: float = deadlines[0][0] if deadlines else now + self.timeout
+
+                if (not exhausted or unsent is not None) and len(pending) < self.max_pending and not stalled:
+                    wait_until = min(wait_until, next_send)
+
+                if pending:
+                    events: List[Tuple[selectors.SelectorKey, int]] = selector.select(max(0.0, wait_until - time.monotonic()))
+
+                else:
+                    events = []
+
+                    # Nothing is registered (a selector may fail without sockets), only wait for the pacing
+                    if not exhausted and not stalled:
+                        time.sleep(max(0.0, wait_until - time.monotonic()))
+
+                for key, _ in events:
+                    completed: socket.socket = key.fileobj
+                    target = pending.pop(completed)
+                    code = completed.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                    selector.unregister(completed)
+                    completed.close()
+                    yield target, self._record(target, code)
+
+                # Expire the targets that did not answer in time
+                now = time.monotonic()
+                expired_any: bool = False
+
+                while deadlines and deadlines[0][0] <= now:
+                    _, expired = deadlines.popleft()
+                    target = pending.pop(expired, None)
+
+                    # The connect may have completed already
+                    if target is not None:
+                        selector.unregister(expired)
+                        expired.close()
+                        expired_any = True
+                        yield target, self._record(target, None)
+
+                # Read the targets again once a connect completed
+                stalled = stalled and bool(pending) and not events and not expired_any
+
+        finally:
+            selector.close()
+
+            for sock in pending:
+                sock.close()
+
+    def sweep_targets(
+            self,
+            targets: Iterable[Any],
+            resolve: Callable[[Any], Optional[Target]] = Resolver.resolve_endpoint,
+    ) -> Iterator[Tuple[Any, Optional[str]]]:
+        """
+        Sweep targets that are not resolved yet, like the targets of the clients ("example.com", "192.0.2.10:25565").
+        Targets resolved to the same endpoint while it is being checked share its connect. At most max_pending
+        unresolved targets and targets sharing a connect are buffered, the targets are not read further until then.
+
+        :param targets: The targets.
+        :param resolve: Function returning the (IP address, port) endpoint of a target, or None if it cannot be resolved
+            (ValueError and OSError are handled as unresolved targets too).
+        :return Iterator[Tuple[Any, Optional[str]]]: (target, state) pairs, the state is None for unresolved targets.
+        """
+        waiting: Dict[Target, List[Any]] = {}  # Endpoint being checked -> its targets
+        unresolved: List[Any] = []
+        shared: int = 0  # Targets waiting for the connect of another target
+
+        def endpoints() -> Iterator[Optional[Target]]:
+            nonlocal shared
+
+            for target in targets:
+                # Pause the sweep until the buffered targets are yielded
+                while len(unresolved) + shared >= self.max_pending:
+                    yield None
+
+                try:
+                    endpoint: Optional[Target] = resolve(target)
+
+                except (ValueError, OSError) as e:
+                    # Invalid targets (a port that is not a number...) must not stop the sweep of the others
+                    if self.debug:
+                        print(f'Error resolving {target}: {e}')
+
+                    endpoint = None
+
+                if endpoint is None:
+                    unresolved.append(target)
+
+                elif endpoint in waiting:
+                    waiting[endpoint].append(target)
+                    shared += 1
+
+                else:
+                    waiting[endpoint] = [target]
+                    yield endpoint
+
+        for endpoint, state in self._sweep(endpoints()):
+            while unresolved:
+                yield unresolved.pop(), None
+
+            if endpoint is None:
+                continue
+
+            endpoint_targets: List[Any] = waiting.pop(endpoint)
+            shared -= len(endpoint_targets) - 1
+
+            for target in endpoint_targets:
+                yield target, state
+
+        while unresolved:
+            yield unresolved.pop(), None
+
+    def open_ports(self, targets: Iterable[Target]) -> Iterator[Target]:
+        """
+        Connect to every target and only yield the targets whose port is open.
+
+        :param targets: The (IP address, port) pairs to check.
+        :return Iterator[Target]: The targets with an open port.
+        """
+        for target, state in self.sweep(targets):
+            if state == OPEN:
+                yield target
+
+    def _record(self, target: Target, code: Optional[int]) -> str:
+        """
+        Get the state of a completed connect and count it.
+
+        :param target: The target.
+        :param code: The error code of the connect (0 if it succeeded), None if it timed out.
+        :return str: The state of the port.
+        """
+        if code is None:
+            state: str = TIMEOUT
+
+        elif code == 0:
+            state = OPEN
+
+        elif code == errno.ECONNREFUSED:
+            state = REFUSED
+
+        else:
+            state = ERROR
+
+            if self.debug:
+                print(f'Error connecting to {target[0]}:{target[1]}: {errno.errorcode.get(code, code)}')
+
+        self.counts[state] += 1
+        return state
@@ -1,31 +1,72 @@
-import struct
+import functools
 import time
 import json
 import uuid
-from typing import Optional, Union
+from typing import FrozenSet, Iterable, Optional, Tuple, Union
 
-from ..packets import MinecraftPacket, HandshakePacket, LoginStartPacket
+from ..packets import MinecraftPacket, HandshakePacket, LoginStartPacket, PacketReader, packet_cache
 from ..utils.client import MinecraftClient
+from ..models.favicon import Favicon
 from ..models.java_server_data import JavaServerResponse, MOTD, Version, Players, ModInfo
 from ..protocol.version import ProtocolVersion
 from ..utils.clear import ClearResponse
+from ..utils import fast_json
+from ..utils.favicons import FaviconStore, favicon_store
+from ..utils.login_modes import LoginModeCache, login_mode_cache
 from ..utils.response import BotResponse
+from ..utils.retry import BackoffRegistry, RetryLater, backoff_registry
+
+# UUID of the player sent in the BungeeCord IP forwarding data
+BUNGEEHACK_UUID: uuid.UUID = uuid.uuid3(uuid.NAMESPACE_DNS, 'MCPTool')
+
+# Base time in seconds the bot waits before reconnecting to a server that throttled it
+RETRY_DELAY: float = 5.5
+
+# How favicons are kept in the server data: as sent by the server, in the favicon store, or not at all
+FAVICON_MODES: Tuple[str, ...] = ('inline', 'store', 'none')
+
+# Fields of JavaServerResponse that can be requested in a projection ("players" requests every field of the players)
+JAVA_FIELDS: FrozenSet[str] = frozenset({
+    'ip_address', 'port', 'ping', 'brand', 'plugin_channels', 'favicon', 'bot_response', 'raw_response',
+    'motd', 'motd.text', 'motd.original',
+    'version', 'version.text', 'version.original', 'version.protocol', 'version.version_name',
+    'players', 'players.online', 'players.max', 'players.players', 'players.sample',
+    'mod_info', 'mod_info.type', 'mod_info.mod_list',
+})
 
 
 class JavaHandler:
+    # Backoff of the servers, shared by every client of the process
+    backoff: BackoffRegistry = backoff_registry
+
+    # Login packet modes that worked, shared by every client of the process
+    login_modes: LoginModeCache = login_mode_cache
+
+    # Favicons of the servers (favicon mode "store"), shared by every client of the process
+    favicons: FaviconStore = favicon_store
+
     def __init__(self, client: MinecraftClient):
         self.client = client
+        self.defer_retries: bool = False  # Raise RetryLater instead of waiting for the backoff of the server
+        self.favicon_mode: str = 'inline'
+        self.retain_raw_response: bool = True
+        self.retain_sample: bool = True
+        self.retain_mod_list: bool = True
         self.bot_connection_attempts: int = 0
         self.last_bot_response: str = ''
         self.bot_response_protocol: int = 0
         self.login_packet_mode: int = 0
+        self.cached_login_mode: Optional[int] = None  # Mode the bot started with, taken from the login mode cache
+        self.login_accepted: bool = False  # The server accepted the last login start packet of the bot
         self.extra_bool = False
         self.uuid = False
 
-    def _java_server_status(self, bot: bool = True) -> Optional[JavaServerResponse]:
+    def _java_server_status(self, bot: bool = True, fields: Optional[FrozenSet[str]] = None) -> Optional[JavaServerResponse]:
         """
         Get the status of the server and return the result.
 
+        :param bot: Determines if the bot connection should be used.
+        :param fields: The fields of the server data to build (every field if not provided, see projection).
         :return Optional[Dict]: The server status data or None if an error occurred.
         """
         try:
@@ -34,20 +75,17 @@ class JavaHandler:
             # Start the connection
             self.client.connect()
 
-            # Send the handshake packet with next state 1 (status)
-            self._send_handshake(next_state=1)
-
-            # Send the status request packet
-            self._send_status_request()
+            # Send the handshake packet with next state 1 (status) and the status request packet
+            self.client.sock.sendall(self._status_request_packets())
 
             # Receive the response packet
-            response_data: bytes = self._receive_packet()
+            response_data: bytes = self.client._receive_packet()
 
             # Calculate the response time in milliseconds
             response_time = (time.time() - start_time) * 1000
 
             # Parse the status response data
-            server_data: JavaServerResponse = self._parse_status_response(response_data, bot)
+            server_data: JavaServerResponse = self._parse_status_response(response_data, bot, fields)
 
             # Add the ping time to the server data and return it
             server_data.ping = int(response_time)
@@ -80,33 +118,29 @@ class JavaHandler:
             if server_status is None:
                 return 'Could not get server status.'
 
-            protocol_version = server_status.version.protocol
-
-        else:
-            if str(version) == '120':
-                return 'Connection failed (TCPShield Detected)'
-
-            if str(version) == '-1':
-                version = 47
-
-            if isinstance(version, str):
-                protocol_version = ProtocolVersion.get_protocol_by_version(version)
+            version = server_status.version.protocol
 
-            else:
-                protocol_version = version
+        elif str(version) == '120':
+            return 'Connection failed (TCPShield Detected)'
 
-        if ProtocolVersion.get_version_by_protocol(protocol_version) is None:
-            if self.client.debug:
-                print(f'Invalid protocol version: {protocol_version}. Using default version 47')
+        protocol_version: int = self._protocol_from_version(version)
+        self.bot_response_protocol = protocol_version
 
-            protocol_version = 47
+        # Start with the login mode that worked last time for this server or protocol version
+        if self.bot_connection_attempts == 0:
+            cached_mode: Optional[int] = self.login_modes.get(protocol_version, self._server_key())
 
-        self.bot_response_protocol = protocol_version
+            if cached_mode is not None:
+                self.login_packet_mode = cached_mode
+                self.cached_login_mode = cached_mode
 
         if self.login_packet_mode == 5:
             self.login_packet_mode = -1
             protocol_version = 47
-            time.sleep(5.5)
+            self.backoff.backoff(self._server_key(), RETRY_DELAY)
+
+        # Wait for the end of the backoff of the server (or defer the attempt)
+        self._wait_for_backoff(protocol_version)
 
         if self.client.debug:
             print(f'Connecting bot with protocol version: {protocol_version}')
@@ -115,19 +149,24 @@ class JavaHandler:
             # Start the connection
             self.client.connect()
 
-            # Send the handshake packet with next state 2 (login)
-            self._send_handshake(protocol_version, next_state=2)
-
-            # Send the login start packet with the bot username
-            self._send_login_start(username=username, protocol_version=protocol_version)
+            # Send the handshake packet with next state 2 (login) and the login start packet with the bot username
+            self.client.sock.sendall(self._login_packets(protocol_version, username))
 
             # Handle the login response
+            self.login_accepted = False
             result: str = self._handle_login_response()
             self.last_bot_response = result
 
             if self.client.debug:
                 print(f'Bot connection result: {result}')
 
+            if not self._is_throttled(result):
+                self.backoff.reset(self._server_key())
+
+                # Only a mode the server accepted is cached, the forced protocol 47 retry (mode -1) is a last resort
+                if self.login_accepted and self.login_packet_mode >= 0:
+                    self.login_modes.put(protocol_version, self.login_packet_mode, self._server_key())
+
             if 'ip forwarding' in result.lower():
                 if self.client.debug:
                     print('Detected Network Port (IP Forwarding). Retrying connection with BungeeHack.')
@@ -137,20 +176,24 @@ class JavaHandler:
                 result: str = self._bot_response(version=protocol_version)
 
             if 'io.netty.handler.codec' in result.lower():
-                self.login_packet_mode += 1
+                self.login_packet_mode = self._next_login_mode()
                 self.bot_connection_attempts += 1
                 result: str = self._bot_response(version=protocol_version)
 
-            if 'connection throttled! please wait before reconnecting' in result.lower():
+            if self._is_throttled(result):
+                delay: float = self.backoff.backoff(self._server_key(), RETRY_DELAY)
+
                 if self.client.debug:
-                    print('Connection throttled. Retrying connection in 5.5 seconds.')
+                    print(f'Connection throttled. Retrying connection in {delay:.2f} seconds.')
 
-                time.sleep(5.5)
                 self.bot_connection_attempts += 1
                 result: str = self._bot_response(version=protocol_version)
 
             return result
 
+        except RetryLater:
+            raise
+
         except Exception as e:
             if self.client.debug:
                 print(f'Error connecting bot: {e}')
@@ -160,17 +203,122 @@ class JavaHandler:
         finally:
             self.client.close()
 
-    def _send_handshake(self, protocol_version: int = 47, next_state: int = 1) -> None:
+    def _next_login_mode(self) -> int:
+        """
+        Get the login mode to try after the server rejected the login start packet.
+        A cached mode is tried first, so when it fails the walk restarts at 0 and skips it.
+
+        :return int: The next login mode (5 when every mode failed).
+        """
+        if self.cached_login_mode is not None and self.login_packet_mode == self.cached_login_mode:
+            mode: int = 0
+
+        else:
+            mode = self.login_packet_mode + 1
+
+        if mode == self.cached_login_mode:
+            mode += 1
+
+        return mode
+
+    def _server_key(self) -> tuple:
+        """
+        Get the key of the server in the backoff registry.
+
+        :return tuple: The (address, port) of the server.
+        """
+        return self.client.server_address, self.client.server_port
+
+    @staticmethod
+    def _is_throttled(result: str) -> bool:
+        """
+        Check if the result of the bot connection is a connection throttle kick.
+
+        :param result: The result of the bot connection.
+        :return bool: True if the server throttled the connection.
+        """
+        return 'connection throttled! please wait before reconnecting' in result.lower()
+
+    def _wait_for_backoff(self, version: Union[str, int]) -> None:
+        """
+        Wait until the backoff of the server ends.
+        If defer_retries is enabled, RetryLater is raised instead, so the caller can do other work in the meantime.
+
+        :param version: The version the bot has to be called with to resume the attempt.
+        """
+        delay: float = self.backoff.remaining(self._server_key())
+
+        if delay <= 0:
+            return
+
+        if self.defer_retries:
+            raise RetryLater(delay, version)
+
+        if self.client.debug:
+            print(f'Waiting {delay:.2f} seconds for the backoff of the server.')
+
+        time.sleep(delay)
+
+    def _protocol_from_version(self, version: Union[str, int]) -> int:
+        """
+        Get the protocol number used by the bot from a version name or protocol number.
+
+        :param version: The version of the server protocol (Version name or protocol number).
+        :return int: The protocol number, 47 if the version is unknown.
+        """
+        if str(version) == '-1':
+            version = 47
+
+        if isinstance(version, str):
+            protocol_version: int = ProtocolVersion.get_protocol_by_version(version)
+
+        else:
+            protocol_version = version
+
+        if ProtocolVersion.get_version_by_protocol(protocol_version) is None:
+            if self.client.debug:
+                print(f'Invalid protocol version: {protocol_version}. Using default version 47')
+
+            protocol_version = 47
+
+        return protocol_version
+
+    def _status_request_packets(self) -> bytes:
+        """
+        Get the handshake (next state 1) and status request packets for the server.
+        The packets are built once per target and then taken from the packet cache.
+
+        :return bytes: The framed packets.
+        """
+        key: tuple = (47, self.client.server_address, self.client.server_port, 1, self.client.bungeehack, None, None)
+        return packet_cache.get_or_build(key, lambda: self._build_handshake(next_state=1) + MinecraftPacket().build_packet(0x00))
+
+    def _login_packets(self, protocol_version: int, username: str) -> bytes:
+        """
+        Get the handshake (next state 2) and login start packets for the server.
+        The packets are built once per target and login options and then taken from the packet cache.
+
+        :param protocol_version: The protocol version to use.
+        :param username: The username of the bot to connect.
+        :return bytes: The framed packets.
+        """
+        if self.client.debug:
+            print(f'[?] Login packet mode: {self.login_packet_mode}')
+
+        key: tuple = (protocol_version, self.client.server_address, self.client.server_port, 2, self.client.bungeehack, self.login_packet_mode, username)
+        return packet_cache.get_or_build(key, lambda: self._build_handshake(protocol_version, next_state=2) + self._build_login_start(username=username))
+
+    def _build_handshake(self, protocol_version: int = 47, next_state: int = 1) -> bytes:
         """
-        Sends a handshake packet to the server.
+        Builds a handshake packet for the server.
 
         :param protocol_version: The protocol version to use.
         :param next_state: The next state to switch to after the handshake (1=status, 2=login).
+        :return bytes: The full handshake packet.
         """
         # Add the BungeeC ord IP forwarding data if enabled
         if self.client.bungeehack:
-            player_uuid: uuid.UUID = uuid.uuid3(uuid.NAMESPACE_DNS, 'MCPTool')
-            server_address: str = f'{self.client.server_address}\x00127.0.0.1\x00{player_uuid}'
+            server_address: str = f'{self.client.server_address}\x00127.0.0.1\x00{BUNGEEHACK_UUID}'
 
         else:
             server_address = self.client.server_address
@@ -182,52 +330,94 @@ class JavaHandler:
             server_port=self.client.server_port,
             next_state=next_state
         )
-        # Send the handshake packet
-        self.client.sock.sendall(handshake.build_packet(0x00, compression_handler=self.client.compression_handler))
-
-    def _send_status_request(self) -> None:
-        """ Sends a status request packet to the server """
-        self.client.sock.sendall(MinecraftPacket().build_packet(0x00))
+        return handshake.build_packet(0x00, compression_handler=self.client.compression_handler)
 
-    def _send_login_start(self, username: str, protocol_version: int) -> None:
+    def _build_login_start(self, username: str) -> bytes:
         """
-        Sends a login start packet to the server.
+        Builds a login start packet using the current login packet mode.
 
         :param username: The username of the bot to connect.
+        :return bytes: The full login start packet.
         """
-        login_start: LoginStartPacket = LoginStartPacket(username=username, login_packet_mode=self.login_packet_mode, debug=self.client.debug)
-        self.client.sock.sendall(login_start.build_packet(0x00, compression_handler=self.client.compression_handler))
+        login_start: LoginStartPacket = LoginStartPacket(username=username, login_packet_mode=self.login_packet_mode, debug=False)
+        return login_start.build_packet(0x00, compression_handler=self.client.compression_handler)
 
-    def _parse_status_response(self, data: bytes, bot: bool) -> JavaServerResponse:
+    def _parse_status_response(self, data: bytes, bot: bool, fields: Optional[FrozenSet[str]] = None) -> JavaServerResponse:
         """
         Parse the status response data and return the server data.
 
         :param data: The status response data to parse.
+        :param bot: Determines if the bot connection should be used.
+        :param fields: The fields of the server data to build (every field if not provided).
         :return Dict: The server data parsed from the response.
         """
+        original_server_data: dict = self._decode_status_response(data)
+
+        # Get the bot response
+        version_protocol: int = original_server_data.get('version', {}).get('protocol', 0)
+        bot_response: str = ''
+
+        if bot and self._wants(fields, 'bot_response'):
+            bot_response = ClearResponse.clear_response(self._bot_response(version=version_protocol))
+
+        return self._build_status_response(original_server_data, bot_response, fields)
+
+    def _decode_status_response(self, data: bytes) -> dict:
+        """
+        Decode the status response packet into the server JSON data.
+
+        :param data: The status response data to decode.
+        :return dict: The JSON data sent by the server.
+        """
         # Parse the status response data
-        packet_id, index = MinecraftPacket.read_varint_from_data(data)
+        reader: PacketReader = PacketReader(data)
+        packet_id: int = reader.read_varint()
 
         # Check if the packet ID is not 0x00
         if packet_id != 0x00:
             # The packet ID is not 0x00 (Status Response)
             raise Exception(f'Unexpected packet ID: {packet_id}')
 
-        response_json, _ = MinecraftPacket.read_string_from_data(data[index:])
-        original_server_data: dict = json.loads(response_json)
+        # The JSON is decoded from the packet data directly (with orjson if it is installed)
+        original_server_data: dict = fast_json.loads(reader.read_bytes(reader.read_varint()))
 
         if self.client.debug:
             print(f'Status Response: {original_server_data}')
 
-        # Parse the MOTD
-        motd_text: str = MinecraftPacket.parse_chat(original_server_data.get('description', ''))
-        motd: MOTD = MOTD(text=ClearResponse.clear_response(motd_text), original=motd_text)
+        return original_server_data
+
+    def _build_status_response(self, original_server_data: dict, bot_response: str, fields: Optional[FrozenSet[str]] = None) -> JavaServerResponse:
+        """
+        Build the server data from the decoded status JSON.
+        The fields that are not in the projection are left empty.
+
+        :param original_server_data: The JSON data sent by the server.
+        :param bot_response: The cleared bot response ('' if the bot was not used).
+        :param fields: The fields of the server data to build (every field if not provided).
+        :return JavaServerResponse: The server data.
+        """
+        # Parse the MOTD, it is rendered on first access
+        if self._wants(fields, 'motd.text') or self._wants(fields, 'motd.original'):
+            description: Union[dict, str] = original_server_data.get('description', '')
+            # Only the description is kept until the MOTD is read, not the client and its buffers
+            motd: MOTD = MOTD.deferred(functools.partial(JavaHandler._render_motd, description))
+
+        else:
+            motd = MOTD('', '')
 
         # Parse the version
-        version_response: str = MinecraftPacket.parse_chat(original_server_data.get('version', {}).get('name', ''))
         version_protocol: int = original_server_data.get('version', {}).get('protocol', 0)
+        version_response: str = ''
+        version_name: Optional[str] = None
+
+        if self._wants(fields, 'version.text') or self._wants(fields, 'version.original'):
+            version_response = MinecraftPacket.parse_chat(original_server_data.get('version', {}).get('name', ''))
+
+        if self._wants(fields, 'version.version_name'):
+            version_name = ProtocolVersion.get_version_by_protocol(version_protocol)
+
         version: Version = Version(text=ClearResponse.clear_response(version_response), original=version_response, protocol=version_protocol,
-                                   version_name=ProtocolVersion.get_version_by_protocol(version_protocol))
+                                   version_name=version_name)
 
         # Parse the players
         players_online: int = original_server_data.get('players', {}).get('online', 0)
@@ -235,7 +425,7 @@ class JavaHandler:
         players_sample: list = original_server_data.get('players', {}).get('sample', [])
         players: Optional[str] = None
 
-        if players_sample != []:
+        if players_sample != [] and self._wants(fields, 'players.players'):
             if self.client.debug:
                 print(f'(1) Players sample: {players_sample}')
             player_list = [{'name': player['name'], 'id': player['id']} for player in players_sample]
@@ -249,15 +439,16 @@ class JavaHandler:
                 if self.client.debug:
                     print(f'(3) Players: {players}')
 
-        players_obj: Players = Players(online=players_online, max=players_max, players=players, sample=players_sample)
+        players_obj: Players = Players(online=players_online, max=players_max, players=players,
+                                       sample=players_sample if self.client.retain_sample and self._wants(fields, 'players.sample') else [])
 
         # Parse the mod info
         mod_info_type: str = original_server_data.get('modinfo', {}).get('type', '')
         mod_info_list: list = original_server_data.get('modinfo', {}).get('modList', [])
-        mod_info: ModInfo = ModInfo(type=mod_info_type, mod_list=mod_info_list)
+        mod_info: ModInfo = ModInfo(type=mod_info_type,
+                                    mod_list=mod_info_list if self.client.retain_mod_list and self._wants(fields, 'mod_info.mod_list') else [])
 
         # Get the bot response
-        bot_response: str = ClearResponse.clear_response(self._bot_response(version=version.protocol)) if bot else ''
         new_bot_response: str = BotResponse.custom_response(bot_response)
 
         # Create the JavaServerResponse object
@@ -268,45 +459,144 @@ class JavaHandler:
             version=version,
             players=players_obj,
             mod_info=mod_info,
-            favicon=original_server_data.get('favicon', ''),
+            favicon=self._favicon(original_server_data, self._wants(fields, 'favicon')),
             ping=0,
             bot_response=new_bot_response,
             brand="",
             plugin_channels="",
-            raw_response=original_server_data
+            raw_response=original_server_data if self.client.retain_raw_response and self._wants(fields, 'raw_response') else {}
         )
         return server_data
 
-    def _handle_set_compression(self, data: bytes) -> None:
+    def _favicon(self, original_server_data: dict, wanted: bool = True) -> Union[str, Favicon]:
+        """
+        Get the favicon of the server data, according to the favicon mode.
+        In the "store" and "none" modes, the favicon is removed from the raw response so it is not kept twice.
+
+        :param original_server_data: The JSON data sent by the server.
+        :param wanted: Determines if the favicon is in the projection.
+        :return Union[str, Favicon]: The favicon data URI ("inline"), the reference to the stored favicon ("store") or ''.
+        """
+        if self.favicon_mode == 'inline':
+            return original_server_data.get('favicon', '') if wanted else ''
+
+        data_uri: str = original_server_data.pop('favicon', '')
+
+        if self.favicon_mode == 'store' and wanted and data_uri and isinstance(data_uri, str):
+            try:
+                return self.favicons.add(data_uri)
+
+            except ValueError as e:
+                if self.client.debug:
+                    print(f'Error storing favicon: {e}')
+
+        return ''
+
+    @staticmethod
+    def _render_motd(description: Union[dict, str]) -> Tuple[str, str]:
+        """
+        Render the MOTD of the server.
+
+        :param description: The description (chat component) sent by the server.
+        :return Tuple[str, str]: The MOTD without and with formatting codes.
+        """
+        motd_text: str = MinecraftPacket.parse_chat(description)
+        return ClearResponse.clear_response(motd_text), motd_text
+
+    @staticmethod
+    def projection(fields: Optional[Iterable[str]]) -> Optional[FrozenSet[str]]:
+        """
+        Validate the fields of a projection.
+
+        :param fields: The requested fields of the server data ("players.online", "version"...), or None for every field.
+        :return Optional[FrozenSet[str]]: The requested fields, or None for every field.
+        """
+        if fields is None:
+            return None
+
+        if isinstance(fields, str):
+            fields = [fields]
+
+        requested: FrozenSet[str] = frozenset(fields)
+        unknown: FrozenSet[str] = requested - JAVA_FIELDS
+
+        if unknown:
+            raise ValueError(f'Unknown server data fields: {", ".join(sorted(unknown))}')
+
+        return requested
+
+    @staticmethod
+    def _wants(fields: Optional[FrozenSet[str]], field: str) -> bool:
+        """
+        Check if a field is in the projection.
+
+        :param fields: The requested fields (None for every field).
+        :param field: The field to check ("players.sample"...).
+        :return bool: True if the field or the object that contains it was requested.
+        """
+        return fields is None or field in fields or field.partition('.')[0] in fields
+
+    @staticmethod
+    def _set_bot_response(server_data: JavaServerResponse, bot_response: str) -> JavaServerResponse:
+        """
+        Add the bot response to server data built without the bot.
+
+        :param server_data: The server data.
+        :param bot_response: The raw result of the bot connection.
+        :return JavaServerResponse: The server data with the bot response.
+        """
+        server_data.bot_response = JavaHandler._format_bot_response(bot_response)
+        return server_data
+
+    @staticmethod
+    def _format_bot_response(bot_response: str) -> str:
+        """
+        Format the raw result of the bot connection as it is shown in the server data.
+
+        :param bot_response: The raw result of the bot connection.
+        :return str: The formatted bot response.
+        """
+        return BotResponse.custom_response(ClearResponse.clear_response(bot_response))
+
+    def _handle_set_compression(self, reader: PacketReader) -> None:
         """
         Handles the set compression packet.
 
-        :param data: The data of the set compression packet.
+        :param reader: The reader of the set compression packet, after the packet ID.
         """
-        threshold, _ = MinecraftPacket.read_varint_from_data(data)
+        threshold: int = reader.read_varint()
         self.client.compression_handler.enable_compression(threshold)
 
         if self.client.debug:
             print(f'Compression enabled with threshold: {threshold}')
 
-    def _handle_login_plugin_request(self, data: bytes) -> None:
+    def _handle_login_plugin_request(self, reader: PacketReader) -> None:
         """
         Handles the login plugin request packet.
 
-        :param data: The data of the login plugin request packet.
+        :param reader: The reader of the login plugin request packet, after the packet ID.
+        """
+        self.client.sock.sendall(self._build_login_plugin_response(reader))
+
+    def _build_login_plugin_response(self, reader: PacketReader) -> bytes:
+        """
+        Builds the login plugin response for a login plugin request packet.
+
+        :param reader: The reader of the login plugin request packet, after the packet ID.
+        :return bytes: The full login plugin response packet.
         """
         # Read the plugin message ID and channel name
-        plugin_message_id, index = MinecraftPacket.read_varint_from_data(data)
-        channel_name, _ = MinecraftPacket.read_string_from_data(data[index:])
+        plugin_message_id: int = reader.read_varint()
+        channel_name: str = reader.read_string()
 
         if self.client.debug:
             print(f'Plugin Message ID: {plugin_message_id}, Channel Name: {channel_name}')
 
         # Respond with Login Plugin Response (packet ID 0x02 in serverbound)
         response: MinecraftPacket = MinecraftPacket()
-        response.data += response.encode_varint(plugin_message_id)
-        response.data += struct.pack('>?', False)
-        self.client.sock.sendall(response.build_packet(0x02, compression_handler=self.client.compression_handler))
+        response.writer.write_varint(plugin_message_id)
+        response.writer.write_bool(False)
+        return response.build_packet(0x02, compression_handler=self.client.compression_handler)
 
     def _handle_login_response(self) -> str:
         """
@@ -315,42 +605,20 @@ class JavaHandler:
         :return str: The result of the login response.
         """
         while True:
-            packet: bytes = self._receive_packet()
-            packet_id, index = MinecraftPacket.read_varint_from_data(packet)
+            reader: PacketReader = PacketReader(self.client._receive_packet())
+            packet_id: int = reader.read_varint()
 
             if self.client.debug:
                 print(f'Received packet with ID: {packet_id}')
 
-            if packet_id == 0x00:  # Disconnect
-                reason_json, _ = MinecraftPacket.read_string_from_data(packet[index:])
-
-                if self.client.debug:
-                    print(f'Disconnect message: {reason_json}')
-
-                try:
-                    reason: dict = json.loads(reason_json)
-                    message: str = MinecraftPacket.parse_chat(chat_data=reason)
-
-                except json.JSONDecodeError:
-                    message: str = reason_json
-
-                return message
-
-            elif packet_id == 0x01:  # Encryption Request
-                return 'The server is in online mode'
-
-            elif packet_id == 0x02:  # Login Success
-                if self.client.bungeehack:
-                    return 'Connected with BungeeHack'
-
-                else:
-                    return 'Connected'
+            if packet_id in (0x00, 0x01, 0x02):  # Disconnect, Encryption Request or Login Success
+                return self._login_result(packet_id, reader)
 
             elif packet_id == 0x03:  # Set Compression
-                self._handle_set_compression(packet[index:])
+                self._handle_set_compression(reader)
 
             elif packet_id == 0x04:  # Login Plugin Request
-                self._handle_login_plugin_request(packet[index:])
+                self._handle_login_plugin_request(reader)
 
             else:
                 if self.client.debug:
@@ -358,67 +626,41 @@ class JavaHandler:
 
                 return f'Connection failed - Unknown packet ID'
 
-    def _receive_packet(self) -> bytes:
+    def _login_result(self, packet_id: int, reader: PacketReader) -> str:
         """
-        Receives a packet from the socket
-
-        :return bytes: The packet data received from the socket.
-        """
-        packet_length: int = self._read_varint()
-        packet_data: bytes = b''
-
-        # Read the packet data
-        while len(packet_data) < packet_length:
-            # Receive the remaining data
-            chunk: bytes = self.client.sock.recv(packet_length - len(packet_data))
-
-            # Check if the connection was lost
-            if not chunk:
-                if self.client.debug:
-                    print(f'Connection lost while reading packet data in bot response (expected {packet_length} bytes, got {len(packet_data)} bytes)')
-
-                raise Exception('Connection lost while reading packet data')
-
-            packet_data += chunk  # Add the chunk to the packet data
-
-        # Check if compression is enabled and decompress the data if needed
-        if self.client.compression_handler.compression_enabled:
-            # Read the uncompressed length of the packet
-            uncompressed_length, index = MinecraftPacket.read_varint_from_data(packet_data)
+        Get the result of the login from a final login packet.
+        The login start packet was accepted if the server asked for encryption, logged the bot in, or kicked it
+        with a reason that is not a decoding error of the packet (see login_accepted).
 
-            if uncompressed_length > 0:  # Check if the packet is compressed
-                compressed_data = packet_data[index:]
-                packet_data = self.client.compression_handler.decompress(compressed_data)
-
-            else:
-                packet_data = packet_data[index:]
-
-        return packet_data
-
-    def _read_varint(self) -> int:
+        :param packet_id: The ID of the packet (0x00=Disconnect, 0x01=Encryption Request, 0x02=Login Success).
+        :param reader: The reader of the packet, after the packet ID.
+        :return str: The result of the login response.
         """
-        Reads a VarInt from the socket.
+        if packet_id == 0x00:  # Disconnect
+            reason_json: str = reader.read_string()
 
-        :return int: The VarInt value read from the socket.
-        """
-        num_read: int = 0
-        result: int = 0
+            if self.client.debug:
+                print(f'Disconnect message: {reason_json}')
 
-        while True:
-            byte: Union[bytes, int, None] = self.client.sock.recv(1)
+            try:
+                reason: dict = json.loads(reason_json)
+                message: str = MinecraftPacket.parse_chat(chat_data=reason)
 
-            if not byte:
-                raise Exception('Connection lost while reading VarInt')
+            except json.JSONDecodeError:
+                message: str = reason_json
 
-            byte = ord(byte)
+            self.login_accepted = bool(message.strip()) and 'io.netty.handler.codec' not in message.lower()
+            return message
 
-            result |= (byte & 0x7F) << (7 * num_read)
-            num_read += 1
+        elif packet_id == 0x01:  # Encryption Request
+            self.login_accepted = True
+            return 'The server is in online mode'
 
-            if num_read > 5:
-                raise Exception('VarInt is too big')
+        else:  # Login Success
+            self.login_accepted = True
 
-            if not (byte & 0x80):
-                break
+            if self.client.bungeehack:
+                return 'Connected with BungeeHack'
 
-        return result
+            else:
+                return 'Connected'
@@ -1,11 +1,33 @@
-from typing import Optional, Union
+import copy
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 from .utils.client import MinecraftClient
+from .utils.compression import CompressionHandler
+from .utils.framing import FrameReader, MAX_PACKET_SIZE
+from .utils.proxy_pool import ProxyPool
 from .utils.resolver import Resolver
-from .handlers import JavaHandler, BedrockHandler
+from .utils.result_cache import ResultCache
+from .utils.timeouts import AdaptiveTimeouts, Timeouts
+from .utils.retry import RetryLater, RetryQueue
+from .handlers import JavaHandler, BedrockHandler, ConnectSweeper
+from .handlers.connect_sweeper import OPEN
+from .handlers.java_handler import FAVICON_MODES
 from .models import JavaServerResponse, BedrockServerResponse
 
 
+@dataclass
+class QueryJob:
+    """ State of a query of query_many, kept while its bot connection is deferred """
+    target: str
+    client: Optional['RStatusClient'] = None
+    server_data: Union[JavaServerResponse, BedrockServerResponse, None] = None
+    bot_version: Union[str, int, None] = None
+
+
 class RStatusClient(MinecraftClient, JavaHandler, BedrockHandler): 
     def __init__(
         self,
@@ -16,6 +38,14 @@ class RStatusClient(MinecraftClient, JavaHandler, BedrockHandler):
         proxy_address: Optional[str] = None,
         proxy_port: Optional[int] = None,
         debug: bool = False,
+        max_packet_size: int = MAX_PACKET_SIZE,
+        result_cache: Optional[ResultCache] = None,
+        favicon: str = 'inline',
+        retain_raw_response: bool = True,
+        retain_sample: bool = True,
+        retain_mod_list: bool = True,
+        proxy_pool: Optional[ProxyPool] = None,
+        timeouts: Union[Timeouts, AdaptiveTimeouts, None] = None,
     ) -> None:
         self.target: str = target
         self.server_address: Optional[str] = None
@@ -26,29 +56,19 @@ class RStatusClient(MinecraftClient, JavaHandler, BedrockHandler):
         self.proxy_address: Optional[str] = proxy_address
         self.proxy_port: Optional[int] = proxy_port
         self.debug: bool = debug
+        self.result_cache: Optional[ResultCache] = result_cache
+
+        if favicon not in FAVICON_MODES:
+            raise ValueError(f'Invalid favicon mode: {favicon} (expected one of {", ".join(FAVICON_MODES)})')
         
-        if ':' in self.target:
-            self.target, self.server_port = self.target.split(':')
-            self.server_port = int(self.server_port)
-            
-        if Resolver.is_domain(self.target):
-            if self.server_port is None:
-                self.server_port = Resolver.minecraft_port(self.target)
-
-                if self.server_port is None:
-                    self.server_port = 25565
-                
-            self.server_address = Resolver.domain_resolver(self.target)
-            
-            if self.server_address is None:
-                raise ValueError(f'Could not resolve domain: {self.server_address}')
-
-        else:
-            if self.server_port is None:
-                self.server_port = 25565
-            
-            self.server_address = self.target
-            
+        endpoint: Optional[Tuple[str, int]] = Resolver.resolve_endpoint(self.target)
+
+        if endpoint is None:
+            raise ValueError(f'Could not resolve domain: {self.target}')
+
+        self.target = Resolver.split_target(self.target)[0]
+        self.server_address, self.server_port = endpoint
+
         # Initialize MinecraftClient
         MinecraftClient.__init__(
             self,
@@ -59,7 +79,10 @@ class RStatusClient(MinecraftClient, JavaHandler, BedrockHandler):
             proxy_type=proxy_type,
             proxy_address=proxy_address,
             proxy_port=proxy_port,
-            debug=debug
+            debug=debug,
+            max_packet_size=max_packet_size,
+            proxy_pool=proxy_pool,
+            timeouts=timeouts
         )
 
         # Initialize JavaHandler
@@ -67,29 +90,61 @@ class RStatusClient(MinecraftClient, JavaHandler, BedrockHandler):
         
         # Initialize BedrockHandler
         BedrockHandler.__init__(self, self)
+
+        # Fields of the server data that are kept
+        self.favicon_mode = favicon
+        self.retain_raw_response = retain_raw_response
+        self.retain_sample = retain_sample
+        self.retain_mod_list = retain_mod_list
     
-    def get_server_data(self, bot: bool = True) -> Union[JavaServerResponse, BedrockServerResponse, None]:
+    def get_server_data(
+        self,
+        bot: bool = True,
+        race: bool = False,
+        fields: Optional[Iterable[str]] = None
+    ) -> Union[JavaServerResponse, BedrockServerResponse, None]:
         """
         This method is used to get the status of a server.
-        
+        By default the Java edition is queried first and the Bedrock edition only if it fails.
+        With race, both editions are queried at the same time and the first valid response is returned.
+
         :param bool bot: Determines if the bot connection should be used.
+        :param bool race: Determines if both editions should be queried concurrently.
+        :param Optional[Iterable[str]] fields: The Java fields to build ("players.online", "version"...), every field if not provided.
         :return Union[JavaServerResponse, BedrockServerResponse]: The server status data.
         """
-        server_data: Optional[JavaServerResponse] = self._java_server_status(bot=bot)
-        
-        if server_data is None:
-            server_data: Optional[BedrockServerResponse] = self.get_bedrock_server_data()
-        
-        return server_data
+        fields = self.projection(fields)
+        bot = bot and self._wants(fields, 'bot_response')
+
+        if self.result_cache is not None:
+            return self._cached_server_data(bot=bot, race=race, fields=fields)
+
+        return self._server_data(bot=bot, race=race, fields=fields)
+
+    def get_all_server_data(
+        self,
+        bot: bool = True,
+        fields: Optional[Iterable[str]] = None
+    ) -> Tuple[Optional[JavaServerResponse], Optional[BedrockServerResponse]]:
+        """
+        This method is used to get the status of both editions of a server, querying them concurrently.
+
+        :param bool bot: Determines if the bot connection should be used.
+        :param Optional[Iterable[str]] fields: The Java fields to build ("players.online", "version"...), every field if not provided.
+        :return Tuple[Optional[JavaServerResponse], Optional[BedrockServerResponse]]: The Java and Bedrock server status data.
+        """
+        fields = self.projection(fields)
+        return self._probe_editions(bot=bot and self._wants(fields, 'bot_response'), first_only=False, fields=fields)
 
-    def get_java_server_data(self, bot: bool = True) -> Optional[JavaServerResponse]:
+    def get_java_server_data(self, bot: bool = True, fields: Optional[Iterable[str]] = None) -> Optional[JavaServerResponse]:
         """
         This method is used to get the status of a Java server.
         
         :param bool bot: Determines if the bot connection should be used.
+        :param Optional[Iterable[str]] fields: The fields to build ("players.online", "version"...), every field if not provided.
         :return Optional[JavaServerResponse]: The server status data or None if an error occurred.
         """
-        return self._java_server_status(bot=bot)
+        return self._java_server_status(bot=bot, fields=self.projection(fields))
 
     def get_bedrock_server_data(self) -> Optional[BedrockServerResponse]:
         """
@@ -97,10 +152,202 @@ class RStatusClient(MinecraftClient, JavaHandler, BedrockHandler):
 
         :return Optional[BedrockServerResponse]: The server status data or None if an error occurred.
         """
-        if self.server_port == 25565:
-            self.server_port = 19132
+        return self._bedrock_server_status(port=self._bedrock_port())
+
+    def _server_data(self, bot: bool, race: bool, fields: Optional[FrozenSet[str]] = None) -> Union[JavaServerResponse, BedrockServerResponse, None]:
+        """
+        Query the status of the server, without the result cache.
+
+        :param bool bot: Determines if the bot connection should be used.
+        :param bool race: Determines if both editions should be queried concurrently.
+        :param Optional[FrozenSet[str]] fields: The Java fields to build (every field if not provided).
+        :return Union[JavaServerResponse, BedrockServerResponse]: The server status data.
+        """
+        if race:
+            java_data, bedrock_data = self._probe_editions(bot=bot, first_only=True, fields=fields)
+            return java_data or bedrock_data
+
+        server_data: Optional[JavaServerResponse] = self._java_server_status(bot=bot, fields=fields)
         
-        return self._bedrock_server_status()
+        if server_data is None:
+            server_data: Optional[BedrockServerResponse] = self.get_bedrock_server_data()
+        
+        return server_data
+
+    def _cached_server_data(self, bot: bool, race: bool, fields: Optional[FrozenSet[str]] = None) -> Union[JavaServerResponse, BedrockServerResponse, None]:
+        """
+        Get the status of the server from the result cache, querying the server if the result is missing or expired.
+        The status and the bot response are cached separately.
+
+        :param bool bot: Determines if the bot connection should be used.
+        :param bool race: Determines if both editions should be queried concurrently.
+        :param Optional[FrozenSet[str]] fields: The Java fields to build (every field if not provided).
+        :return Union[JavaServerResponse, BedrockServerResponse]: The server status data.
+        """
+        status_key: str = self.result_cache.status_key(self.server_address, self.server_port, race, fields)
+        server_data, stale = self.result_cache.get_status(status_key)
+
+        if server_data is None:
+            server_data = self._server_data(bot=False, race=race, fields=fields)
+
+            if server_data is not None:
+                self.result_cache.put_status(status_key, server_data)
+
+        elif stale:
+            self._revalidate(status_key, lambda client: self._refresh_status(client, status_key, race, fields))
+
+        if bot and isinstance(server_data, JavaServerResponse) and not self._apply_cached_bot_response(server_data):
+            self._set_bot_response(server_data, self._bot_response(version=server_data.version.protocol))
+            self._store_bot_response(server_data)
+
+        return server_data
+
+    def _apply_cached_bot_response(self, server_data: JavaServerResponse) -> bool:
+        """
+        Add the cached bot response to the server data, refreshing it in the background if it is stale.
+
+        :param JavaServerResponse server_data: The server data.
+        :return bool: True if the bot response was cached, False if the bot has to connect.
+        """
+        bot_key: str = self.result_cache.bot_key(self.server_address, self.server_port)
+        bot_response, stale = self.result_cache.get_bot(bot_key)
+
+        if bot_response is None:
+            return False
+
+        if stale:
+            self._revalidate(bot_key, lambda client: self._refresh_bot_response(client, bot_key, server_data.version.protocol))
+
+        server_data.bot_response = bot_response
+        return True
+
+    def _store_bot_response(self, server_data: JavaServerResponse) -> None:
+        """
+        Cache the bot response of the server data.
+
+        :param JavaServerResponse server_data: The server data with the bot response.
+        """
+        self.result_cache.put_bot(self.result_cache.bot_key(self.server_address, self.server_port), server_data.bot_response)
+
+    def _revalidate(self, key: str, refresh: Callable[['RStatusClient'], None]) -> None:
+        """
+        Refresh a stale cached result in a background thread, on a copy of the client.
+
+        :param str key: The key of the result.
+        :param Callable[[RStatusClient], None] refresh: Function that queries the server with the copy of the client and caches the result.
+        """
+        if not self.result_cache.claim_revalidation(key):
+            return
+
+        def run() -> None:
+            try:
+                refresh(self._probe_client())
+
+            except Exception as e:
+                if self.debug:
+                    print(f'Error refreshing cached result {key}: {e}')
+
+            finally:
+                self.result_cache.release_revalidation(key)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _refresh_status(self, client: 'RStatusClient', status_key: str, race: bool, fields: Optional[FrozenSet[str]] = None) -> None:
+        """
+        Query the status of the server and cache it.
+
+        :param RStatusClient client: The client used to query the server.
+        :param str status_key: The key of the status result.
+        :param bool race: Determines if both editions should be queried concurrently.
+        :param Optional[FrozenSet[str]] fields: The Java fields to build (every field if not provided).
+        """
+        server_data: Union[JavaServerResponse, BedrockServerResponse, None] = client._server_data(bot=False, race=race, fields=fields)
+
+        if server_data is not None:
+            self.result_cache.put_status(status_key, server_data)
+
+    def _refresh_bot_response(self, client: 'RStatusClient', bot_key: str, version: int) -> None:
+        """
+        Connect the bot to the server and cache its response.
+
+        :param RStatusClient client: The client used to connect the bot.
+        :param str bot_key: The key of the bot response.
+        :param int version: The protocol version of the server.
+        """
+        client.bot_connection_attempts = 0
+        self.result_cache.put_bot(bot_key, self._format_bot_response(client._bot_response(version=version)))
+
+    def _bedrock_port(self) -> int:
+        """
+        Get the port used for Bedrock queries, the default Java port is replaced by the default Bedrock port.
+
+        :return int: The Bedrock port.
+        """
+        return 19132 if self.server_port == 25565 else self.server_port
+
+    def _probe_client(self) -> 'RStatusClient':
+        """
+        Copy the client with its own socket and buffers, so a probe can run in another thread.
+
+        :return RStatusClient: The copy of the client.
+        """
+        client: RStatusClient = copy.copy(self)
+        client.client = client
+        client.sock = None
+        client.proxy = None
+        client.compression_handler = CompressionHandler()
+        client.frame_reader = FrameReader(max_packet_size=self.max_packet_size)
+        return client
+
+    def _probe_editions(
+        self,
+        bot: bool,
+        first_only: bool,
+        fields: Optional[FrozenSet[str]] = None
+    ) -> Tuple[Optional[JavaServerResponse], Optional[BedrockServerResponse]]:
+        """
+        Query the Java and Bedrock editions of the server concurrently.
+        The status queries run in two threads on copies of the client, the bot only connects once the Java status is known.
+
+        :param bool bot: Determines if the bot connection should be used.
+        :param bool first_only: Stop at the first valid response and abort the other query.
+        :param Optional[FrozenSet[str]] fields: The Java fields to build (every field if not provided).
+        :return Tuple[Optional[JavaServerResponse], Optional[BedrockServerResponse]]: The Java and Bedrock server status data.
+        """
+        java_client: RStatusClient = self._probe_client()
+        bedrock_client: RStatusClient = self._probe_client()
+        executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=2)
+        java_future: Future = executor.submit(java_client._java_server_status, False, fields)
+        bedrock_future: Future = executor.submit(bedrock_client._bedrock_server_status, self._bedrock_port())
+        pending: Set[Future] = {java_future, bedrock_future}
+
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+                if first_only and any(future.result() is not None for future in done):
+                    break
+
+        finally:
+            # Abort the query that lost the race, its thread ends as soon as its socket is closed
+            if java_future in pending:
+                java_client.abort()
+
+            if bedrock_future in pending:
+                bedrock_client.abort()
+
+            executor.shutdown(wait=False)
+
+        java_data: Optional[JavaServerResponse] = None if java_future in pending else java_future.result()
+        bedrock_data: Optional[BedrockServerResponse] = None if bedrock_future in pending else bedrock_future.result()
+
+        if self.debug:
+            print(f'Edition probes: Java {"found" if java_data else "not found"}, Bedrock {"found" if bedrock_data else "not found"}')
+
+        if java_data is not None and bot:
+            self._set_bot_response(java_data, self._bot_response(version=java_data.version.protocol))
+
+        return java_data, bedrock_data
 
     def get_bot_response(self, version: Union[str, int, None] = None) -> str:
         """
@@ -110,4 +357,167 @@ class RStatusClient(MinecraftClient, JavaHandler, BedrockHandler):
         :param Union[str, int, None] version: The version of the server to get the response from.
         :return str: The server response.
         """
-        return self._bot_response(version=version)
\ No newline at end of file
+        return self._bot_response(version=version)
+
+    @classmethod
+    def query_many(
+        cls,
+        targets: Iterable[str],
+        workers: int = 32,
+        bot: bool = True,
+        race: bool = False,
+        fields: Optional[Iterable[str]] = None,
+        connect_sweeper: Optional[ConnectSweeper] = None,
+        **client_kwargs
+    ) -> Iterator[Tuple[str, Union[JavaServerResponse, BedrockServerResponse, None]]]:
+        """
+        This method is used to get the status of many servers using a pool of worker threads.
+        Results are yielded as soon as they are completed, not in the order of the targets.
+        Bot connections to a throttled server are deferred until its backoff ends, so the workers
+        query other servers in the meantime instead of sleeping.
+
+        :param Iterable[str] targets: The target servers (domain or IP:port).
+        :param int workers: The number of worker threads (maximum number of queries in flight).
+        :param bool bot: Determines if the bot connection should be used.
+        :param bool race: Determines if both editions of each server should be queried concurrently.
+        :param Optional[Iterable[str]] fields: The Java fields to build ("players.online", "version"...), every field if not provided.
+        :param Optional[ConnectSweeper] connect_sweeper: Check the TCP port of the targets first, only the open ports are queried
+            (Java servers only, Bedrock servers do not listen on TCP). The other targets are yielded with None.
+        :param client_kwargs: Extra arguments for each RStatusClient (timeout, proxy settings, debug...).
+        :return Iterator[Tuple[str, Union[JavaServerResponse, BedrockServerResponse, None]]]: (target, server data) pairs.
+        """
+        if workers < 1:
+            raise ValueError('The number of workers must be at least 1')
+
+        fields = cls.projection(fields)
+        bot = bot and cls._wants(fields, 'bot_response')
+        targets_iterator: Iterator[str] = iter(targets)
+        retry_queue: RetryQueue = RetryQueue()
+        closed: List[str] = []  # Targets the sweep found closed, yielded between the reads of the targets
+        exhausted: bool = False
+
+        if connect_sweeper is not None:
+            targets_iterator = cls._open_targets(targets_iterator, connect_sweeper, closed, workers * 2)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending: Dict[Future, QueryJob] = {}
+
+            def submit(job: QueryJob) -> None:
+                pending[executor.submit(cls._run_query, job, bot, race, fields, client_kwargs)] = job
+
+            def fill() -> None:
+                """ Submit targets until workers * 2 queries are in flight, so large target lists are consumed lazily """
+                nonlocal exhausted
+
+                while len(pending) < workers * 2:
+                    target: Optional[str] = next(targets_iterator, None)
+
+                    if target is None:
+                        # The sweep pauses with None to hand over its closed targets, it only ends without them
+                        exhausted = not closed
+                        return
+
+                    submit(QueryJob(target))
+
+            fill()
+
+            while closed:
+                yield closed.pop(), None
+
+            while pending or retry_queue or not exhausted:
+                # Resume the deferred bot connections whose backoff has ended
+                for job in retry_queue.pop_ready():
+                    submit(job)
+
+                if pending:
+                    done, _ = wait(pending, timeout=retry_queue.next_delay(), return_when=FIRST_COMPLETED)
+
+                    for future in done:
+                        job: QueryJob = pending.pop(future)
+                        delay: Optional[float] = future.result()
+
+                        if delay is not None:
+                            retry_queue.push(job, delay)
+
+                        else:
+                            yield job.target, job.server_data
+
+                elif exhausted:
+                    # Only deferred bot connections are left
+                    time.sleep(retry_queue.next_delay())
+                    continue
+
+                fill()
+
+                while closed:
+                    yield closed.pop(), None
+
+    @staticmethod
+    def _open_targets(targets: Iterator[str], connect_sweeper: ConnectSweeper, closed: List[str], max_closed: int) -> Iterator[Optional[str]]:
+        """
+        Check the TCP port of the targets of query_many and only yield the targets whose port is open.
+        The sweep runs as the targets are read, so thousands of connects are in flight while the workers query the open ports.
+
+        :param Iterator[str] targets: The targets.
+        :param ConnectSweeper connect_sweeper: The sweeper.
+        :param List[str] closed: Receives the targets that are not open or cannot be resolved.
+        :param int max_closed: Number of closed targets after which the sweep pauses, so mostly dead targets are not all buffered.
+        :return Iterator[Optional[str]]: The targets whose port is open, and None when closed holds max_closed targets.
+        """
+        for target, state in connect_sweeper.sweep_targets(targets):
+            if state == OPEN:
+                yield target
+
+            else:
+                closed.append(target)
+
+                if len(closed) >= max_closed:
+                    yield None
+
+    @classmethod
+    def _run_query(cls, job: QueryJob, bot: bool, race: bool, fields: Optional[FrozenSet[str]], client_kwargs: dict) -> Optional[float]:
+        """
+        Run a query of query_many, or resume its deferred bot connection.
+
+        :param QueryJob job: The query.
+        :param bool bot: Determines if the bot connection should be used.
+        :param bool race: Determines if both editions should be queried concurrently.
+        :param Optional[FrozenSet[str]] fields: The Java fields to build (every field if not provided).
+        :param dict client_kwargs: Extra arguments for the RStatusClient.
+        :return Optional[float]: The delay in seconds before the bot connection can be resumed, or None if the query is completed.
+        """
+        if job.client is None:
+            try:
+                job.client = cls(job.target, **client_kwargs)
+
+            except ValueError as e:
+                if client_kwargs.get('debug'):
+                    print(f'Skipping target {job.target}: {e}')
+
+                return None
+
+            job.client.defer_retries = True
+            job.server_data = job.client.get_server_data(bot=False, race=race, fields=fields)
+
+            if not bot or not isinstance(job.server_data, JavaServerResponse):
+                return None
+
+            if job.client.result_cache is not None and job.client._apply_cached_bot_response(job.server_data):
+                return None
+
+            job.bot_version = job.server_data.version.protocol
+
+        try:
+            job.client._set_bot_response(job.server_data, job.client._bot_response(version=job.bot_version))
+
+            if job.client.result_cache is not None:
+                job.client._store_bot_response(job.server_data)
+
+        except RetryLater as e:
+            if job.client.debug:
+                print(f'Deferring the bot connection to {job.target} for {e.delay:.2f} seconds')
+
+            job.bot_version = e.version
+            return e.delay
+
+        return None
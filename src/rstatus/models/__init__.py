@@ -1,4 +1,5 @@
 from .java_server_data import JavaServerResponse
 from .bedrock_server_data import BedrockServerResponse
+from .favicon import Favicon
 
-__all__ = ['JavaServerResponse', 'BedrockServerResponse']
+__all__ = ['JavaServerResponse', 'BedrockServerResponse', 'Favicon']
@@ -1,14 +1,19 @@
 from dataclasses import dataclass
+from typing import List
 
 
 @dataclass
 class MOTD:
+    __slots__ = ('text', 'original')
+
     text: str
     original: str
 
 
 @dataclass
 class Version:
+    __slots__ = ('text', 'original', 'protocol')
+
     text: str
     original: str
     protocol: int
@@ -16,12 +21,16 @@ class Version:
 
 @dataclass
 class Players:
+    __slots__ = ('online', 'max')
+
     online: int
     max: int
 
 
 @dataclass
 class BedrockServerResponse:
+    __slots__ = ('ip_address', 'port', 'motd', 'version', 'players', 'guid', 'gamemode', 'brand', 'map', 'ping', 'raw_response')
+
     ip_address: str
     port: int
     motd: MOTD
@@ -32,4 +41,4 @@ class BedrockServerResponse:
     brand: str
     map: str
     ping: int
-    raw_response: dict
\ No newline at end of file
+    raw_response: List[str]
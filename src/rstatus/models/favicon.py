@@ -0,0 +1,49 @@
+import base64
+from typing import Any, Optional
+
+# Prefix of the favicon data URI sent by Java servers
+DATA_URI_PREFIX: str = 'data:image/png;base64,'
+
+
+class Favicon:
+    """
+    Reference to a favicon kept in a favicon store.
+    Only the content hash is held by the server data; the image is read from the store and decoded on first access.
+    """
+    __slots__ = ('hash', 'store', '_png')
+
+    def __init__(self, hash: str, store: Any):
+        """
+        Initialize a new Favicon.
+
+        :param hash: The SHA-256 hash of the favicon (hex digest of its base64 data).
+        :param store: The favicon store that holds the favicon.
+        """
+        self.hash: str = hash
+        self.store: Any = store
+        self._png: Optional[bytes] = None
+
+    @property
+    def data_uri(self) -> str:
+        """ The favicon as sent by the server ("data:image/png;base64,...") """
+        return DATA_URI_PREFIX + self.store.get(self.hash)
+
+    @property
+    def png(self) -> bytes:
+        """ The decoded PNG image, decoded on first access """
+        if self._png is None:
+            self._png = base64.b64decode(self.store.get(self.hash))
+
+        return self._png
+
+    def __str__(self) -> str:
+        return self.data_uri
+
+    def __repr__(self) -> str:
+        return f'Favicon(hash={self.hash!r})'
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Favicon) and other.hash == self.hash
+
+    def __hash__(self) -> int:
+        return hash(self.hash)
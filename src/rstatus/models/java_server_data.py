@@ -1,14 +1,76 @@
 from dataclasses import dataclass
+from typing import Callable, Optional, Tuple, Union
+
+from .favicon import Favicon
 
 
 @dataclass
 class MOTD:
+    """
+    MOTD of a Java server.
+    The MOTD can be built from a deferred factory, so it is only rendered when text or original is first accessed.
+    """
+    __slots__ = ('_text', '_original', '_factory')
+
     text: str
     original: str
 
+    def __post_init__(self) -> None:
+        self._factory: Optional[Callable[[], Tuple[str, str]]] = None
+
+    @classmethod
+    def deferred(cls, factory: Callable[[], Tuple[str, str]]) -> 'MOTD':
+        """
+        Create a MOTD that is rendered on first access.
+
+        :param factory: Function that returns the (text, original) of the MOTD.
+        :return MOTD: The MOTD.
+        """
+        motd: MOTD = cls('', '')
+        motd._factory = factory
+        return motd
+
+    def _render(self) -> None:
+        """ Render the MOTD with its factory, if it was not rendered yet """
+        factory: Optional[Callable[[], Tuple[str, str]]] = getattr(self, '_factory', None)
+
+        if factory is not None:
+            self._factory = None
+            self._text, self._original = factory()
+
+    def __reduce__(self) -> tuple:
+        # The factory is not copied or pickled, the MOTD is rendered instead
+        return MOTD, (self.text, self.original)
+
+
+def _rendered_field(slot: str, doc: str) -> property:
+    """
+    Get the property of a field of MOTD, which renders the MOTD on first access.
+
+    :param slot: The slot holding the value of the field.
+    :param doc: The docstring of the field.
+    :return property: The property.
+    """
+    def getter(motd: MOTD) -> str:
+        motd._render()
+        return getattr(motd, slot)
+
+    def setter(motd: MOTD, value: str) -> None:
+        motd._render()
+        setattr(motd, slot, value)
+
+    return property(getter, setter, doc=doc)
+
+
+# Added once the dataclass is built, in the class body a property would be taken as the default value of the field
+MOTD.text = _rendered_field('_text', 'The MOTD without formatting codes')
+MOTD.original = _rendered_field('_original', 'The MOTD with formatting codes')
+
 
 @dataclass
 class Version:
+    __slots__ = ('text', 'original', 'protocol', 'version_name')
+
     text: str
     original: str
     protocol: int
@@ -17,6 +79,8 @@ class Version:
 
 @dataclass
 class Players:
+    __slots__ = ('online', 'max', 'players', 'sample')
+
     online: int
     max: int
     players: str
@@ -25,21 +89,28 @@ class Players:
 
 @dataclass
 class ModInfo:
+    __slots__ = ('type', 'mod_list')
+
     type: str
     mod_list: list
 
 
 @dataclass
 class JavaServerResponse:
+    __slots__ = (
+        'ip_address', 'port', 'motd', 'version', 'players', 'mod_info', 'favicon', 'ping', 'bot_response', 'brand',
+        'plugin_channels', 'raw_response'
+    )
+
     ip_address: str
     port: int
     motd: MOTD
     version: Version
     players: Players
     mod_info: ModInfo
-    favicon: str
+    favicon: Union[str, Favicon]
     ping: int
     bot_response: str
     brand: str
     plugin_channels: str
-    raw_response: dict
\ No newline at end of file
+    raw_response: dict
@@ -0,0 +1,62 @@
+from dataclasses import asdict, replace
+from typing import Union
+
+from . import bedrock_server_data, java_server_data
+from .bedrock_server_data import BedrockServerResponse
+from .java_server_data import JavaServerResponse
+
+
+def to_dict(server_data: Union[JavaServerResponse, BedrockServerResponse]) -> dict:
+    """
+    Convert server data into a JSON serializable dictionary.
+    Favicons kept in a favicon store are converted to their data URI, so the dictionary does not depend on the store.
+
+    :param server_data: The server data.
+    :return dict: The fields of the server data, with its edition ("java" or "bedrock").
+    """
+    if isinstance(server_data, JavaServerResponse):
+        data: dict = asdict(replace(server_data, favicon=''))
+        data['motd'] = {'text': server_data.motd.text, 'original': server_data.motd.original}
+        data['favicon'] = str(server_data.favicon)
+        data['edition'] = 'java'
+
+    else:
+        data = asdict(server_data)
+        data['edition'] = 'bedrock'
+
+    return data
+
+
+def from_dict(data: dict) -> Union[JavaServerResponse, BedrockServerResponse]:
+    """
+    Rebuild server data from a dictionary created by to_dict.
+    The fields are restored as they were, the raw response of the server is not parsed again.
+
+    :param data: The dictionary created by to_dict.
+    :return Union[JavaServerResponse, BedrockServerResponse]: The server data.
+    """
+    data = dict(data)
+    edition: str = data.pop('edition')
+
+    if edition == 'java':
+        return JavaServerResponse(
+            **{
+                **data,
+                'motd': java_server_data.MOTD(**data['motd']),
+                'version': java_server_data.Version(**data['version']),
+                'players': java_server_data.Players(**data['players']),
+                'mod_info': java_server_data.ModInfo(**data['mod_info']),
+            }
+        )
+
+    if edition == 'bedrock':
+        return BedrockServerResponse(
+            **{
+                **data,
+                'motd': bedrock_server_data.MOTD(**data['motd']),
+                'version': bedrock_server_data.Version(**data['version']),
+                'players': bedrock_server_data.Players(**data['players']),
+            }
+        )
+
+    raise ValueError(f'Unknown server edition: {edition}')
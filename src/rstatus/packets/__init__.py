@@ -1,5 +1,8 @@
 from .base import MinecraftPacket
 from .handshake import HandshakePacket
 from .login_start import LoginStartPacket
+from .reader import PacketReader
+from .writer import PacketWriter
+from .cache import PacketCache, packet_cache
 
-__all__ = ['MinecraftPacket', 'HandshakePacket', 'LoginStartPacket']
+__all__ = ['MinecraftPacket', 'HandshakePacket', 'LoginStartPacket', 'PacketReader', 'PacketWriter', 'PacketCache', 'packet_cache']
@@ -2,13 +2,17 @@ import struct
 import uuid
 from typing import Optional, Tuple, Union, Dict
 
+from .reader import PacketReader
+from .writer import PacketWriter
+from ..utils.chat import ChatRenderer
 from ..utils.compression import CompressionHandler
 
 
 class MinecraftPacket:
     """ Base class for Minecraft packets """
     def __init__(self):
-        self.data: bytes = b''
+        self.data: bytearray = bytearray()
+        self.writer: PacketWriter = PacketWriter(self.data)
 
     @staticmethod
     def encode_varint(value: int) -> bytes:
@@ -18,21 +22,12 @@ class MinecraftPacket:
         :param value: The integer to encode.
         :return bytes: The encoded VarInt.
         """
-        result: bytes = b''
+        if 0 <= value < 0x80:
+            return bytes((value,))
 
-        while True:
-            byte: int = value & 0x7F
-            value >>= 7
-
-            if value != 0:
-                byte |= 0x80
-
-            result += struct.pack('B', byte)
-
-            if value == 0:
-                break
-
-        return result
+        writer: PacketWriter = PacketWriter()
+        writer.write_varint(value)
+        return writer.getvalue()
 
     @staticmethod
     def pack_data(data: bytes) -> bytes:
@@ -87,105 +82,68 @@ class MinecraftPacket:
         :param compression_handler: The compression handler to use.
         :return bytes: The full packet.
         """
-        packet_data: bytes = self.encode_varint(packet_id) + self.data
+        packet_data: PacketWriter = PacketWriter()
+        packet_data.write_varint(packet_id)
+        packet_data.write_bytes(self.data)
+        packet: PacketWriter = PacketWriter()
 
         if compression_handler and compression_handler.compression_enabled:
-            uncompressed_length = len(packet_data)
+            body: PacketWriter = PacketWriter()
+            uncompressed_length: int = len(packet_data)
+
             if uncompressed_length >= compression_handler.compression_threshold:
                 # Compress the data
-                compressed_data = compression_handler.compress(packet_data)
-                uncompressed_length_bytes = self.encode_varint(uncompressed_length)
-                data = uncompressed_length_bytes + compressed_data
+                body.write_varint(uncompressed_length)
+                body.write_bytes(compression_handler.compress(packet_data.buffer))
+
             else:
                 # Do not compress, set uncompressed length to 0
-                uncompressed_length_bytes = self.encode_varint(0)
-                data = uncompressed_length_bytes + packet_data
+                body.write_varint(0)
+                body.write_bytes(packet_data.buffer)
 
             # Compute packet length (uncompressed length + data)
-            packet_length_bytes = self.encode_varint(len(data))
-            full_packet = packet_length_bytes + data
+            packet.write_varint(len(body))
+            packet.write_bytes(body.buffer)
+
         else:
             # No compression, packet is as before
-            full_packet = self.pack_data(packet_data)
+            packet.write_varint(len(packet_data))
+            packet.write_bytes(packet_data.buffer)
 
+        full_packet: bytes = packet.getvalue()
         return full_packet
 
     @staticmethod
-    def read_varint_from_data(data: bytes) -> Tuple[int, int]:
+    def read_varint_from_data(data: bytes, offset: int = 0) -> Tuple[int, int]:
         """
         Reads a VarInt from the data provided.
 
         :param data: The data to read the VarInt from.
-        :return Tuple[int, int]: The VarInt value and the total bytes read.
+        :param offset: The position of the VarInt in the data.
+        :return Tuple[int, int]: The VarInt value and the position after the VarInt.
         """
-        num_read: int = 0
-        result: int = 0
-        index: int = 0
-
-        while True:
-            if index >= len(data):
-                raise Exception('Could not read VarInt from data')
-
-            byte: int = data[index]
-            index += 1
-            result |= (byte & 0x7F) << (7 * num_read)
-            num_read += 1
-
-            if num_read > 5:
-                raise Exception('VarInt is too big')
-
-            if not (byte & 0x80):
-                break
-
-        return result, index
+        reader: PacketReader = PacketReader(data, offset)
+        return reader.read_varint(), reader.offset
 
     @staticmethod
-    def read_string_from_data(data: bytes) -> Tuple[str, int]:
+    def read_string_from_data(data: bytes, offset: int = 0) -> Tuple[str, int]:
         """
         Reads a string from the data provided.
 
         :param data: The data to read the string from.
-        :return Tuple[str, int]: The string value and the total bytes read.
+        :param offset: The position of the string in the data.
+        :return Tuple[str, int]: The string value and the position after the string.
         """
-        # Read the string length
-        string_length, index = MinecraftPacket.read_varint_from_data(data)
-
-        # Read the string data and decode it
-        string_data = data[index:index + string_length]
-        string = string_data.decode('utf-8')
-
-        # Calculate the total bytes read
-        total_bytes_read: int = index + string_length
-        return string, total_bytes_read
+        reader: PacketReader = PacketReader(data, offset)
+        return reader.read_string(), reader.offset
 
     @staticmethod
     def parse_chat(chat_data: Union[Dict, str]) -> str:
         """
         Parse the chat data and return the text.
+        See ChatRenderer for the legacy codes and span renderers.
 
         :param chat_data: The chat data to parse.
         :return str: The parsed chat text.
         """
-        if isinstance(chat_data, str):
-            return chat_data
-
-        elif isinstance(chat_data, dict):
-            text: str = ''
-
-            if 'text' in chat_data:
-                text += chat_data['text']
-
-            if 'extra' in chat_data and isinstance(chat_data['extra'], list):
-                for item in chat_data['extra']:
-                    text += MinecraftPacket.parse_chat(item)
-
-            if 'translate' in chat_data:
-                translate_key = chat_data['translate']
-                with_list = chat_data.get('with', [])
-                translated_text = f"{translate_key}: {' '.join(map(str, with_list))}"
-                text += translated_text
-
-            return text
-
-        else:
-            return str(chat_data)
+        return ChatRenderer.plain(chat_data)
@@ -0,0 +1,70 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+# Key of a cached packet sequence: (protocol, host, port, next_state, bungeehack, login packet mode, username)
+PacketKey = Hashable
+
+
+class PacketCache:
+    """
+    Thread-safe LRU cache of fully framed packets.
+
+    Handshake and login start packets only depend on the target and the query options,
+    and they are always sent before compression is enabled, so repeated queries to the
+    same target can send bytes that were already built.
+    """
+    def __init__(self, max_size: int = 4096):
+        """
+        Initialize a new PacketCache.
+
+        :param max_size: Maximum number of cached packet sequences.
+        """
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self._packets: 'OrderedDict[PacketKey, bytes]' = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._packets)
+
+    def get_or_build(self, key: PacketKey, builder: Callable[[], bytes]) -> bytes:
+        """
+        Get the packets cached for a key, building and caching them if they are not cached.
+
+        :param key: The key of the packets.
+        :param builder: Function that builds the packets.
+        :return bytes: The framed packets.
+        """
+        with self._lock:
+            packets = self._packets.get(key)
+
+            if packets is not None:
+                self._packets.move_to_end(key)
+                self.hits += 1
+                return packets
+
+            self.misses += 1
+
+        packets = builder()
+
+        with self._lock:
+            self._packets[key] = packets
+            self._packets.move_to_end(key)
+
+            while len(self._packets) > self.max_size:
+                self._packets.popitem(last=False)
+
+        return packets
+
+    def clear(self) -> None:
+        """ Remove every cached packet and reset the counters """
+        with self._lock:
+            self._packets.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Cache shared by every client of the process
+packet_cache: PacketCache = PacketCache()
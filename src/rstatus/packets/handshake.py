@@ -1,5 +1,3 @@
-import struct
-
 from .base import MinecraftPacket
 
 
@@ -7,7 +5,7 @@ class HandshakePacket(MinecraftPacket):
     """ Handshake packet used to initiate a connection with the server """
     def __init__(self, protocol_version: int, server_address: str, server_port: int, next_state: int):
         super().__init__()
-        self.data += self.encode_varint(protocol_version)
-        self.data += self.encode_string_varint(server_address)
-        self.data += struct.pack('>H', server_port)
-        self.data += self.encode_varint(next_state)
+        self.writer.write_varint(protocol_version)
+        self.writer.write_string(server_address)
+        self.writer.write_unsigned_short(server_port)
+        self.writer.write_varint(next_state)
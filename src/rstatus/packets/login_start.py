@@ -1,10 +1,20 @@
-import struct
 import uuid
-from typing import Optional
+from functools import lru_cache
 
 from .base import MinecraftPacket
 
 
+@lru_cache(maxsize=256)
+def offline_uuid(username: str) -> uuid.UUID:
+    """
+    Get the UUID sent for a username in the login start packet.
+
+    :param username: The username of the player.
+    :return uuid.UUID: The UUID of the player.
+    """
+    return uuid.uuid3(uuid.NAMESPACE_DNS, username)
+
+
 class LoginStartPacket(MinecraftPacket):
     """Login Start packet sent during the login process."""
 
@@ -14,23 +24,21 @@ class LoginStartPacket(MinecraftPacket):
             print(f'[?] Login packet mode: {login_packet_mode}')
 
         if login_packet_mode == 0:
-            self.data += self.encode_string_varint(username)
+            self.writer.write_string(username)
             
         if login_packet_mode == 1:
-            self.data += b'\x00'
+            self.writer.write_bool(False)
             
         if login_packet_mode == 2:
-            self.data += self.encode_string_varint(username)
-            self.data += b'\x00'
-            self.data += b'\x00'
+            self.writer.write_string(username)
+            self.writer.write_bool(False)
+            self.writer.write_bool(False)
 
         if login_packet_mode == 3:
-            self.data += self.encode_string_varint(username)
-            player_uuid = uuid.uuid3(uuid.NAMESPACE_DNS, username)
-            self.data += MinecraftPacket.write_uuid(player_uuid)
+            self.writer.write_string(username)
+            self.writer.write_uuid(offline_uuid(username))
 
         if login_packet_mode == 4:
-            self.data += self.encode_string_varint(username)
-            player_uuid = uuid.uuid3(uuid.NAMESPACE_DNS, username)
-            self.data += MinecraftPacket.write_uuid(player_uuid)
-            self.data += b'\x00'
+            self.writer.write_string(username)
+            self.writer.write_uuid(offline_uuid(username))
+            self.writer.write_bool(False)
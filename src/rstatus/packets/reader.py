@@ -0,0 +1,154 @@
+import struct
+import uuid
+from typing import Union
+
+
+class PacketReader:
+    """
+    Cursor over the data of a received packet.
+    Fields are read from a memoryview, so no copy of the remaining data is made on each read.
+    """
+    __slots__ = ('view', 'offset')
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview], offset: int = 0):
+        """
+        Initialize a new PacketReader.
+
+        :param data: The packet data to read.
+        :param offset: The position of the first byte to read.
+        """
+        self.view: memoryview = memoryview(data)
+        self.offset: int = offset
+
+    def __len__(self) -> int:
+        """ Number of bytes that have not been read yet """
+        return len(self.view) - self.offset
+
+    def read_varint(self) -> int:
+        """
+        Read a VarInt.
+
+        :return int: The VarInt value.
+        """
+        view: memoryview = self.view
+        offset: int = self.offset
+        num_read: int = 0
+        result: int = 0
+
+        while True:
+            if offset >= len(view):
+                raise Exception('Could not read VarInt from data')
+
+            byte: int = view[offset]
+            offset += 1
+            result |= (byte & 0x7F) << (7 * num_read)
+            num_read += 1
+
+            if num_read > 5:
+                raise Exception('VarInt is too big')
+
+            if not (byte & 0x80):
+                break
+
+        self.offset = offset
+
+        # VarInts are 32-bit two's complement
+        if result & 0x80000000:
+            result -= 1 << 32
+
+        return result
+
+    def read_bytes(self, length: int) -> memoryview:
+        """
+        Read a number of bytes without copying them.
+
+        :param length: The number of bytes to read.
+        :return memoryview: A view of the bytes read.
+        """
+        if length < 0 or self.offset + length > len(self.view):
+            raise Exception(f'Could not read {length} bytes from data ({len(self)} bytes left)')
+
+        data: memoryview = self.view[self.offset:self.offset + length]
+        self.offset += length
+        return data
+
+    def read_remaining(self) -> memoryview:
+        """
+        Read every byte that has not been read yet, without copying them.
+
+        :return memoryview: A view of the remaining bytes.
+        """
+        data: memoryview = self.view[self.offset:]
+        self.offset = len(self.view)
+        return data
+
+    def read_string(self) -> str:
+        """
+        Read a VarInt length-prefixed UTF-8 string.
+
+        :return str: The decoded string.
+        """
+        return str(self.read_bytes(self.read_varint()), 'utf-8')
+
+    def read_uuid(self) -> uuid.UUID:
+        """
+        Read a UUID (16 bytes, big-endian).
+
+        :return uuid.UUID: The UUID.
+        """
+        return uuid.UUID(bytes=bytes(self.read_bytes(16)))
+
+    def read_unsigned_byte(self) -> int:
+        """
+        Read an unsigned byte.
+
+        :return int: The byte value.
+        """
+        return self._unpack('>B', 1)
+
+    def read_bool(self) -> bool:
+        """
+        Read a boolean (1 byte).
+
+        :return bool: The boolean value.
+        """
+        return self._unpack('>?', 1)
+
+    def read_unsigned_short(self) -> int:
+        """
+        Read a 2-byte big-endian unsigned integer.
+
+        :return int: The integer value.
+        """
+        return self._unpack('>H', 2)
+
+    def read_long(self) -> int:
+        """
+        Read an 8-byte big-endian signed integer.
+
+        :return int: The integer value.
+        """
+        return self._unpack('>q', 8)
+
+    def read_unsigned_long(self) -> int:
+        """
+        Read an 8-byte big-endian unsigned integer.
+
+        :return int: The integer value.
+        """
+        return self._unpack('>Q', 8)
+
+    def _unpack(self, fmt: str, size: int) -> Union[int, bool]:
+        """
+        Unpack a single value at the current position.
+
+        :param fmt: The struct format of the value.
+        :param size: The size of the value in bytes.
+        :return Union[int, bool]: The unpacked value.
+        """
+        if self.offset + size > len(self.view):
+            raise Exception(f'Could not read {size} bytes from data ({len(self)} bytes left)')
+
+        value, = struct.unpack_from(fmt, self.view, self.offset)
+        self.offset += size
+        return value
@@ -0,0 +1,103 @@
+import struct
+import uuid
+from typing import Optional, Union
+
+
+class PacketWriter:
+    """
+    Writer of packet fields into a bytearray.
+    The buffer grows in place, instead of creating a new bytes object on each write.
+    """
+    __slots__ = ('buffer',)
+
+    def __init__(self, buffer: Optional[bytearray] = None):
+        """
+        Initialize a new PacketWriter.
+
+        :param buffer: The bytearray to write into (a new one is created if not provided).
+        """
+        self.buffer: bytearray = buffer if buffer is not None else bytearray()
+
+    def __len__(self) -> int:
+        """ Number of bytes written """
+        return len(self.buffer)
+
+    def getvalue(self) -> bytes:
+        """
+        Get the written data.
+
+        :return bytes: A copy of the written data.
+        """
+        return bytes(self.buffer)
+
+    def write_varint(self, value: int) -> None:
+        """
+        Write an integer as a VarInt.
+
+        :param value: The integer to write (negative values are written as 32-bit two's complement).
+        """
+        value &= 0xFFFFFFFF
+
+        while value >= 0x80:
+            self.buffer.append((value & 0x7F) | 0x80)
+            value >>= 7
+
+        self.buffer.append(value)
+
+    def write_bytes(self, data: Union[bytes, bytearray, memoryview]) -> None:
+        """
+        Write raw bytes.
+
+        :param data: The bytes to write.
+        """
+        self.buffer += data
+
+    def write_string(self, value: str) -> None:
+        """
+        Write a string as a VarInt length-prefixed UTF-8 string.
+
+        :param value: The string to write.
+        """
+        encoded: bytes = value.encode('utf-8')
+        self.write_varint(len(encoded))
+        self.buffer += encoded
+
+    def write_bool(self, value: bool) -> None:
+        """
+        Write a boolean (1 byte).
+
+        :param value: The boolean to write.
+        """
+        self.buffer.append(1 if value else 0)
+
+    def write_unsigned_short(self, value: int) -> None:
+        """
+        Write a 2-byte big-endian unsigned integer.
+
+        :param value: The integer to write.
+        """
+        self.buffer += struct.pack('>H', value)
+
+    def write_int(self, value: int) -> None:
+        """
+        Write a 4-byte big-endian signed integer.
+
+        :param value: The integer to write.
+        """
+        self.buffer += struct.pack('>i', value)
+
+    def write_long(self, value: int) -> None:
+        """
+        Write an 8-byte big-endian signed integer.
+
+        :param value: The integer to write.
+        """
+        self.buffer += struct.pack('>q', value)
+
+    def write_uuid(self, uuid_value: uuid.UUID) -> None:
+        """
+        Write a UUID (16 bytes, big-endian).
+
+        :param uuid_value: The UUID to write.
+        """
+        self.buffer += uuid_value.bytes
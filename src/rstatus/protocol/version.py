@@ -1,8 +1,20 @@
-from typing import Optional
+import bisect
+import json
+import os
+from typing import Dict, List, Optional
+
+# Versions shipped with the package, see ProtocolVersion.load
+VERSIONS_FILE: str = os.path.join(os.path.dirname(__file__), 'versions.json')
 
 
 class ProtocolVersion:
-    _versions: dict[str, int] = {}
+    _versions: Dict[str, 'ProtocolVersion'] = {}
+
+    # Reverse index: protocol number -> version names, in registration order
+    _protocols: Dict[int, List[str]] = {}
+
+    # Registered protocol numbers, sorted for the range queries
+    _sorted_protocols: List[int] = []
 
     def __init__(self, version: str, protocol: int):
         self.version = version
@@ -17,23 +29,84 @@ class ProtocolVersion:
         :param int protocol: Protocol number.
         :param Optional[list] subversions: Subversions of the version.
         """
-        cls._versions[version] = ProtocolVersion(version, protocol)
+        for name in [version, *(subversions or [])]:
+            previous: Optional[ProtocolVersion] = cls._versions.get(name)
+
+            if previous is not None:
+                if previous.protocol == protocol:
+                    continue
+
+                # The version is moved to another protocol
+                cls._unindex(name, previous.protocol)
+
+            cls._versions[name] = ProtocolVersion(name, protocol)
 
-        if subversions:
-            for subversion in subversions:
-                cls._versions[subversion] = ProtocolVersion(subversion, protocol)
+            if protocol not in cls._protocols:
+                cls._protocols[protocol] = []
+                bisect.insort(cls._sorted_protocols, protocol)
+
+            cls._protocols[protocol].append(name)
 
     @classmethod
-    def get_version_by_protocol(cls, protocol: int) -> str:
+    def _unindex(cls, version: str, protocol: int) -> None:
+        """
+        Remove a version from the reverse index.
+
+        :param str version: Version name.
+        :param int protocol: The protocol number the version was registered with.
+        """
+        names: List[str] = cls._protocols[protocol]
+        names.remove(version)
+
+        if not names:
+            del cls._protocols[protocol]
+            del cls._sorted_protocols[bisect.bisect_left(cls._sorted_protocols, protocol)]
+
+    @classmethod
+    def get_version_by_protocol(cls, protocol: int) -> Optional[str]:
         """
         Get the version name by its protocol number.
 
         :param int protocol: Protocol number.
-        :return str: The version name.
+        :return Optional[str]: The first version name registered for the protocol, or None if it is unknown.
+        """
+        names: Optional[List[str]] = cls._protocols.get(protocol)
+        return names[0] if names else None
+
+    @classmethod
+    def get_versions_by_protocol(cls, protocol: int) -> List[str]:
+        """
+        Get all the version names of a protocol number.
+
+        :param int protocol: Protocol number.
+        :return List[str]: The version names, in registration order (empty if the protocol is unknown).
+        """
+        return list(cls._protocols.get(protocol, []))
+
+    @classmethod
+    def get_closest_protocol(cls, protocol: int) -> Optional[int]:
+        """
+        Get the closest known protocol number lower than or equal to a protocol number.
+        Useful for snapshots and forks that report a protocol number that is not registered.
+
+        :param int protocol: Protocol number.
+        :return Optional[int]: The closest known protocol number, or None if the protocol is lower than every known protocol.
         """
-        for version, version_protocol in cls._versions.items():
-            if version_protocol.protocol == protocol:
-                return version
+        index: int = bisect.bisect_right(cls._sorted_protocols, protocol)
+        return cls._sorted_protocols[index - 1] if index else None
+
+    @classmethod
+    def get_protocols_in_range(cls, minimum: int, maximum: int) -> List[int]:
+        """
+        Get the known protocol numbers in a range.
+
+        :param int minimum: The lowest protocol number (inclusive).
+        :param int maximum: The highest protocol number (inclusive).
+        :return List[int]: The known protocol numbers, sorted.
+        """
+        start: int = bisect.bisect_left(cls._sorted_protocols, minimum)
+        end: int = bisect.bisect_right(cls._sorted_protocols, maximum)
+        return cls._sorted_protocols[start:end]
 
     @classmethod
     def get_protocol_by_version(cls, version: str) -> int:
@@ -44,7 +117,7 @@ class ProtocolVersion:
         :return int: The protocol number.
         """
         return cls._versions.get(version, cls._versions.get('1.8')).protocol
-    
+
     @classmethod
     def get_all_versions(cls) -> list[str]:
         """
@@ -53,52 +126,29 @@ class ProtocolVersion:
         :return list[str]: A list of all registered versions.
         """
         return list(cls._versions.keys())
-    
+
+    @classmethod
+    def load(cls, path: str) -> None:
+        """
+        Register the versions of a JSON file, so the table can be updated without a new release.
+        The file is a list of {"protocol": <number>, "versions": [<name>, ...]} objects; the first name of each entry
+        is the main version name of the protocol.
+
+        :param str path: The path of the file.
+        """
+        with open(path, 'r', encoding='utf-8') as file:
+            entries: list = json.load(file)
+
+        for entry in entries:
+            if not isinstance(entry, dict) or not isinstance(entry.get('protocol'), int) or not entry.get('versions'):
+                raise ValueError(f'Invalid protocol version entry: {entry}')
+
+            cls.register(entry['versions'][0], entry['protocol'], entry['versions'][1:])
+
     @classmethod
     def initialize_versions(cls) -> None:
         """ Initialize all versions. """
-        cls.register('1.8', 47, ['1.8.1', '1.8.2', '1.8.3', '1.8.4', '1.8.5', '1.8.6', '1.8.7', '1.8.8', '1.8.9'])
-        cls.register('1.9', 107)
-        cls.register('1.9.1', 108)
-        cls.register('1.9.2', 109)
-        cls.register('1.9.3', 110, ['1.9.4'])
-        cls.register('1.10', 210, ['1.10.1', '1.10.2'])
-        cls.register('1.11', 315)
-        cls.register('1.11.1', 316, ['1.11.2'])
-        cls.register('1.12', 335)
-        cls.register('1.12.1', 338)
-        cls.register('1.12.2', 340)
-        cls.register('1.13', 393)
-        cls.register('1.13.1', 401)
-        cls.register('1.13.2', 404)
-        cls.register('1.14', 477)
-        cls.register('1.14.1', 480)
-        cls.register('1.14.2', 485)
-        cls.register('1.14.3', 490)
-        cls.register('1.14.4', 498)
-        cls.register('1.15', 573)
-        cls.register('1.15.1', 575)
-        cls.register('1.15.2', 578)
-        cls.register('1.16', 735)
-        cls.register('1.16.1', 736)
-        cls.register('1.16.2', 751)
-        cls.register('1.16.3', 753)
-        cls.register('1.16.4', 754, ['1.16.5'])
-        cls.register('1.17', 755)
-        cls.register('1.17.1', 756)
-        cls.register('1.18', 757, ['1.18.1'])
-        cls.register('1.18.2', 758)
-        cls.register('1.19', 759)
-        cls.register('1.19.1', 760, ['1.19.2'])
-        cls.register('1.19.3', 761)
-        cls.register('1.19.4', 762)
-        cls.register('1.20', 763, ['1.20.1'])
-        cls.register('1.20.2', 764)
-        cls.register('1.20.3', 765, ['1.20.4'])
-        cls.register('1.20.5', 766, ['1.20.6'])
-        cls.register('1.21', 767, ['1.21.1'])
-        cls.register('1.21.2', 768, ['1.21.3'])
-        cls.register('1.21.4', 769)
-
-
-ProtocolVersion.initialize_versions()
\ No newline at end of file
+        cls.load(VERSIONS_FILE)
+
+
+ProtocolVersion.initialize_versions()
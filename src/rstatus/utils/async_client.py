@@ -0,0 +1,255 @@
+import asyncio
+import time
+from typing import Awaitable, Optional, TypeVar
+
+from .client import MinecraftClient
+from .compression import CompressionHandler
+from .proxy_pool import Proxy
+from .timeouts import Timeouts
+
+# Interval in seconds between two attempts to take a proxy from a busy pool
+PROXY_POLL_INTERVAL: float = 0.05
+
+T = TypeVar('T')
+
+
+async def wait_with_timeout(awaitable: Awaitable[T], timeout: Optional[float]) -> T:
+    """
+    Wait for an awaitable with a timeout, like asyncio.wait_for.
+    asyncio.wait_for of Python < 3.12 drops a cancellation that arrives just as the awaitable completes,
+    so a cancelled query would run until its next timeout. Here the cancellation is always raised.
+
+    :param awaitable: The awaitable.
+    :param timeout: The timeout in seconds (unbounded if None).
+    :return T: The result of the awaitable.
+    :raises asyncio.TimeoutError: If the awaitable did not complete in time, it is cancelled.
+    """
+    task: asyncio.Future = asyncio.ensure_future(awaitable)
+
+    try:
+        done, _ = await asyncio.wait((task,), timeout=timeout)
+
+    finally:
+        if not task.done():
+            task.cancel()
+
+    if not done:
+        raise asyncio.TimeoutError()
+
+    return task.result()
+
+
+class AsyncMinecraftClient(MinecraftClient):
+    """
+    asyncio version of MinecraftClient.
+    Java connections use asyncio streams instead of a blocking socket.
+    """
+    def __init__(self, *args, **kwargs):
+        """
+        Initialize a new AsyncMinecraftClient instance with server and connection settings.
+        Takes the same parameters as MinecraftClient.
+        """
+        super().__init__(*args, **kwargs)
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def connect(self, server_type: str = 'java') -> None:
+        """
+        Open a stream connection to the Minecraft server, optionally through a proxy.
+        Bedrock queries do not use streams (see AsyncBedrockHandler), they only connect to take a UDP association of the proxy.
+
+        :param server_type: Type of the server, "java" or "bedrock" with a proxy.
+        :return None: This function does not return a value.
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        timeouts: Timeouts = self._start_timeouts()
+
+        if server_type != 'java':
+            if not self.has_proxy():
+                raise ValueError('AsyncMinecraftClient only opens stream connections for Java servers')
+
+            if self.proxy_pool is not None:
+                self.proxy = await self._acquire_proxy(proxy_type='socks5')
+
+            # Datagrams go through a UDP association of the proxy, its handshake is blocking like PySocks
+            self.sock = await loop.run_in_executor(None, self._checkout_udp_association)
+            self.sock.setblocking(False)
+            return
+
+        # A new connection always starts without compression
+        self.compression_handler = CompressionHandler()
+
+        if self.has_proxy():
+            # PySocks only has a blocking handshake, so run it in the default executor
+            # and hand the connected socket over to asyncio.
+
+            if self.proxy_pool is not None:
+                # Take a proxy of the pool, it is given back when the connection is closed
+                self.proxy = await self._acquire_proxy()
+
+            sock = self._create_proxy_socket(self.proxy)
+
+            try:
+                if self.proxy is not None:
+                    await loop.run_in_executor(None, self._connect_through_pool, sock)
+
+                else:
+                    await loop.run_in_executor(None, sock.connect, (self.server_address, self.server_port))
+
+                sock.setblocking(False)
+                self.reader, self.writer = await asyncio.open_connection(sock=sock)
+
+            except BaseException:
+                sock.close()
+                raise
+
+        else:
+            if self.debug:
+                print(f'Connecting to {self.server_address}:{self.server_port} (without proxy)')
+
+            start_time: float = time.monotonic()
+
+            try:
+                self.reader, self.writer = await wait_with_timeout(
+                    asyncio.open_connection(self.server_address, self.server_port),
+                    timeout=timeouts.connect
+                )
+
+            except asyncio.TimeoutError:
+                # The round trip was at least the timeout, record it so a timeout too tight for the network can grow
+                self._observe_rtt(timeouts.connect)
+                raise
+
+            self._observe_rtt(time.monotonic() - start_time)
+
+    async def _acquire_proxy(self, proxy_type: Optional[str] = None) -> Proxy:
+        """
+        Take a proxy from the pool without blocking the event loop.
+
+        :param proxy_type: Only take a proxy of this type, any type if not provided.
+        :return Proxy: The proxy.
+        """
+        deadline: float = time.monotonic() + self.timeout
+
+        while True:
+            proxy: Optional[Proxy] = self.proxy_pool.try_acquire(proxy_type)
+
+            if proxy is not None:
+                return proxy
+
+            if time.monotonic() >= deadline:
+                raise Exception('No proxy available (every proxy is busy or ejected)')
+
+            await asyncio.sleep(PROXY_POLL_INTERVAL)
+
+    async def close(self) -> None:
+        """
+        Close the existing stream connection to the server.
+
+        :return None: This function does not return a value.
+        """
+        if self.writer:
+            self.writer.close()
+
+            try:
+                await self.writer.wait_closed()
+
+            except OSError:
+                pass
+
+            self.reader = None
+            self.writer = None
+
+        self._close_socket()
+        self._release_proxy()
+
+    async def send(self, data: bytes) -> None:
+        """
+        Send data to the server and wait until it is flushed.
+
+        :param data: The data to send.
+        :return None: This function does not return a value.
+        """
+        self.writer.write(data)
+        await wait_with_timeout(self.writer.drain(), timeout=self._remaining(self.current_timeouts.read))
+
+    async def _receive_packet(self) -> bytes:
+        """
+        Receive a packet from the stream and return the packet data.
+        Handles reading the packet length and decompressing if needed.
+
+        :return bytes: The packet data received from the stream.
+        """
+        packet_data: bytes = await self._read_frame()
+        return self._decompress_packet(packet_data)
+
+    async def _read_frame(self) -> bytes:
+        """
+        Read a length-prefixed packet from the stream.
+        A single read timeout bounds the whole length prefix, and each receive of the packet data gets its own.
+
+        :return bytes: The packet data, without the length prefix.
+        """
+        packet_length: int = await wait_with_timeout(self._read_varint(), timeout=self._remaining(self.current_timeouts.read))
+
+        if packet_length > self.max_packet_size:
+            raise Exception(f'Packet is too big ({packet_length} bytes, maximum is {self.max_packet_size} bytes)')
+
+        try:
+            return await self._read_exactly(packet_length)
+
+        except asyncio.IncompleteReadError as e:
+            raise Exception(
+                f'Connection lost while reading packet data (expected {packet_length} bytes, got {len(e.partial)} bytes)')
+
+    async def _read_exactly(self, size: int) -> bytes:
+        """
+        Read exactly size bytes from the stream.
+        As with the sockets of MinecraftClient, the read timeout bounds each receive, not the whole packet,
+        so a large packet that keeps arriving is not cut off.
+
+        :param size: The number of bytes to read.
+        :return bytes: The data read from the stream.
+        :raises asyncio.IncompleteReadError: If the stream ends before size bytes are read.
+        """
+        data: bytearray = bytearray()
+
+        while len(data) < size:
+            chunk: bytes = await wait_with_timeout(
+                self.reader.read(size - len(data)), timeout=self._remaining(self.current_timeouts.read))
+
+            if not chunk:
+                raise asyncio.IncompleteReadError(bytes(data), size)
+
+            data += chunk
+
+        return bytes(data)
+
+    async def _read_varint(self) -> int:
+        """
+        Read a VarInt from the stream and return the value.
+        The stream is buffered, so the bytes that already arrived are read from memory.
+
+        :return int: The VarInt value read from the stream.
+        """
+        num_read: int = 0
+        result: int = 0
+
+        while True:
+            try:
+                byte: bytes = await self.reader.readexactly(1)
+
+            except asyncio.IncompleteReadError:
+                raise Exception('Connection lost while reading VarInt')
+
+            byte_value: int = byte[0]
+            result |= (byte_value & 0x7F) << (7 * num_read)
+            num_read += 1
+
+            if num_read > 5:
+                raise Exception(f'VarInt is too big (more than 5 bytes): {result}')
+
+            if not (byte_value & 0x80):
+                break
+
+        return result
@@ -0,0 +1,332 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+# Style of a text segment: (color, bold, italic, underlined, strikethrough, obfuscated)
+Style = Tuple[Optional[str], bool, bool, bool, bool, bool]
+
+PLAIN_STYLE: Style = (None, False, False, False, False, False)
+
+# Legacy formatting code of each named color
+COLOR_CODES: Dict[str, str] = {
+    'black': '0',
+    'dark_blue': '1',
+    'dark_green': '2',
+    'dark_aqua': '3',
+    'dark_red': '4',
+    'dark_purple': '5',
+    'gold': '6',
+    'gray': '7',
+    'dark_gray': '8',
+    'blue': '9',
+    'green': 'a',
+    'aqua': 'b',
+    'red': 'c',
+    'light_purple': 'd',
+    'yellow': 'e',
+    'white': 'f',
+}
+
+# Legacy formatting code of each decoration, in the order of the style tuple
+DECORATION_CODES: Tuple[str, ...] = ('l', 'o', 'n', 'm', 'k')
+
+# Placeholders of a translation format: %s, %d, positional %1$s and the escaped %%
+FORMAT_PATTERN: re.Pattern = re.compile(r'%(?:(\d+)\$)?([sd%])')
+
+
+@dataclass
+class Span:
+    """ Run of text of a chat component with a single style """
+    __slots__ = ('text', 'color', 'bold', 'italic', 'underlined', 'strikethrough', 'obfuscated')
+
+    text: str
+    color: Optional[str]
+    bold: bool
+    italic: bool
+    underlined: bool
+    strikethrough: bool
+    obfuscated: bool
+
+
+class ChatRenderer:
+    """
+    Renderer of chat components (MOTDs, disconnect reasons...).
+
+    Components are walked with an explicit stack instead of recursion, so deeply nested components (gradient plugins
+    send one component per character) can not reach the recursion limit, and the text is joined once at the end.
+    Each renderer does a single pass over the components.
+    """
+    @classmethod
+    def plain(cls, chat_data: Any) -> str:
+        """
+        Render a chat component as plain text.
+        Styles are not needed, so the components are walked without computing them.
+
+        :param chat_data: The chat component (dict, list or string).
+        :return str: The text of the component, without formatting.
+        """
+        parts: List[str] = []
+        stack: List[Any] = [chat_data]
+
+        while stack:
+            component: Any = stack.pop()
+
+            if component.__class__ is str:
+                parts.append(component)
+
+            elif component.__class__ is dict:
+                # The text is written now, the content and the extra components are pushed in reverse order
+                extra: Any = component.get('extra')
+
+                if extra.__class__ is list:
+                    stack.extend(reversed(extra))
+
+                if 'translate' in component or 'keybind' in component or 'selector' in component or 'score' in component:
+                    stack.extend(reversed(cls._content(component)))
+
+                text: Any = component.get('text')
+
+                if text is not None:
+                    parts.append(text if text.__class__ is str else str(text))
+
+            elif isinstance(component, list):
+                stack.extend(reversed(component))
+
+            elif component is not None:
+                parts.append(str(component))
+
+        return ''.join(parts)
+
+    @classmethod
+    def legacy(cls, chat_data: Any, prefix: str = '&') -> str:
+        """
+        Render a chat component as text with legacy formatting codes.
+        Hex colors are written in the BungeeCord format (&x&r&r&g&g&b&b).
+
+        :param chat_data: The chat component (dict, list or string).
+        :param prefix: The character of the formatting codes ('&' or '§').
+        :return str: The text of the component with formatting codes.
+        """
+        parts: List[str] = []
+        current: Style = PLAIN_STYLE
+
+        for text, style in cls._segments(chat_data):
+            if style is not current and style != current:
+                parts.append(cls._legacy_codes(style, current, prefix))
+                current = style
+
+            parts.append(text)
+
+        return ''.join(parts)
+
+    @classmethod
+    def spans(cls, chat_data: Any) -> List[Span]:
+        """
+        Render a chat component as a list of styled spans.
+        Consecutive segments with the same style are merged into one span.
+
+        :param chat_data: The chat component (dict, list or string).
+        :return List[Span]: The spans of the component.
+        """
+        spans: List[Span] = []
+        run: List[str] = []
+        current: Style = PLAIN_STYLE
+
+        for text, style in cls._segments(chat_data):
+            if style is not current and style != current:
+                if run:
+                    spans.append(Span(''.join(run), *current))
+                    run = []
+
+                current = style
+
+            run.append(text)
+
+        if run:
+            spans.append(Span(''.join(run), *current))
+
+        return spans
+
+    @classmethod
+    def _segments(cls, chat_data: Any) -> List[Tuple[str, Style]]:
+        """
+        Walk a chat component depth-first and get its text segments in display order.
+
+        :param chat_data: The chat component (dict, list or string).
+        :return List[Tuple[str, Style]]: The (text, style) segments, styles are inherited by the children.
+        """
+        segments: List[Tuple[str, Style]] = []
+        stack: List[Tuple[Any, Style]] = [(chat_data, PLAIN_STYLE)]
+
+        while stack:
+            component, style = stack.pop()
+
+            if component.__class__ is str:
+                if component:
+                    segments.append((component, style))
+
+            elif component.__class__ is dict:
+                style = cls._apply_style(component, style)
+                extra: Any = component.get('extra')
+
+                if extra.__class__ is list:
+                    stack.extend([(child, style) for child in reversed(extra)])
+
+                if 'translate' in component or 'keybind' in component or 'selector' in component or 'score' in component:
+                    stack.extend([(child, style) for child in reversed(cls._content(component))])
+
+                text: Any = component.get('text')
+
+                if text:
+                    segments.append((text if text.__class__ is str else str(text), style))
+
+            elif isinstance(component, list):
+                stack.extend([(child, style) for child in reversed(component)])
+
+            elif component is not None:
+                segments.append((str(component), style))
+
+        return segments
+
+    @classmethod
+    def _content(cls, component: dict) -> List[Any]:
+        """
+        Get the content of a component that is not a text component.
+
+        :param component: The chat component.
+        :return List[Any]: The literal text and components of the content, in order.
+        """
+        if 'translate' in component:
+            return cls._translate(component)
+
+        if 'keybind' in component:
+            return [str(component['keybind'])]
+
+        if 'selector' in component:
+            return [str(component['selector'])]
+
+        if isinstance(component['score'], dict):
+            return [str(component['score'].get('value', ''))]
+
+        return []
+
+    @staticmethod
+    def _apply_style(component: dict, parent: Style) -> Style:
+        """
+        Get the style of a component, the fields it does not set are inherited from its parent.
+
+        :param component: The chat component.
+        :param parent: The style of the parent component.
+        :return Style: The style of the component.
+        """
+        if not ('color' in component or 'bold' in component or 'italic' in component or 'underlined' in component
+                or 'strikethrough' in component or 'obfuscated' in component):
+            return parent
+
+        color: Optional[str] = parent[0]
+
+        if 'color' in component:
+            color = component['color'] if isinstance(component['color'], str) else None
+
+        return (
+            color,
+            component['bold'] in (True, 'true') if 'bold' in component else parent[1],
+            component['italic'] in (True, 'true') if 'italic' in component else parent[2],
+            component['underlined'] in (True, 'true') if 'underlined' in component else parent[3],
+            component['strikethrough'] in (True, 'true') if 'strikethrough' in component else parent[4],
+            component['obfuscated'] in (True, 'true') if 'obfuscated' in component else parent[5],
+        )
+
+    @staticmethod
+    def _translate(component: dict) -> List[Any]:
+        """
+        Get the content of a translatable component, its arguments are kept as components to be rendered in place.
+        The fallback format is used when the server sends one. No language table is shipped, so without a fallback
+        the key is kept with its arguments ("key: arg1 arg2"), and known disconnect keys can still be recognized.
+
+        :param component: The translatable component.
+        :return List[Any]: The literal text and argument components, in order.
+        """
+        key: str = str(component['translate'])
+        arguments: Any = component.get('with', [])
+
+        if not isinstance(arguments, list):
+            arguments = [arguments]
+
+        translation_format: Any = component.get('fallback')
+
+        if not isinstance(translation_format, str):
+            if not arguments:
+                return [key]
+
+            content: List[Any] = [key, ': ']
+
+            for index, argument in enumerate(arguments):
+                if index:
+                    content.append(' ')
+
+                content.append(argument)
+
+            return content
+
+        content = []
+        position: int = 0
+        next_argument: int = 0
+
+        for match in FORMAT_PATTERN.finditer(translation_format):
+            content.append(translation_format[position:match.start()])
+            position = match.end()
+
+            if match.group(2) == '%':
+                content.append('%')
+                continue
+
+            index: int
+
+            if match.group(1) is not None:
+                index = int(match.group(1)) - 1
+
+            else:
+                index = next_argument
+                next_argument += 1
+
+            if 0 <= index < len(arguments):
+                content.append(arguments[index])
+
+        content.append(translation_format[position:])
+        return content
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _legacy_codes(style: Style, current: Style, prefix: str) -> str:
+        """
+        Get the legacy formatting codes that switch from a style to another.
+        A color code resets the decorations, so the decorations are only added on their own when the color is unchanged
+        and no decoration is removed.
+
+        :param style: The new style.
+        :param current: The current style.
+        :param prefix: The character of the formatting codes.
+        :return str: The formatting codes.
+        """
+        codes: List[str] = []
+        additive: bool = style[0] == current[0] and all(new or not old for new, old in zip(style[1:], current[1:]))
+
+        if not additive:
+            color: Optional[str] = style[0]
+
+            if color is not None and color in COLOR_CODES:
+                codes.append(prefix + COLOR_CODES[color])
+
+            elif color is not None and len(color) == 7 and color.startswith('#'):
+                codes.append(prefix + 'x' + ''.join([prefix + digit for digit in color[1:].lower()]))
+
+            else:
+                codes.append(prefix + 'r')
+
+        for enabled, was_enabled, code in zip(style[1:], current[1:], DECORATION_CODES):
+            if enabled and (not additive or not was_enabled):
+                codes.append(prefix + code)
+
+        return ''.join(codes)
@@ -1,4 +1,42 @@
 import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .chat import COLOR_CODES
+
+# MiniMessage tag, with an optional <reset> before it (a color code already resets the formatting)
+TAG: str = r'<(?:reset><)?/?!?[a-zA-Z_#0-9]+(?::[^<>]*)?>'
+
+# Single scan of clear_response: MiniMessage tags, runs of spaces and line breaks
+CLEAR_PATTERN: re.Pattern = re.compile(TAG + r'|[ \n]{2,}|\n')
+MINI_MESSAGE_PATTERN: re.Pattern = re.compile(TAG)
+
+# Parts of a tag found by a scan: reset, closing, negated, name and argument
+TAG_PATTERN: re.Pattern = re.compile(r'<(?:(reset)><)?(/?)(!?)([a-zA-Z_#0-9]+)((?::[^<>]*)?)>')
+
+# Legacy code of each decoration tag and its aliases
+DECORATION_TAGS: Dict[str, str] = {
+    'bold': 'l', 'b': 'l',
+    'italic': 'o', 'i': 'o', 'em': 'o',
+    'underlined': 'n', 'u': 'n',
+    'strikethrough': 'm', 'st': 'm',
+    'obfuscated': 'k', 'obf': 'k',
+}
+
+COLOR_TAGS: Dict[str, str] = {**COLOR_CODES, 'grey': '7', 'dark_grey': '8'}
+
+# Tags whose argument is a color, or a list of colors of which the first one is used
+COLOR_ARGUMENT_TAGS: Tuple[str, ...] = ('color', 'colour', 'c', 'gradient', 'transition')
+
+# Tags without a legacy equivalent, they are removed
+REMOVED_TAGS: Tuple[str, ...] = (
+    'rainbow', 'hover', 'click', 'insertion', 'font', 'key', 'lang', 'tr', 'translate', 'lang_or', 'tr_or',
+    'translate_or', 'selector', 'sel', 'score', 'nbt', 'data', 'pride', 'shadow', 'sprite', 'head',
+)
+
+# Replacements of the tags that do not depend on the tags before them
+REPLACEMENT_CACHE: Dict[str, str] = {}
+REPLACEMENT_CACHE_SIZE: int = 4096
 
 
 class ClearResponse:
@@ -6,50 +44,184 @@ class ClearResponse:
     def clear_response(bot_response: str) -> str:
         """
         This method is used to clear the response from the bot.
+        Line breaks and runs of spaces are replaced by a single space and MiniMessage tags are translated, in one scan.
 
         :param str bot_response: The response from the bot.
         :return str: The cleared response.
         """
-        bot_response = bot_response.replace('\n', ' ')
-        bot_response = re.sub(r' +', ' ', bot_response)
-        bot_response = ClearResponse.replace_mini_message_color_codes_with_minecraft_colors(bot_response)
-        return bot_response
-        
+        if '<' not in bot_response and '\n' not in bot_response and '  ' not in bot_response:
+            return bot_response
+
+        return CLEAR_PATTERN.sub(ClearResponse._replacement(bot_response), bot_response)
+
     @staticmethod
     def replace_mini_message_color_codes_with_minecraft_colors(message: str) -> str:
         """
-        Replace MiniMessage colored characters with Minecraft color codes.
-        
+        Replace MiniMessage tags with Minecraft color codes.
+        Colors (named, hex and <color:...>), decorations and their negations, closing tags, <reset> and <newline>
+        are translated; tags without a legacy equivalent (hover, click, rainbow...) are removed.
+
         :param message: Message with the mini message color codes
         :return: Message with the Minecraft color codes
         """
-        codes: dict = {
-            '<reset><black>': '0',
-            '<reset><dark_blue>': '1',
-            '<reset><dark_green>': '2',
-            '<reset><dark_aqua>': '3',
-            '<reset><dark_red>': '4',
-            '<reset><dark_purple>': '5',
-            '<reset><gold>': '6',
-            '<reset><gray>': '7',
-            '<reset><dark_gray>': '8',
-            '<reset><blue>': '9',
-            '<reset><green>': 'a',
-            '<reset><aqua>': 'b',
-            '<reset><red>': 'c',
-            '<reset><light_purple>': 'd',
-            '<reset><yellow>': 'e',
-            '<reset><white>': 'f',
-            '<obfuscated>': 'k',
-            '<bold>': 'l',
-            '<strikethrough>': 'm',
-            '<underlined>': 'n',
-            '<italic>': 'o',
-            '<reset>': 'r',
-        }
-
-        for code in codes.items():
-            message = message.replace(code[0], f'&{code[1]}').replace(code[0], f'&{code[1]}')
-
-        message = message.replace('<newline>', '\n')
-        return message
\ No newline at end of file
+        if '<' not in message:
+            return message
+
+        return MINI_MESSAGE_PATTERN.sub(ClearResponse._replacement(message), message)
+
+    @staticmethod
+    def _replacement(message: str) -> Callable[[re.Match], str]:
+        """
+        Get the replacement function of a scan.
+        Without closing or negated tags, the replacement of a tag does not depend on the tags before it,
+        so the replacements are cached.
+
+        :param message: The message to scan.
+        :return Callable[[re.Match], str]: The replacement function.
+        """
+        if '</' in message or '<!' in message or ':false' in message.lower():
+            return ClearResponse._translator()
+
+        return ClearResponse._cached_replacement
+
+    @staticmethod
+    def _translator() -> Callable[[re.Match], str]:
+        """
+        Create the replacement function of a scan.
+        It keeps the tags that are open, so a closing tag can restore the formatting of the tags still open.
+
+        :return Callable[[re.Match], str]: The replacement function.
+        """
+        open_tags: List[Tuple[str, str]] = []  # (Kind of tag, legacy code)
+
+        def replace(match: re.Match) -> str:
+            token: str = match.group(0)
+
+            if token[0] != '<':
+                # Spaces and line breaks
+                return ' '
+
+            reset, closing, negated, name, argument = ClearResponse._tag_parts(token)
+
+            if reset:
+                open_tags.clear()
+
+            if closing:
+                for index in range(len(open_tags) - 1, -1, -1):
+                    if ClearResponse._closes(name, open_tags[index]):
+                        del open_tags[index]
+                        return ClearResponse._restore(open_tags)
+
+                return '&r' if reset else ''
+
+            if name == 'reset':
+                open_tags.clear()
+                return '&r'
+
+            if name in ('newline', 'br'):
+                return ('&r' if reset else '') + '\n'
+
+            if name in DECORATION_TAGS:
+                if negated or argument.lower() == ':false':
+                    open_tags[:] = [tag for tag in open_tags if tag != ('decoration', DECORATION_TAGS[name])]
+                    return ClearResponse._restore(open_tags)
+
+                open_tags.append(('decoration', DECORATION_TAGS[name]))
+                return ('&r' if reset else '') + '&' + DECORATION_TAGS[name]
+
+            code: Optional[str] = None
+
+            if name in COLOR_TAGS:
+                code = '&' + COLOR_TAGS[name]
+
+            elif name.startswith('#'):
+                code = ClearResponse._color_code(name)
+
+            elif name in COLOR_ARGUMENT_TAGS and argument:
+                code = ClearResponse._color_code(argument[1:].split(':')[0].lower())
+
+            if code is not None:
+                open_tags.append(('color', code))
+                return code
+
+            if name in REMOVED_TAGS:
+                return '&r' if reset else ''
+
+            # Not a MiniMessage tag ("<3", placeholders...), it is kept
+            return '&r' + token[len('<reset>'):] if reset else token
+
+        return replace
+
+    @staticmethod
+    def _cached_replacement(match: re.Match) -> str:
+        """
+        Replacement function of the scans without closing or negated tags.
+
+        :param match: The match of the tag, or of the spaces and line breaks.
+        :return str: The replacement.
+        """
+        replacement: Optional[str] = REPLACEMENT_CACHE.get(match.group(0))
+
+        if replacement is None:
+            replacement = ClearResponse._translator()(match)
+
+            if len(REPLACEMENT_CACHE) >= REPLACEMENT_CACHE_SIZE:
+                REPLACEMENT_CACHE.clear()
+
+            REPLACEMENT_CACHE[match.group(0)] = replacement
+
+        return replacement
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _tag_parts(tag: str) -> Tuple[Optional[str], str, str, str, str]:
+        """
+        Split a tag found by a scan.
+
+        :param tag: The tag ("<reset><gold>", "</bold>", "<color:#ff0000>"...).
+        :return Tuple[Optional[str], str, str, str, str]: The reset prefix, closing slash, negation, lowercase name and argument.
+        """
+        reset, closing, negated, name, argument = TAG_PATTERN.fullmatch(tag).groups()
+        return reset, closing, negated, name.lower(), argument
+
+    @staticmethod
+    def _color_code(color: str) -> Optional[str]:
+        """
+        Get the legacy code of a color argument.
+
+        :param color: The color (name or "#rrggbb").
+        :return Optional[str]: The legacy code ("&c", "&x&r&r&g&g&b&b"), or None if it is not a color.
+        """
+        if color in COLOR_TAGS:
+            return '&' + COLOR_TAGS[color]
+
+        if len(color) == 7 and color.startswith('#') and all(digit in '0123456789abcdef' for digit in color[1:]):
+            return '&x' + ''.join(['&' + digit for digit in color[1:]])
+
+        return None
+
+    @staticmethod
+    def _closes(name: str, open_tag: Tuple[str, str]) -> bool:
+        """
+        Check if a closing tag closes an open tag.
+        A closing decoration tag closes the same decoration, a closing color tag closes the last color.
+
+        :param name: The name of the closing tag.
+        :param open_tag: The open tag (kind, legacy code).
+        :return bool: True if the open tag is closed.
+        """
+        if name in DECORATION_TAGS:
+            return open_tag == ('decoration', DECORATION_TAGS[name])
+
+        return open_tag[0] == 'color' and (name in COLOR_TAGS or name.startswith('#') or name in COLOR_ARGUMENT_TAGS)
+
+    @staticmethod
+    def _restore(open_tags: List[Tuple[str, str]]) -> str:
+        """
+        Get the legacy codes that reset the formatting to the tags still open.
+
+        :param open_tags: The open tags.
+        :return str: The legacy codes.
+        """
+        colors: List[str] = [code for kind, code in open_tags if kind == 'color']
+        return (colors[-1] if colors else '&r') + ''.join(['&' + code for kind, code in open_tags if kind == 'decoration'])
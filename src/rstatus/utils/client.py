@@ -1,13 +1,22 @@
 import socket
+import time
+import zlib
 from typing import Union, Optional
 
 import socks
 
 from .compression import CompressionHandler
-from ..packets.base import MinecraftPacket
+from .framing import FrameReader, MAX_PACKET_SIZE
+from .proxy_pool import Proxy, ProxyPool
+from .timeouts import AdaptiveTimeouts, Timeouts
+from .udp_relay import UdpAssociation, UdpAssociationPool, udp_association_pool
+from ..packets.reader import PacketReader
 
 
 class MinecraftClient:
+    # Idle SOCKS5 UDP associations of the Bedrock queries, shared by every client of the process
+    udp_associations: UdpAssociationPool = udp_association_pool
+
     def __init__(
             self,
             server_address: str,
@@ -18,6 +27,9 @@ class MinecraftClient:
             proxy_address: Optional[str] = None,
             proxy_port: Optional[int] = None,
             debug: bool = False,
+            max_packet_size: int = MAX_PACKET_SIZE,
+            proxy_pool: Optional[ProxyPool] = None,
+            timeouts: Union[Timeouts, AdaptiveTimeouts, None] = None,
     ):
         """
         Initialize a new MinecraftClient instance with server and connection settings.
@@ -30,67 +42,248 @@ class MinecraftClient:
         :param proxy_address: The address of the proxy server.
         :param proxy_port: The port of the proxy server.
         :param debug: Flag to enable debug logging.
+        :param max_packet_size: Maximum accepted packet length in bytes (compressed or not).
+        :param proxy_pool: Pool of proxies to spread the connections across, used instead of the single proxy settings.
+        :param timeouts: Separate connect, read and total timeouts, or adaptive timeouts, used instead of the single timeout.
         """
         self.server_address: str = server_address
         self.server_port: int = server_port
         self.timeout: int = timeout
         self.bungeehack: bool = bungeehack
-        self.sock: Union[socket.socket, None] = None
+        self.sock: Union[socket.socket, UdpAssociation, None] = None
         self.compression_handler = CompressionHandler()
+        self.max_packet_size: int = max_packet_size
+        self.frame_reader: FrameReader = FrameReader(max_packet_size=max_packet_size)
 
         # Proxy settings
         self.proxy_type: Optional[str] = proxy_type
         self.proxy_address: Optional[str] = proxy_address
         self.proxy_port: Optional[int] = proxy_port
+        self.proxy_pool: Optional[ProxyPool] = proxy_pool
+        self.proxy: Optional[Proxy] = None  # Proxy of the pool used by the current connection
         self.debug: bool = debug
 
+        # Timeout settings
+        self.timeouts: Union[Timeouts, AdaptiveTimeouts, None] = timeouts
+        self.current_timeouts: Timeouts = Timeouts.single(timeout)  # Timeouts of the current connection
+        self.deadline: Optional[float] = None  # End of the total timeout of the current connection
+
     def connect(self, server_type: str = 'java') -> None:
         """
         Establish a TCP connection to the Minecraft server, optionally through a proxy.
+        Other server types get a UDP socket, or a UDP association of the proxy (SOCKS5 only).
 
         :param server_type: Type of the server ("java" or other), affects socket type.
         :return None: This function does not return a value.
         """
-        # Check if the proxy settings are valid
-        if self.proxy_type and self.proxy_address and self.proxy_port:
-            # Check if the proxy type is valid
-            if self.proxy_type.lower() == 'socks4':
-                proxy_type = socks.SOCKS4
+        # A new connection always starts without compression
+        self.compression_handler = CompressionHandler()
+        timeouts: Timeouts = self._start_timeouts()
 
-            elif self.proxy_type.lower() == 'socks5':
-                proxy_type = socks.SOCKS5
+        if self.proxy_pool is not None:
+            # Take a proxy of the pool, it is given back when the connection is closed (UDP needs a SOCKS5 proxy)
+            self.proxy = self.proxy_pool.acquire(timeout=self.timeout, proxy_type=None if server_type == 'java' else 'socks5')
 
-            else:
-                raise ValueError('Proxy type must be either "socks4" or "socks5"')
+        if server_type != 'java' and self.has_proxy():
+            # Datagrams go through a UDP association of the proxy
+            self.sock = self._checkout_udp_association()
 
-            # Create a socket with the proxy settings
-            self.sock = socks.socksocket()
-            self.sock.settimeout(self.timeout)
-            self.sock.set_proxy(
-                proxy_type=proxy_type,
-                addr=self.proxy_address,
-                port=self.proxy_port
-            )
+        elif self.proxy is not None:
+            self.sock = self._create_proxy_socket(self.proxy)
 
-            if self.debug:
-                print(
-                    f'Connecting to {self.server_address}:{self.server_port} through proxy {self.proxy_address}:{self.proxy_port} ({self.proxy_type.upper()})')
+        # Check if the proxy settings are valid
+        elif self.has_proxy():
+            # Create a socket with the proxy settings
+            self.sock = self._create_proxy_socket()
 
         else:
             # Connect to the server without a proxy
             if server_type == 'java':
                 self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                self.sock.settimeout(self.timeout)
 
             else:
                 self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                self.sock.settimeout(self.timeout)
+
+            self.sock.settimeout(timeouts.connect)
 
             if self.debug:
                 print(f'Connecting to {self.server_address}:{self.server_port} (without proxy)')
 
         if server_type == 'java':
-            self.sock.connect((self.server_address, self.server_port))
+            start_time: float = time.monotonic()
+
+            try:
+                if self.proxy is not None:
+                    self._connect_through_pool(self.sock)
+
+                else:
+                    self.sock.connect((self.server_address, self.server_port))
+
+            except socket.timeout:
+                # The round trip was at least the timeout, record it so a timeout too tight for the network can grow
+                self._observe_rtt(timeouts.connect)
+                raise
+
+            self._observe_rtt(time.monotonic() - start_time)
+            self.sock.settimeout(timeouts.read)
+            self.frame_reader.attach(self.sock, timeouts.read, self.deadline)
+
+    def _start_timeouts(self) -> Timeouts:
+        """
+        Get the timeouts of a new connection, and start its total timeout.
+        Through a proxy, the round trips are the ones of the proxy, so adaptive timeouts use their default timeouts.
+
+        :return Timeouts: The timeouts of the connection.
+        """
+        if isinstance(self.timeouts, AdaptiveTimeouts):
+            timeouts: Timeouts = self.timeouts.default if self.has_proxy() else self.timeouts.timeouts(self.server_address)
+
+        else:
+            timeouts = self.timeouts or Timeouts.single(self.timeout)
+
+        self.current_timeouts = timeouts
+        self.deadline = None if timeouts.total is None else time.monotonic() + timeouts.total
+        return timeouts
+
+    def _remaining(self, timeout: float) -> float:
+        """
+        Bound a timeout by the total timeout of the current connection.
+
+        :param timeout: The timeout in seconds.
+        :return float: The timeout, or the time left before the deadline if it is shorter.
+        """
+        if self.deadline is None:
+            return timeout
+
+        remaining: float = self.deadline - time.monotonic()
+
+        if remaining <= 0:
+            raise socket.timeout('Total timeout of the connection exceeded')
+
+        return min(timeout, remaining)
+
+    def _observe_rtt(self, rtt: float) -> None:
+        """
+        Record the round-trip time of the server in the adaptive timeouts, if any.
+
+        :param rtt: The duration of the TCP connect or of the Bedrock ping, in seconds.
+        :return None: This function does not return a value.
+        """
+        if isinstance(self.timeouts, AdaptiveTimeouts) and not self.has_proxy():
+            self.timeouts.observe(self.server_address, rtt)
+
+    def _connect_through_pool(self, sock: socks.socksocket) -> None:
+        """
+        Connect a socket through the proxy taken from the pool, and report the outcome to the pool.
+        Errors of the proxy itself count against it; errors the proxy reports about the server (refused, unreachable)
+        and timeouts during the handshake (the server may just be slow) do not.
+
+        :param sock: The proxy socket of the proxy taken from the pool.
+        :return None: This function does not return a value.
+        """
+        start_time: float = time.monotonic()
+
+        try:
+            sock.connect((self.server_address, self.server_port))
+
+        except socks.ProxyConnectionError:
+            self.proxy_pool.report_failure(self.proxy)
+            raise
+
+        except socks.ProxyError as e:
+            # PySocks wraps the errors of the handshake in a GeneralProxyError
+            error: BaseException = e.socket_err if isinstance(e, socks.GeneralProxyError) and e.socket_err is not None else e
+
+            if isinstance(error, (socks.SOCKS4Error, socks.SOCKS5Error)):
+                # The proxy answered, the server could not be reached
+                self.proxy_pool.report_success(self.proxy)
+
+            elif not isinstance(error, socket.timeout):
+                self.proxy_pool.report_failure(self.proxy)
+
+            raise
+
+        self.proxy_pool.report_success(self.proxy, time.monotonic() - start_time)
+
+    def _checkout_udp_association(self) -> UdpAssociation:
+        """
+        Take a UDP association of the SOCKS5 proxy (the proxy of the pool, or the single proxy settings).
+        Associations are reused across queries, opening one is reported to the pool like a TCP connection.
+
+        :return UdpAssociation: The association, given back when the connection is closed.
+        """
+        if self.proxy is not None:
+            proxy_type, proxy_address, proxy_port = self.proxy.proxy_type, self.proxy.address, self.proxy.port
+
+        else:
+            proxy_type, proxy_address, proxy_port = self.proxy_type.lower(), self.proxy_address, self.proxy_port
+
+        if proxy_type != 'socks5':
+            raise ValueError('Bedrock queries through a proxy need a SOCKS5 proxy (UDP ASSOCIATE)')
+
+        if self.debug:
+            print(f'Pinging {self.server_address}:{self.server_port} through the UDP relay of proxy {proxy_address}:{proxy_port}')
+
+        start_time: float = time.monotonic()
+
+        try:
+            association: UdpAssociation = self.udp_associations.checkout(proxy_address, proxy_port, self.current_timeouts.connect)
+
+        except Exception:
+            if self.proxy is not None:
+                self.proxy_pool.report_failure(self.proxy)
+
+            raise
+
+        if self.proxy is not None and association.checkouts == 1:
+            self.proxy_pool.report_success(self.proxy, time.monotonic() - start_time)
+
+        return association
+
+    def has_proxy(self) -> bool:
+        """
+        Check if the client is configured to connect through a proxy.
+
+        :return bool: True if the proxy settings are complete, False otherwise.
+        """
+        return self.proxy_pool is not None or bool(self.proxy_type and self.proxy_address and self.proxy_port)
+
+    def _create_proxy_socket(self, proxy: Optional[Proxy] = None) -> socks.socksocket:
+        """
+        Create a TCP socket that connects through the configured SOCKS proxy.
+
+        :param proxy: The proxy taken from the pool, the single proxy settings are used if not provided.
+        :return socks.socksocket: The proxy socket (not connected yet).
+        """
+        if proxy is not None:
+            proxy_type_name, proxy_address, proxy_port = proxy.proxy_type, proxy.address, proxy.port
+
+        else:
+            proxy_type_name, proxy_address, proxy_port = self.proxy_type, self.proxy_address, self.proxy_port
+
+        # Check if the proxy type is valid
+        if proxy_type_name.lower() == 'socks4':
+            proxy_type = socks.SOCKS4
+
+        elif proxy_type_name.lower() == 'socks5':
+            proxy_type = socks.SOCKS5
+
+        else:
+            raise ValueError('Proxy type must be either "socks4" or "socks5"')
+
+        sock: socks.socksocket = socks.socksocket()
+        sock.settimeout(self.current_timeouts.connect)
+        sock.set_proxy(
+            proxy_type=proxy_type,
+            addr=proxy_address,
+            port=proxy_port
+        )
+
+        if self.debug:
+            print(
+                f'Connecting to {self.server_address}:{self.server_port} through proxy {proxy_address}:{proxy_port} ({proxy_type_name.upper()})')
+
+        return sock
 
     def close(self) -> None:
         """
@@ -98,70 +291,94 @@ class MinecraftClient:
 
         :return None: This function does not return a value.
         """
-        if self.sock:
-            self.sock.close()
-            self.sock = None
+        self._close_socket()
+        self._release_proxy()
 
-    def _receive_packet(self) -> bytes:
+    def _close_socket(self) -> None:
         """
-        Receive a packet from the socket and return the packet data.
-        Handles reading the packet length, receiving data in chunks, and decompressing if needed.
+        Close the socket of the current connection, UDP associations are given back for the next queries.
 
-        :return bytes: The packet data received from the socket.
+        :return None: This function does not return a value.
         """
-        packet_length: int = self._read_varint()
-        packet_data: bytes = b''
+        sock: Union[socket.socket, UdpAssociation, None] = self.sock
 
-        # Read the packet data
-        while len(packet_data) < packet_length:
-            # Read a chunk of data from the socket
-            chunk: bytes = self.sock.recv(packet_length - len(packet_data))
+        if sock is None:
+            return
 
-            # Check if the connection was lost while reading the packet data
-            if not chunk:
-                raise Exception(
-                    f'Connection lost while reading packet data (expected {packet_length} bytes, got {len(packet_data)} bytes)')
+        self.sock = None
 
-            packet_data += chunk  # Append the chunk to the packet data
+        if isinstance(sock, UdpAssociation):
+            self.udp_associations.checkin(sock)
 
-        # Check if the compression is enabled and decompress the packet data if needed
-        if self.compression_handler.compression_enabled:
-            # Read the uncompressed length of the packet
-            uncompressed_length, index = MinecraftPacket.read_varint_from_data(packet_data)
+        else:
+            sock.close()
 
-            if uncompressed_length > 0:  # Check if the packet is compressed
-                compressed_data = packet_data[index:]
-                packet_data = self.compression_handler.decompress(compressed_data)
+    def _release_proxy(self) -> None:
+        """
+        Give back the proxy taken from the pool for the current connection, if any.
 
-            else:
-                packet_data = packet_data[index:]
+        :return None: This function does not return a value.
+        """
+        proxy: Optional[Proxy] = self.proxy
 
-        return packet_data
+        if proxy is not None:
+            self.proxy = None
+            self.proxy_pool.release(proxy)
+
+    def abort(self) -> None:
+        """
+        Abort the current connection from another thread.
+        The socket is shut down first, so a thread blocked receiving from it wakes up immediately.
+
+        :return None: This function does not return a value.
+        """
+        sock: Optional[socket.socket] = self.sock
 
-    def _read_varint(self) -> int:
+        if sock is None:
+            return
+
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+
+        except OSError:
+            pass
+
+        sock.close()
+
+    def _receive_packet(self) -> bytes:
         """
-        Read a VarInt from the socket and return the value.
-        A VarInt is a variable-length integer used in the Minecraft protocol.
+        Receive a packet from the socket and return the packet data.
+        Handles reading the packet length, receiving data in chunks, and decompressing if needed.
 
-        :return int: The VarInt value read from the socket.
+        :return bytes: The packet data received from the socket.
+        """
+        return self._decompress_packet(self.frame_reader.read_packet())
+
+    def _decompress_packet(self, packet_data: bytes) -> Union[bytes, memoryview]:
         """
-        num_read: int = 0
-        result: int = 0
+        Remove the compression header of a received packet and decompress it if needed.
 
-        while True:
-            byte: bytes = self.sock.recv(1)
+        :param packet_data: The packet data received from the server.
+        :return Union[bytes, memoryview]: The packet data (packet ID + data).
+        """
+        # Check if the compression is enabled
+        if not self.compression_handler.compression_enabled:
+            return packet_data
+
+        # Read the uncompressed length of the packet
+        reader: PacketReader = PacketReader(packet_data)
+        uncompressed_length: int = reader.read_varint()
 
-            if not byte:
-                raise Exception('Connection lost while reading VarInt')
+        if uncompressed_length == 0:  # The packet is not compressed
+            return reader.read_remaining()
 
-            byte_value: int = byte[0]
-            result |= (byte_value & 0x7F) << (7 * num_read)
-            num_read += 1
+        if uncompressed_length > self.max_packet_size:
+            raise Exception(f'Uncompressed packet is too big ({uncompressed_length} bytes, maximum is {self.max_packet_size} bytes)')
 
-            if num_read > 5:
-                raise Exception(f'VarInt is too big (more than 5 bytes): {result}')
+        # Never inflate more than the announced length
+        packet_data = zlib.decompressobj().decompress(reader.read_remaining(), uncompressed_length)
 
-            if not (byte_value & 0x80):
-                break
+        if len(packet_data) != uncompressed_length:
+            raise Exception(f'Invalid compressed packet (expected {uncompressed_length} bytes, got {len(packet_data)} bytes)')
 
-        return result
+        return packet_data
@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+class DNSCache:
+    """
+    Thread-safe LRU cache of DNS answers that honours the TTL of each record set.
+    Names that do not exist (or have no record of the requested type) are cached as
+    negative entries, so they are not queried again until the negative TTL expires.
+    """
+    def __init__(self, max_size: int = 10000, negative_ttl: float = 60, min_ttl: float = 0, max_ttl: float = 86400):
+        """
+        Initialize a new DNSCache.
+
+        :param max_size: Maximum number of cached answers, the least recently used answers are evicted first.
+        :param negative_ttl: Time in seconds a negative answer (NXDOMAIN or no answer) is cached.
+        :param min_ttl: Minimum time in seconds an answer is cached, regardless of its TTL.
+        :param max_ttl: Maximum time in seconds an answer is cached, regardless of its TTL.
+        """
+        self.max_size: int = max_size
+        self.negative_ttl: float = negative_ttl
+        self.min_ttl: float = min_ttl
+        self.max_ttl: float = max_ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()  # Key -> (expiration time, value)
+        self._lock: threading.Lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, name: str, rdtype: str) -> Tuple[bool, Any]:
+        """
+        Get a cached answer.
+
+        :param name: The queried name.
+        :param rdtype: The record type ("A", "AAAA", "SRV"...).
+        :return Tuple[bool, Any]: (True, value) if the answer is cached (value is None for negative answers), (False, None) otherwise.
+        """
+        key: Tuple[str, str] = (name.lower(), rdtype)
+
+        with self._lock:
+            entry: Optional[Tuple[float, Any]] = self._entries.get(key)
+
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def put(self, name: str, rdtype: str, value: Any, ttl: float) -> None:
+        """
+        Cache an answer.
+
+        :param name: The queried name.
+        :param rdtype: The record type ("A", "AAAA", "SRV"...).
+        :param value: The answer.
+        :param ttl: The TTL of the answer in seconds.
+        """
+        ttl = min(max(ttl, self.min_ttl), self.max_ttl)
+
+        if ttl <= 0:
+            return
+
+        key: Tuple[str, str] = (name.lower(), rdtype)
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def put_negative(self, name: str, rdtype: str, ttl: Optional[float] = None) -> None:
+        """
+        Cache a negative answer (the name or the record does not exist).
+
+        :param name: The queried name.
+        :param rdtype: The record type ("A", "AAAA", "SRV"...).
+        :param ttl: The TTL of the negative answer in seconds (negative_ttl if not provided).
+        """
+        self.put(name, rdtype, None, self.negative_ttl if ttl is None else ttl)
+
+    def clear(self) -> None:
+        """ Remove every cached answer and reset the counters """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        Get the statistics of the cache.
+
+        :return dict: The number of cached answers, hits and misses.
+        """
+        return {'size': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+# Cache shared by every resolver of the process
+dns_cache: DNSCache = DNSCache()
@@ -0,0 +1,27 @@
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+
+except ImportError:
+    orjson = None
+
+
+def loads(data: Union[bytes, bytearray, memoryview]) -> Any:
+    """
+    Decode UTF-8 JSON data.
+    orjson is used when it is installed (pip install rstatus[fast]), it decodes the bytes without creating a str first.
+
+    :param data: The JSON data.
+    :return Any: The decoded value.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+
+        except orjson.JSONDecodeError:
+            # orjson is stricter than the json module (NaN, invalid surrogates...), let the json module decide
+            pass
+
+    return json.loads(str(data, 'utf-8'))
@@ -0,0 +1,108 @@
+import base64
+import hashlib
+import os
+import threading
+from typing import Dict, Optional
+
+from ..models.favicon import DATA_URI_PREFIX, Favicon
+
+
+class FaviconStore:
+    """
+    Thread-safe content-addressed store of favicons.
+
+    Many servers send the same favicon, so each favicon is kept once, keyed by the hash of its content,
+    and the server data only holds a reference to it (see Favicon). Favicons are kept in memory,
+    or written as PNG files to a directory.
+    """
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Initialize a new FaviconStore.
+
+        :param directory: Directory where the favicons are written as "<hash>.png" (kept in memory if not provided).
+        """
+        self.directory: Optional[str] = directory
+        self._favicons: Dict[str, str] = {}  # Hash -> base64 data
+        self._lock: threading.Lock = threading.Lock()
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self) -> int:
+        if self.directory is not None:
+            return sum(1 for name in os.listdir(self.directory) if name.endswith('.png'))
+
+        return len(self._favicons)
+
+    def add(self, data_uri: str) -> Favicon:
+        """
+        Add a favicon to the store.
+
+        :param data_uri: The favicon sent by the server ("data:image/png;base64,...").
+        :return Favicon: The reference to the stored favicon.
+        :raises ValueError: If the favicon is not valid base64 data.
+        """
+        data: str = data_uri[len(DATA_URI_PREFIX):] if data_uri.startswith(DATA_URI_PREFIX) else data_uri
+        data = data.replace('\n', '')
+
+        try:
+            # Also rejects non-ASCII characters, so the data can be hashed and written as a file
+            image: bytes = base64.b64decode(data, validate=True)
+
+        except ValueError:
+            raise ValueError('Invalid favicon: the data is not base64') from None
+
+        favicon_hash: str = hashlib.sha256(data.encode('ascii')).hexdigest()
+
+        if self.directory is None:
+            with self._lock:
+                self._favicons.setdefault(favicon_hash, data)
+
+        else:
+            path: str = self._path(favicon_hash)
+
+            if not os.path.exists(path):
+                temporary_path: str = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+
+                with open(temporary_path, 'wb') as file:
+                    file.write(image)
+
+                os.replace(temporary_path, path)
+
+        return Favicon(favicon_hash, self)
+
+    def get(self, favicon_hash: str) -> str:
+        """
+        Get the base64 data of a favicon.
+
+        :param favicon_hash: The hash of the favicon.
+        :return str: The base64 data of the favicon.
+        """
+        if self.directory is None:
+            return self._favicons[favicon_hash]
+
+        with open(self._path(favicon_hash), 'rb') as file:
+            return base64.b64encode(file.read()).decode('ascii')
+
+    def clear(self) -> None:
+        """ Remove every favicon of the store """
+        with self._lock:
+            self._favicons.clear()
+
+        if self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith('.png'):
+                    os.remove(os.path.join(self.directory, name))
+
+    def _path(self, favicon_hash: str) -> str:
+        """
+        Get the path of a favicon file.
+
+        :param favicon_hash: The hash of the favicon.
+        :return str: The path of the file.
+        """
+        return os.path.join(self.directory, f'{favicon_hash}.png')
+
+
+# Store shared by every client of the process
+favicon_store: FaviconStore = FaviconStore()
@@ -0,0 +1,155 @@
+import socket
+import time
+from typing import Optional
+
+# Maximum size of a packet in the Minecraft protocol (the length prefix is a 3-byte VarInt)
+MAX_PACKET_SIZE: int = 2097151
+
+
+class FrameReader:
+    """
+    Buffered reader of length-prefixed packets from a socket.
+
+    Data is received with recv_into into a reusable buffer, and the VarInt length
+    prefixes are parsed from memory instead of reading the socket byte by byte.
+    """
+    def __init__(self, max_packet_size: int = MAX_PACKET_SIZE, buffer_size: int = 65536):
+        """
+        Initialize a new FrameReader.
+
+        :param max_packet_size: Maximum accepted packet length, larger packets raise an exception.
+        :param buffer_size: Size of the reusable receive buffer.
+        """
+        self.max_packet_size: int = max_packet_size
+        self.sock: Optional[socket.socket] = None
+        self.read_timeout: Optional[float] = None
+        self.deadline: Optional[float] = None  # End of the total timeout of the connection, unbounded if None
+        self.buffer: bytearray = bytearray(buffer_size)
+        self.view: memoryview = memoryview(self.buffer)
+        self.start: int = 0  # Start of the unread data in the buffer
+        self.end: int = 0  # End of the received data in the buffer
+
+    def attach(self, sock: socket.socket, read_timeout: Optional[float] = None, deadline: Optional[float] = None) -> None:
+        """
+        Start reading from a new socket, discarding the data buffered from the previous one.
+
+        :param sock: The connected socket to read from.
+        :param read_timeout: Timeout in seconds of each receive, only needed with a deadline.
+        :param deadline: Time (time.monotonic) after which the receives fail, unbounded if not provided.
+        """
+        self.sock = sock
+        self.read_timeout = read_timeout
+        self.deadline = deadline
+        self.start = 0
+        self.end = 0
+
+    def _recv_into(self, view: memoryview) -> int:
+        """
+        Receive data from the socket, without waiting past the deadline.
+
+        :param view: The memory to receive into.
+        :return int: The number of bytes received.
+        """
+        if self.deadline is not None:
+            remaining: float = self.deadline - time.monotonic()
+
+            if remaining <= 0:
+                raise socket.timeout('Total timeout of the connection exceeded')
+
+            self.sock.settimeout(remaining if self.read_timeout is None else min(self.read_timeout, remaining))
+
+        return self.sock.recv_into(view)
+
+    def _fill(self) -> None:
+        """ Receive more data from the socket into the free space of the buffer """
+        if self.start == self.end:
+            # Everything was read, start again at the beginning of the buffer
+            self.start = self.end = 0
+
+        elif self.end == len(self.buffer):
+            # Move the unread data to the beginning of the buffer to make room
+            unread: int = self.end - self.start
+            self.buffer[:unread] = self.view[self.start:self.end]
+            self.start = 0
+            self.end = unread
+
+        received: int = self._recv_into(self.view[self.end:])
+
+        if not received:
+            raise Exception(f'Connection lost while reading packet data ({self.end - self.start} bytes buffered)')
+
+        self.end += received
+
+    def read_varint(self) -> int:
+        """
+        Read a VarInt from the socket.
+
+        :return int: The VarInt value.
+        """
+        num_read: int = 0
+        result: int = 0
+
+        while True:
+            if self.start == self.end:
+                self._fill()
+
+            byte: int = self.buffer[self.start]
+            self.start += 1
+            result |= (byte & 0x7F) << (7 * num_read)
+            num_read += 1
+
+            if num_read > 5:
+                raise Exception(f'VarInt is too big (more than 5 bytes): {result}')
+
+            if not (byte & 0x80):
+                return result
+
+    def read_packet(self) -> bytearray:
+        """
+        Read a length-prefixed packet from the socket.
+
+        :return bytearray: The packet data, without the length prefix.
+        """
+        packet_length: int = self.read_varint()
+
+        if packet_length > self.max_packet_size:
+            raise Exception(f'Packet is too big ({packet_length} bytes, maximum is {self.max_packet_size} bytes)')
+
+        buffered: int = self.end - self.start
+
+        if packet_length <= buffered:
+            packet: bytearray = self.buffer[self.start:self.start + packet_length]
+            self.start += packet_length
+            return packet
+
+        if packet_length <= len(self.buffer):
+            # The packet fits in the buffer, keep receiving until it is complete
+            while self.end - self.start < packet_length:
+                if self.end == len(self.buffer) or self.start + packet_length > len(self.buffer):
+                    unread: int = self.end - self.start
+                    self.buffer[:unread] = self.view[self.start:self.end]
+                    self.start = 0
+                    self.end = unread
+
+                self._fill()
+
+            packet = self.buffer[self.start:self.start + packet_length]
+            self.start += packet_length
+            return packet
+
+        # The packet is larger than the buffer, receive the rest directly into the packet
+        packet = bytearray(packet_length)
+        packet_view: memoryview = memoryview(packet)
+        packet_view[:buffered] = self.view[self.start:self.end]
+        self.start = self.end = 0
+        received: int = buffered
+
+        while received < packet_length:
+            chunk_size: int = self._recv_into(packet_view[received:])
+
+            if not chunk_size:
+                raise Exception(f'Connection lost while reading packet data (expected {packet_length} bytes, got {received} bytes)')
+
+            received += chunk_size
+
+        return packet
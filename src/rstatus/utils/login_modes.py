@@ -0,0 +1,169 @@
+import atexit
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, List, Optional, Tuple, Union
+
+
+class LoginModeCache:
+    """
+    Thread-safe LRU cache of the login start packet mode that worked for each server (and each protocol version).
+
+    The layout of the login start packet changed between versions and some proxies expect a different one,
+    so the bot walks the modes of LoginStartPacket until the server accepts the packet. The cache lets the
+    next bot connection to a server start with the mode that worked last time. A server without an entry only
+    starts with the mode of its protocol version once enough servers of that version agreed on it, since a single
+    proxy accepting an unusual mode would otherwise make every other server walk the modes. It can be persisted
+    to a JSON file.
+    """
+    def __init__(self, max_size: int = 65536, path: Optional[str] = None, min_confirmations: int = 3, save_interval: float = 30):
+        """
+        Initialize a new LoginModeCache.
+
+        :param max_size: Maximum number of cached modes, the least recently used modes are evicted first.
+        :param path: Path of the JSON file the cache is loaded from and saved to (not persisted if not provided).
+        :param min_confirmations: Number of servers that must agree on the mode of a protocol version before it is used for other servers.
+        :param save_interval: Minimum time in seconds between two saves of the file by put, the last changes are saved at exit.
+        """
+        self.max_size: int = max_size
+        self.path: Optional[str] = path
+        self.min_confirmations: int = min_confirmations
+        self.save_interval: float = save_interval
+        self.hits: int = 0
+        self.misses: int = 0
+        # (protocol, address, port) -> mode, and protocol -> [mode, votes] (majority vote of the servers)
+        self._modes: 'OrderedDict[Hashable, Union[int, List[int]]]' = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+        self._dirty: bool = False  # Changes not saved yet
+        self._last_save: float = 0.0
+
+        if path is not None:
+            if os.path.exists(path):
+                self.load()
+
+            atexit.register(self.flush)
+
+    def __len__(self) -> int:
+        return len(self._modes)
+
+    def get(self, protocol: int, server: Optional[Tuple[str, int]] = None) -> Optional[int]:
+        """
+        Get the login mode to try first.
+        The mode that worked for the server is preferred over the mode confirmed for the protocol version.
+
+        :param protocol: The protocol version used by the bot.
+        :param server: The (address, port) of the server.
+        :return Optional[int]: The cached mode or None if there is no cached mode.
+        """
+        with self._lock:
+            if server is not None:
+                mode: Optional[int] = self._modes.get((protocol, *server))
+
+                if mode is not None:
+                    self._modes.move_to_end((protocol, *server))
+                    self.hits += 1
+                    return mode
+
+            vote: Optional[List[int]] = self._modes.get(protocol)
+
+            if vote is not None and vote[1] >= self.min_confirmations:
+                self._modes.move_to_end(protocol)
+                self.hits += 1
+                return vote[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, protocol: int, mode: int, server: Optional[Tuple[str, int]] = None) -> None:
+        """
+        Record the login mode that worked.
+        A new mode of a server counts as a vote for the mode of its protocol version.
+        The cache is saved to its file if a mode changed, at most every save_interval seconds.
+
+        :param protocol: The protocol version used by the bot.
+        :param mode: The login mode that the server accepted.
+        :param server: The (address, port) of the server.
+        """
+        with self._lock:
+            if server is not None:
+                key: tuple = (protocol, *server)
+
+                if self._modes.get(key) == mode:
+                    # Already counted, the same server does not vote twice
+                    self._modes.move_to_end(key)
+                    return
+
+                self._modes[key] = mode
+                self._modes.move_to_end(key)
+
+            vote: Optional[List[int]] = self._modes.get(protocol)
+
+            if vote is None:
+                self._modes[protocol] = [mode, 1]
+
+            elif vote[0] == mode:
+                # Capped, so a mode that stops working loses the vote after a few servers
+                vote[1] = min(vote[1] + 1, self.min_confirmations * 2)
+
+            elif vote[1] > 1:
+                vote[1] -= 1
+
+            else:
+                self._modes[protocol] = [mode, 1]
+
+            self._modes.move_to_end(protocol)
+
+            while len(self._modes) > self.max_size:
+                self._modes.popitem(last=False)
+
+            self._dirty = True
+            save: bool = self.path is not None and time.monotonic() - self._last_save >= self.save_interval
+
+        if save:
+            self.save()
+
+    def load(self) -> None:
+        """ Load the cached modes from the file of the cache """
+        with open(self.path, 'r', encoding='utf-8') as file:
+            entries: list = json.load(file)
+
+        with self._lock:
+            for key, mode in entries:
+                if isinstance(key, list):
+                    self._modes[tuple(key)] = mode
+
+                else:
+                    # Files of older versions hold the last mode of the protocol version, it is not confirmed
+                    self._modes[key] = mode if isinstance(mode, list) else [mode, 0]
+
+    def save(self) -> None:
+        """ Save the cached modes to the file of the cache, replacing it atomically """
+        with self._lock:
+            entries: list = [[key, mode] for key, mode in self._modes.items()]
+            self._dirty = False
+            self._last_save = time.monotonic()
+
+        temporary_path: str = f'{self.path}.{os.getpid()}.{threading.get_ident()}.tmp'
+
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump(entries, file)
+
+        os.replace(temporary_path, self.path)
+
+    def flush(self) -> None:
+        """ Save the changes that were not saved yet by put """
+        if self._dirty and self.path is not None:
+            self.save()
+
+    def clear(self) -> None:
+        """ Remove every cached mode and reset the counters """
+        with self._lock:
+            self._modes.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Cache shared by every client of the process
+login_mode_cache: LoginModeCache = LoginModeCache()
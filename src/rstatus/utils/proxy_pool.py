@@ -0,0 +1,311 @@
+import random
+import threading
+import time
+from typing import Iterable, List, Optional, Union
+from urllib.parse import urlsplit
+
+# Proxy types supported by MinecraftClient
+PROXY_TYPES: tuple = ('socks4', 'socks5')
+
+
+class Proxy:
+    """ SOCKS proxy of a ProxyPool, with its health statistics """
+    __slots__ = (
+        'proxy_type', 'address', 'port', 'weight', 'max_concurrency', 'in_flight', 'latency', 'successes', 'failures',
+        'consecutive_failures', 'ejections', 'ejected_until', 'probation'
+    )
+
+    def __init__(self, proxy_type: str, address: str, port: int, weight: float = 1.0, max_concurrency: Optional[int] = None):
+        """
+        Initialize a new Proxy.
+
+        :param proxy_type: Type of proxy ("socks4" or "socks5").
+        :param address: The address of the proxy server.
+        :param port: The port of the proxy server.
+        :param weight: Relative share of the queries sent through the proxy.
+        :param max_concurrency: Maximum number of connections open through the proxy (the limit of the pool if not provided).
+        """
+        if proxy_type.lower() not in PROXY_TYPES:
+            raise ValueError('Proxy type must be either "socks4" or "socks5"')
+
+        if weight <= 0:
+            raise ValueError('The weight of a proxy must be positive')
+
+        self.proxy_type: str = proxy_type.lower()
+        self.address: str = address
+        self.port: int = port
+        self.weight: float = weight
+        self.max_concurrency: Optional[int] = max_concurrency
+
+        self.in_flight: int = 0  # Connections open through the proxy
+        self.latency: Optional[float] = None  # Moving average of the connection time in seconds
+        self.successes: int = 0
+        self.failures: int = 0
+        self.consecutive_failures: int = 0
+        self.ejections: int = 0  # Consecutive ejections, the ejection time doubles with each one
+        self.ejected_until: float = 0.0
+        self.probation: bool = False  # Re-admitted after an ejection, until its first success
+
+    @classmethod
+    def parse(cls, url: str) -> 'Proxy':
+        """
+        Create a proxy from a URL ("socks5://127.0.0.1:1080").
+
+        :param url: The URL of the proxy.
+        :return Proxy: The proxy.
+        """
+        parts = urlsplit(url)
+
+        if not parts.scheme or not parts.hostname or not parts.port:
+            raise ValueError(f'Invalid proxy URL: {url} (expected socks4://host:port or socks5://host:port)')
+
+        return cls(parts.scheme, parts.hostname, parts.port)
+
+    def __repr__(self) -> str:
+        return f'Proxy({self.proxy_type}://{self.address}:{self.port})'
+
+
+class ProxyPool:
+    """
+    Thread-safe pool of SOCKS proxies shared by clients.
+
+    Each connection takes a proxy from the pool and gives it back when it is closed. Proxies are chosen at random,
+    in proportion to their weight and inversely to their latency (moving average of the time to connect through them),
+    among the proxies below their concurrency limit. A proxy that fails several times in a row is ejected for a while;
+    it is then re-admitted on probation with a single connection, and its ejection time doubles if it fails again.
+    """
+    def __init__(
+        self,
+        proxies: Iterable[Union[str, Proxy]],
+        max_concurrency: int = 16,
+        failure_threshold: int = 3,
+        ejection_time: float = 30.0,
+        max_ejection_time: float = 600.0,
+        latency_alpha: float = 0.3
+    ):
+        """
+        Initialize a new ProxyPool.
+
+        :param proxies: The proxies, as Proxy objects or URLs ("socks5://host:port").
+        :param max_concurrency: Default maximum number of connections open through each proxy.
+        :param failure_threshold: Number of consecutive failures after which a proxy is ejected.
+        :param ejection_time: Time in seconds a proxy is ejected for the first time.
+        :param max_ejection_time: Maximum time in seconds a proxy is ejected.
+        :param latency_alpha: Weight of a new sample in the latency moving average (0 to 1).
+        """
+        self.proxies: List[Proxy] = [proxy if isinstance(proxy, Proxy) else Proxy.parse(proxy) for proxy in proxies]
+
+        if not self.proxies:
+            raise ValueError('A proxy pool needs at least one proxy')
+
+        if max_concurrency < 1 or failure_threshold < 1:
+            raise ValueError('The concurrency limit and the failure threshold must be at least 1')
+
+        self.max_concurrency: int = max_concurrency
+        self.failure_threshold: int = failure_threshold
+        self.ejection_time: float = ejection_time
+        self.max_ejection_time: float = max_ejection_time
+        self.latency_alpha: float = latency_alpha
+        self._condition: threading.Condition = threading.Condition()
+        self._random: random.Random = random.Random()
+
+    def __len__(self) -> int:
+        return len(self.proxies)
+
+    def acquire(self, timeout: Optional[float] = None, proxy_type: Optional[str] = None) -> Proxy:
+        """
+        Take a proxy for a connection, waiting until one is available.
+        The proxy must be given back with release when the connection is closed.
+
+        :param timeout: Maximum time to wait in seconds (no limit if not provided).
+        :param proxy_type: Only take a proxy of this type ("socks5" for UDP), any type if not provided.
+        :return Proxy: The proxy.
+        """
+        deadline: Optional[float] = None if timeout is None else time.monotonic() + timeout
+        self._check_type(proxy_type)
+
+        with self._condition:
+            while True:
+                proxy: Optional[Proxy] = self._select(proxy_type)
+
+                if proxy is not None:
+                    proxy.in_flight += 1
+                    return proxy
+
+                wait: Optional[float] = self._next_readmission()
+
+                if deadline is not None:
+                    remaining: float = deadline - time.monotonic()
+
+                    if remaining <= 0:
+                        raise Exception('No proxy available (every proxy is busy or ejected)')
+
+                    wait = remaining if wait is None else min(wait, remaining)
+
+                self._condition.wait(wait)
+
+    def try_acquire(self, proxy_type: Optional[str] = None) -> Optional[Proxy]:
+        """
+        Take a proxy for a connection without waiting.
+
+        :param proxy_type: Only take a proxy of this type ("socks5" for UDP), any type if not provided.
+        :return Optional[Proxy]: The proxy, or None if every proxy is busy or ejected.
+        """
+        self._check_type(proxy_type)
+
+        with self._condition:
+            proxy: Optional[Proxy] = self._select(proxy_type)
+
+            if proxy is not None:
+                proxy.in_flight += 1
+
+            return proxy
+
+    def acquire_all(self, proxy_type: Optional[str] = None) -> List[Proxy]:
+        """
+        Take every available proxy once, for work spread over all the proxies (see BedrockSweeper).
+        Each proxy must be given back with release.
+
+        :param proxy_type: Only take the proxies of this type, any type if not provided.
+        :return List[Proxy]: The proxies, empty if every proxy is busy or ejected.
+        """
+        now: float = time.monotonic()
+
+        with self._condition:
+            proxies: List[Proxy] = [proxy for proxy in self.proxies if self._available(proxy, now, proxy_type)]
+
+            for proxy in proxies:
+                proxy.in_flight += 1
+
+            return proxies
+
+    def release(self, proxy: Proxy) -> None:
+        """
+        Give back a proxy when its connection is closed.
+
+        :param proxy: The proxy.
+        """
+        with self._condition:
+            proxy.in_flight -= 1
+            self._condition.notify()
+
+    def report_success(self, proxy: Proxy, latency: Optional[float] = None) -> None:
+        """
+        Record a connection made through a proxy.
+
+        :param proxy: The proxy.
+        :param latency: Time in seconds to connect through the proxy, if it is a meaningful sample.
+        """
+        with self._condition:
+            proxy.successes += 1
+            proxy.consecutive_failures = 0
+            proxy.ejections = 0
+
+            if proxy.probation:
+                proxy.probation = False
+                self._condition.notify_all()
+
+            if latency is not None:
+                proxy.latency = latency if proxy.latency is None else proxy.latency + self.latency_alpha * (latency - proxy.latency)
+
+    def report_failure(self, proxy: Proxy) -> None:
+        """
+        Record a failure of a proxy (the proxy could not be reached or did not answer).
+        The proxy is ejected after failure_threshold consecutive failures, or after a failure on probation.
+
+        :param proxy: The proxy.
+        """
+        with self._condition:
+            proxy.failures += 1
+            proxy.consecutive_failures += 1
+
+            if proxy.probation or proxy.consecutive_failures >= self.failure_threshold:
+                proxy.ejected_until = time.monotonic() + min(self.ejection_time * 2 ** proxy.ejections, self.max_ejection_time)
+                proxy.ejections += 1
+                proxy.consecutive_failures = 0
+                proxy.probation = True
+
+    def stats(self) -> List[dict]:
+        """
+        Get the health statistics of the proxies.
+
+        :return List[dict]: The statistics of each proxy.
+        """
+        now: float = time.monotonic()
+
+        with self._condition:
+            return [
+                {
+                    'proxy': f'{proxy.proxy_type}://{proxy.address}:{proxy.port}',
+                    'in_flight': proxy.in_flight,
+                    'latency': proxy.latency,
+                    'successes': proxy.successes,
+                    'failures': proxy.failures,
+                    'ejected': proxy.ejected_until > now,
+                    'probation': proxy.probation,
+                }
+                for proxy in self.proxies
+            ]
+
+    def _limit(self, proxy: Proxy) -> int:
+        """
+        Get the number of connections that can be open through a proxy.
+
+        :param proxy: The proxy.
+        :return int: The limit, 1 while the proxy is on probation.
+        """
+        if proxy.probation:
+            return 1
+
+        return proxy.max_concurrency if proxy.max_concurrency is not None else self.max_concurrency
+
+    def _check_type(self, proxy_type: Optional[str]) -> None:
+        """
+        Check that the pool has proxies of a type, so a connection does not wait for proxies that do not exist.
+
+        :param proxy_type: The proxy type, any type if not provided.
+        """
+        if proxy_type is not None and not any(proxy.proxy_type == proxy_type for proxy in self.proxies):
+            raise ValueError(f'The proxy pool has no {proxy_type} proxy')
+
+    def _available(self, proxy: Proxy, now: float, proxy_type: Optional[str]) -> bool:
+        """
+        Check if a proxy can take a connection, must be called with the lock held.
+
+        :param proxy: The proxy.
+        :param now: The current time (time.monotonic).
+        :param proxy_type: The proxy type required, any type if not provided.
+        :return bool: True if the proxy is not ejected, below its limit and of the type required.
+        """
+        return proxy.ejected_until <= now and proxy.in_flight < self._limit(proxy) and proxy_type in (None, proxy.proxy_type)
+
+    def _select(self, proxy_type: Optional[str] = None) -> Optional[Proxy]:
+        """
+        Choose an available proxy, must be called with the lock held.
+
+        :param proxy_type: The proxy type required, any type if not provided.
+        :return Optional[Proxy]: The proxy, or None if every proxy is busy or ejected.
+        """
+        now: float = time.monotonic()
+        candidates: List[Proxy] = [proxy for proxy in self.proxies if self._available(proxy, now, proxy_type)]
+
+        if not candidates:
+            return None
+
+        # Proxies without a latency sample yet get the average latency, so they are tried
+        latencies: List[float] = [proxy.latency for proxy in candidates if proxy.latency is not None]
+        default_latency: float = sum(latencies) / len(latencies) if latencies else 1.0
+        weights: List[float] = [
+            proxy.weight / max(proxy.latency if proxy.latency is not None else default_latency, 0.001) for proxy in candidates
+        ]
+        return self._random.choices(candidates, weights=weights)[0]
+
+    def _next_readmission(self) -> Optional[float]:
+        """
+        Get the time until the next ejected proxy is re-admitted, must be called with the lock held.
+
+        :return Optional[float]: The time in seconds, or None if no proxy is ejected.
+        """
+        now: float = time.monotonic()
+        ejected: List[float] = [proxy.ejected_until - now for proxy in self.proxies if proxy.ejected_until > now]
+        return max(min(ejected), 0.0) if ejected else None
@@ -1,51 +1,258 @@
+import asyncio
+import random
 import socket
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+import dns.asyncresolver
+import dns.exception
 import dns.resolver
 
+from .dns_cache import DNSCache, dns_cache
+
 
 class Resolver:
+    # Cache shared by every resolution of the process
+    cache: DNSCache = dns_cache
+
+    # Time in seconds that addresses resolved by the system resolver (hosts file...) are cached, they have no TTL
+    system_ttl: float = 300
+
     @staticmethod
-    def domain_resolver(domain: str) -> Optional[str]:
+    def _records_from_answer(answer: Any, rdtype: str) -> list:
+        """
+        Convert a DNS answer into the values stored in the cache.
+
+        :param answer: The dnspython answer.
+        :param rdtype: The record type of the answer.
+        :return list: The addresses for A/AAAA records, (priority, weight, port, target) tuples for SRV records.
+        """
+        if rdtype == 'SRV':
+            return [(record.priority, record.weight, record.port, record.target.to_text()) for record in answer]
+
+        return [record.address for record in answer]
+
+    @classmethod
+    def resolve_records(cls, name: str, rdtype: str) -> Optional[list]:
+        """
+        This method is used to get the records of a name, using the DNS cache.
+
+        :param name: The name to resolve.
+        :param rdtype: The record type ("A", "AAAA" or "SRV").
+        :return: The records (see _records_from_answer) or None if there are no records.
+        """
+        found, records = cls.cache.get(name, rdtype)
+
+        if found:
+            return records
+
+        try:
+            answer = dns.resolver.resolve(name, rdtype)
+
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+            cls.cache.put_negative(name, rdtype)
+            return None
+
+        except (dns.exception.DNSException, ValueError, UnicodeError):
+            # Timeouts and server failures are not cached
+            return None
+
+        records = cls._records_from_answer(answer, rdtype)
+        cls.cache.put(name, rdtype, records, answer.rrset.ttl)
+        return records
+
+    @classmethod
+    async def async_resolve_records(cls, name: str, rdtype: str) -> Optional[list]:
+        """
+        This method is used to get the records of a name without blocking the event loop, using the DNS cache.
+
+        :param name: The name to resolve.
+        :param rdtype: The record type ("A", "AAAA" or "SRV").
+        :return: The records (see _records_from_answer) or None if there are no records.
+        """
+        found, records = cls.cache.get(name, rdtype)
+
+        if found:
+            return records
+
+        try:
+            answer = await dns.asyncresolver.resolve(name, rdtype)
+
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+            cls.cache.put_negative(name, rdtype)
+            return None
+
+        except (dns.exception.DNSException, ValueError, UnicodeError):
+            # Timeouts and server failures are not cached
+            return None
+
+        records = cls._records_from_answer(answer, rdtype)
+        cls.cache.put(name, rdtype, records, answer.rrset.ttl)
+        return records
+
+    @classmethod
+    def domain_resolver(cls, domain: str) -> Optional[str]:
         """
         This method is used to resolve a domain to an IP address.
+        Names without A records (hosts file, local names...) are resolved by the system resolver.
 
         :param domain: The domain to resolve.
         :return: The IP address of the domain or None if the domain could not be resolved.
         """
+        if cls.is_ip(domain):
+            return domain
+
+        addresses: Optional[List[str]] = cls.resolve_records(domain, 'A')
+
+        if addresses:
+            return addresses[0]
+
+        found, address = cls.cache.get(domain, 'system')
+
+        if found:
+            return address
+
         try:
-            return socket.gethostbyname(domain)
-        
+            address = socket.gethostbyname(domain)
+            cls.cache.put(domain, 'system', address, cls.system_ttl)
+
         except (socket.gaierror, OSError, UnicodeError):
-            return None
-        
-    def minecraft_port(domain: str) -> Optional[int]:
+            address = None
+            cls.cache.put_negative(domain, 'system')
+
+        return address
+
+    @classmethod
+    def minecraft_port(cls, domain: str) -> Optional[int]:
         """
         This method is used to get the Minecraft server port from a domain.
 
         :param domain: The domain to get the Minecraft server port from.
         :return: The Minecraft server port or None if the port could not be found.
         """
-        try:
-            return dns.resolver.resolve(f'_minecraft._tcp.{domain}', 'SRV')[0].port
-        
-        except (dns.resolver.NoAnswer, dns.resolver.NoNameservers, dns.resolver.NXDOMAIN, dns.resolver.Timeout):
+        srv: Optional[Tuple[str, int]] = cls.minecraft_srv(domain)
+        return srv[1] if srv else None
+
+    @classmethod
+    def minecraft_srv(cls, domain: str) -> Optional[Tuple[str, int]]:
+        """
+        This method is used to get the Minecraft server host and port from the SRV records of a domain.
+
+        :param domain: The domain to get the Minecraft server from.
+        :return: The (host, port) of the selected SRV record or None if the domain has no usable SRV record.
+        """
+        return cls.select_srv_record(cls.resolve_records(f'_minecraft._tcp.{domain}', 'SRV'))
+
+    @staticmethod
+    def select_srv_record(records: Optional[list]) -> Optional[Tuple[str, int]]:
+        """
+        This method is used to select the SRV record to connect to (RFC 2782).
+        The records with the lowest priority are used, and one of them is chosen at random by weight.
+
+        :param records: The (priority, weight, port, target) SRV records.
+        :return: The (host, port) of the selected record or None if there is no usable record.
+        """
+        if not records:
+            return None
+
+        lowest_priority: int = min(record[0] for record in records)
+        candidates: list = [record for record in records if record[0] == lowest_priority]
+        total_weight: int = sum(record[1] for record in candidates)
+
+        if total_weight == 0:
+            selected: tuple = random.choice(candidates)
+
+        else:
+            threshold: float = random.uniform(0, total_weight)
+
+            for selected in candidates:
+                threshold -= selected[1]
+
+                if threshold <= 0:
+                    break
+
+        # A target of "." means that the service is not available at this domain
+        host: str = selected[3].rstrip('.')
+
+        if not host:
             return None
 
+        return host, selected[2]
+
     @staticmethod
-    def is_domain(domain: str) -> bool:
+    def split_target(target: str) -> Tuple[str, Optional[int]]:
+        """
+        This method is used to split a target into its host and port.
+
+        :param target: The target (domain or IP, with an optional ":port").
+        :return: The (host, port) of the target, the port is None if the target has no port.
+        """
+        if ':' not in target:
+            return target, None
+
+        host, port = target.rsplit(':', 1)
+
+        if not port.isdigit() or not 0 < int(port) < 65536:
+            raise ValueError(f'Invalid port in target: {target}')
+
+        return host, int(port)
+
+    @classmethod
+    def resolve_endpoint(cls, target: str, default_port: int = 25565) -> Optional[Tuple[str, int]]:
+        """
+        This method is used to resolve a target into the IP address and port to connect to.
+        If the target has no port, the _minecraft._tcp SRV record is used (both its host and its port).
+
+        :param target: The target (domain or IP, with an optional ":port").
+        :param default_port: The port used when the target has no port and no SRV record.
+        :return: The (IP address, port) endpoint or None if the target could not be resolved.
+        """
+        host, port = cls.split_target(target)
+
+        if port is None and not cls.is_ip(host):
+            srv: Optional[Tuple[str, int]] = cls.minecraft_srv(host)
+
+            if srv is not None:
+                host, port = srv
+
+        address: Optional[str] = cls.domain_resolver(host)
+
+        if address is None:
+            return None
+
+        return address, port if port is not None else default_port
+
+    @classmethod
+    def resolve_many(cls, targets: Iterable[str], workers: int = 32, default_port: int = 25565) -> Dict[str, Optional[Tuple[str, int]]]:
+        """
+        This method is used to resolve many targets concurrently on a pool of worker threads.
+
+        :param targets: The targets (domain or IP, with an optional ":port").
+        :param workers: The number of worker threads.
+        :param default_port: The port used when a target has no port and no SRV record.
+        :return: A dictionary of target -> (IP address, port) endpoint, or None if the target could not be resolved.
+        """
+        unique_targets: List[str] = list(dict.fromkeys(targets))
+
+        def resolve(target: str) -> Optional[Tuple[str, int]]:
+            try:
+                return cls.resolve_endpoint(target, default_port)
+
+            except ValueError:
+                return None
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(unique_targets, executor.map(resolve, unique_targets)))
+
+    @classmethod
+    def is_domain(cls, domain: str) -> bool:
         """
         This method is used to check if a string is a domain.
 
         :param domain: The string to check.
         :return: True if the string is a domain, False otherwise.
         """
-        try:
-            socket.gethostbyname(domain)
-            return True
-        
-        except (socket.gaierror, OSError, UnicodeError):
-            return False
+        return cls.domain_resolver(domain) is not None
 
     @staticmethod
     def is_ip(ip: str) -> bool:
@@ -58,6 +265,107 @@ class Resolver:
         try:
             socket.inet_aton(ip)
             return True
-        
+
         except (socket.error, OSError):
             return False
+
+    @classmethod
+    async def async_domain_resolver(cls, domain: str) -> Optional[str]:
+        """
+        This method is used to resolve a domain to an IP address without blocking the event loop.
+
+        :param domain: The domain to resolve.
+        :return: The IP address of the domain or None if the domain could not be resolved.
+        """
+        if cls.is_ip(domain):
+            return domain
+
+        addresses: Optional[List[str]] = await cls.async_resolve_records(domain, 'A')
+
+        if addresses:
+            return addresses[0]
+
+        found, address = cls.cache.get(domain, 'system')
+
+        if found:
+            return address
+
+        try:
+            addresses_info: list = await asyncio.get_running_loop().getaddrinfo(domain, None, family=socket.AF_INET, type=socket.SOCK_STREAM)
+            address = addresses_info[0][4][0]
+            cls.cache.put(domain, 'system', address, cls.system_ttl)
+
+        except (socket.gaierror, OSError, UnicodeError, IndexError):
+            address = None
+            cls.cache.put_negative(domain, 'system')
+
+        return address
+
+    @classmethod
+    async def async_minecraft_port(cls, domain: str) -> Optional[int]:
+        """
+        This method is used to get the Minecraft server port from a domain without blocking the event loop.
+
+        :param domain: The domain to get the Minecraft server port from.
+        :return: The Minecraft server port or None if the port could not be found.
+        """
+        srv: Optional[Tuple[str, int]] = await cls.async_minecraft_srv(domain)
+        return srv[1] if srv else None
+
+    @classmethod
+    async def async_minecraft_srv(cls, domain: str) -> Optional[Tuple[str, int]]:
+        """
+        This method is used to get the Minecraft server host and port from the SRV records of a domain without blocking the event loop.
+
+        :param domain: The domain to get the Minecraft server from.
+        :return: The (host, port) of the selected SRV record or None if the domain has no usable SRV record.
+        """
+        return cls.select_srv_record(await cls.async_resolve_records(f'_minecraft._tcp.{domain}', 'SRV'))
+
+    @classmethod
+    async def async_resolve_endpoint(cls, target: str, default_port: int = 25565) -> Optional[Tuple[str, int]]:
+        """
+        This method is used to resolve a target into the IP address and port to connect to without blocking the event loop.
+        If the target has no port, the _minecraft._tcp SRV record is used (both its host and its port).
+
+        :param target: The target (domain or IP, with an optional ":port").
+        :param default_port: The port used when the target has no port and no SRV record.
+        :return: The (IP address, port) endpoint or None if the target could not be resolved.
+        """
+        host, port = cls.split_target(target)
+
+        if port is None and not cls.is_ip(host):
+            srv: Optional[Tuple[str, int]] = await cls.async_minecraft_srv(host)
+
+            if srv is not None:
+                host, port = srv
+
+        address: Optional[str] = await cls.async_domain_resolver(host)
+
+        if address is None:
+            return None
+
+        return address, port if port is not None else default_port
+
+    @classmethod
+    async def async_resolve_many(cls, targets: Iterable[str], concurrency: int = 256, default_port: int = 25565) -> Dict[str, Optional[Tuple[str, int]]]:
+        """
+        This method is used to resolve many targets concurrently with the asynchronous DNS resolver.
+
+        :param targets: The targets (domain or IP, with an optional ":port").
+        :param concurrency: Maximum number of targets resolved at the same time.
+        :param default_port: The port used when a target has no port and no SRV record.
+        :return: A dictionary of target -> (IP address, port) endpoint, or None if the target could not be resolved.
+        """
+        unique_targets: List[str] = list(dict.fromkeys(targets))
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+
+        async def resolve(target: str) -> Optional[Tuple[str, int]]:
+            async with semaphore:
+                try:
+                    return await cls.async_resolve_endpoint(target, default_port)
+
+                except ValueError:
+                    return None
+
+        return dict(zip(unique_targets, await asyncio.gather(*(resolve(target) for target in unique_targets))))
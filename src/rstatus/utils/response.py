@@ -1,3 +1,39 @@
+import re
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class Classification:
+    """ Result of the classification of a bot response """
+    __slots__ = ('code', 'text')
+
+    code: str  # Stable identifier of the rule that matched ("whitelist", "anti_vpn"...), "unknown" if none matched
+    text: str  # Text shown in the server data, with color codes
+
+
+@dataclass
+class Rule:
+    """ Classification rule of the bot responses """
+    __slots__ = ('code', 'text', 'pattern', 'exact', 'regex')
+
+    code: str
+    text: str
+    pattern: str  # Substring, whole text or regular expression of the bot response
+    exact: bool  # The pattern must be the whole bot response
+    regex: bool  # The pattern is a regular expression searched in the bot response
+
+
+@dataclass
+class CompiledRules:
+    """ Rules of BotResponse, compiled for classification """
+    __slots__ = ('match', 'classifications')
+
+    match: Callable[[str], int]  # Returns the index of the first rule that matches a bot response, or the number of rules
+    classifications: Tuple[Classification, ...]  # Classification of each rule
+
+
 class BotResponse:
     BUNGEEHACK: str = '&dVulnerable to BungeeHack'
     IP_FORWARDING: str = '&dIP Forwarding detected (Possibly vulnerable)'
@@ -13,6 +49,16 @@ class BotResponse:
     WHITELIST: str = '&bYou are not whitelisted on this server.'
     CONNECTED: str = '&a&lConnected'
 
+    # Code of the bot responses that did not match any rule
+    UNKNOWN: str = 'unknown'
+
+    # Rules in priority order, the first rule that matches a bot response classifies it
+    rules: List[Rule] = []
+
+    # Compiled rules, rebuilt when the rules change (see _compile)
+    _compiled: Optional[CompiledRules] = None
+    _lock: threading.Lock = threading.Lock()
+
     @staticmethod
     def custom_response(bot_response: str) -> str:
         """
@@ -21,48 +67,144 @@ class BotResponse:
         :param str bot_response: The response from the bot.
         :return str: The cleared response.
         """
-        if 'If you wish to use IP forwarding, please enable it in your BungeeCord config as well!' in bot_response:
-            return BotResponse.IP_FORWARDING
-        
-        if 'You have to join through' in bot_response:
-            return BotResponse.IPWHITELIST
-        
-        if 'Unable to authenticate' in bot_response:
-            return BotResponse.BUNGEEGUARD
-        
-        if 'Please join to the server via' in bot_response:
-            return BotResponse.PROTECTED
-        
-        if 'FML/Forge' in bot_response or 'has mods that require Forge' in bot_response:
-            return BotResponse.FORGE
-        
-        if 'VPN' in bot_response:
-            return BotResponse.ANTI_VPN
-        
-        # Minecraft default messages
-        if 'multiplayer.disconnect.invalid_public_key_signature' in bot_response:
-            return BotResponse.PREMIUM
-        
-        if 'multiplayer.disconnect.authservers_down' in bot_response:
-            return BotResponse.AUTHSERVERS_DOWN
-        
-        if 'multiplayer.disconnect.incompatible' in bot_response:
-            return BotResponse.INCOMPATIBLE
-        
-        if 'multiplayer.disconnect.not_whitelisted' in bot_response or 'You are not whitelisted on this server!' in bot_response:
-            return BotResponse.WHITELIST
-        
-        if 'multiplayer.disconnect.banned.reasonwith' in bot_response:
-            return BotResponse.BANNED
-        
-        # RStatus bot response messages
-        if bot_response == 'The server is in online mode':
-            return BotResponse.PREMIUM
-        
-        if bot_response == 'Connected':
-            return BotResponse.CONNECTED
-        
-        if bot_response == 'Connected with BungeeHack':
-            return BotResponse.BUNGEEHACK
-        
+        compiled: CompiledRules = BotResponse._compiled or BotResponse._compile()
+        index: int = compiled.match(bot_response)
+
+        if index < len(compiled.classifications):
+            return compiled.classifications[index].text
+
         return bot_response
+
+    @classmethod
+    def classify(cls, bot_response: str) -> Classification:
+        """
+        Classify a bot response with the rules, the first rule that matches wins.
+
+        :param str bot_response: The response from the bot.
+        :return Classification: The code and text of the first rule that matched, or the bot response with the "unknown" code.
+        """
+        compiled: CompiledRules = cls._compiled or cls._compile()
+        index: int = compiled.match(bot_response)
+
+        if index < len(compiled.classifications):
+            return compiled.classifications[index]
+
+        return Classification(cls.UNKNOWN, bot_response)
+
+    @classmethod
+    def register(
+        cls,
+        code: str,
+        text: str,
+        patterns: Iterable[str],
+        exact: bool = False,
+        regex: bool = False,
+        index: Optional[int] = None
+    ) -> None:
+        """
+        Register a classification rule for each pattern.
+
+        :param str code: The classification code of the rule ("anti_bot"...).
+        :param str text: The text shown in the server data, with color codes.
+        :param Iterable[str] patterns: The substrings (or regular expressions) that identify the bot response.
+        :param bool exact: The patterns must be the whole bot response.
+        :param bool regex: The patterns are regular expressions instead of substrings.
+        :param Optional[int] index: The priority of the rules (0 is the highest), added after the other rules if not provided.
+        """
+        if exact and regex:
+            raise ValueError('Exact rules can not be regular expressions')
+
+        new_rules: List[Rule] = []
+
+        for pattern in patterns:
+            if regex:
+                re.compile(pattern)  # Fail now on invalid patterns
+
+            new_rules.append(Rule(code, text, pattern, exact, regex))
+
+        with cls._lock:
+            position: int = len(cls.rules) if index is None else index
+            cls.rules[position:position] = new_rules
+            cls._compiled = None
+
+    @classmethod
+    def unregister(cls, code: str) -> None:
+        """
+        Remove the rules of a classification code.
+
+        :param str code: The classification code.
+        """
+        with cls._lock:
+            cls.rules[:] = [rule for rule in cls.rules if rule.code != code]
+            cls._compiled = None
+
+    @classmethod
+    def _compile(cls) -> CompiledRules:
+        """
+        Compile the rules into a single matching function.
+        The function checks the rules in priority order with inline substring tests, as fast as a hand-written chain
+        of checks. The exact rules are looked up in a dictionary once the first exact rule is reached, and the rules
+        after the exact rule that matched are skipped. The patterns are passed to the function as variables, they are
+        never part of its source.
+
+        :return CompiledRules: The compiled rules.
+        """
+        with cls._lock:
+            if cls._compiled is not None:
+                return cls._compiled
+
+            rules: Tuple[Rule, ...] = tuple(cls.rules)
+            exact: Dict[str, int] = {}
+            namespace: Dict[str, object] = {}
+            lines: List[str] = ['def match(bot_response):']
+
+            for index, rule in enumerate(rules):
+                if rule.exact:
+                    if not exact:
+                        lines.append(f'    exact = exact_get(bot_response, {len(rules)})')
+
+                    exact.setdefault(rule.pattern, index)
+                    continue
+
+                if rule.regex:
+                    namespace[f'pattern_{index}'] = re.compile(rule.pattern).search
+                    condition: str = f'pattern_{index}(bot_response)'
+
+                else:
+                    namespace[f'pattern_{index}'] = rule.pattern
+                    condition = f'pattern_{index} in bot_response'
+
+                # The exact rules before this rule have priority over it
+                if exact:
+                    condition = f'exact > {index} and {condition}'
+
+                lines.append(f'    if {condition}:')
+                lines.append(f'        return {index}')
+
+            lines.append('    return exact' if exact else f'    return {len(rules)}')
+            namespace['exact_get'] = exact.get
+            exec('\n'.join(lines), namespace)
+
+            cls._compiled = CompiledRules(namespace['match'], tuple(Classification(rule.code, rule.text) for rule in rules))
+            return cls._compiled
+
+
+# Built-in rules, in the order they were checked by the previous classifier
+BotResponse.register('ip_forwarding', BotResponse.IP_FORWARDING, ['If you wish to use IP forwarding, please enable it in your BungeeCord config as well!'])
+BotResponse.register('ip_whitelist', BotResponse.IPWHITELIST, ['You have to join through'])
+BotResponse.register('bungeeguard', BotResponse.BUNGEEGUARD, ['Unable to authenticate'])
+BotResponse.register('protected', BotResponse.PROTECTED, ['Please join to the server via'])
+BotResponse.register('forge', BotResponse.FORGE, ['FML/Forge', 'has mods that require Forge'])
+BotResponse.register('anti_vpn', BotResponse.ANTI_VPN, ['VPN'])
+
+# Minecraft default messages
+BotResponse.register('premium', BotResponse.PREMIUM, ['multiplayer.disconnect.invalid_public_key_signature'])
+BotResponse.register('authservers_down', BotResponse.AUTHSERVERS_DOWN, ['multiplayer.disconnect.authservers_down'])
+BotResponse.register('incompatible', BotResponse.INCOMPATIBLE, ['multiplayer.disconnect.incompatible'])
+BotResponse.register('whitelist', BotResponse.WHITELIST, ['multiplayer.disconnect.not_whitelisted', 'You are not whitelisted on this server!'])
+BotResponse.register('banned', BotResponse.BANNED, ['multiplayer.disconnect.banned.reasonwith'])
+
+# RStatus bot response messages
+BotResponse.register('premium', BotResponse.PREMIUM, ['The server is in online mode'], exact=True)
+BotResponse.register('connected', BotResponse.CONNECTED, ['Connected'], exact=True)
+BotResponse.register('bungeehack', BotResponse.BUNGEEHACK, ['Connected with BungeeHack'], exact=True)
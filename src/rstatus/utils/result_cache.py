@@ -0,0 +1,213 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional, Set, Tuple, Union
+
+from ..models import BedrockServerResponse, JavaServerResponse
+from ..models.serialization import from_dict, to_dict
+
+
+class ResultCache:
+    """
+    Thread-safe SQLite cache of query results.
+
+    Status results and bot responses are cached separately, with their own TTL, because the bot response of a
+    server changes far less often than its status. With stale_while_revalidate, an expired result is still
+    returned (for up to max_stale seconds) and the client refreshes it in the background.
+    """
+    def __init__(
+        self,
+        path: str = ':memory:',
+        status_ttl: float = 60,
+        bot_ttl: float = 3600,
+        stale_while_revalidate: bool = False,
+        max_stale: float = 86400,
+    ):
+        """
+        Initialize a new ResultCache.
+
+        :param path: Path of the SQLite database (in memory if not provided).
+        :param status_ttl: Time in seconds a status result is fresh.
+        :param bot_ttl: Time in seconds a bot response is fresh.
+        :param stale_while_revalidate: Return expired results and refresh them in the background.
+        :param max_stale: Time in seconds after its expiration during which an expired result can still be returned.
+        """
+        self.path: str = path
+        self.ttls: dict = {'status': status_ttl, 'bot': bot_ttl}
+        self.stale_while_revalidate: bool = stale_while_revalidate
+        self.max_stale: float = max_stale
+        self.hits: int = 0
+        self.misses: int = 0
+        self._revalidating: Set[str] = set()
+        self._lock: threading.Lock = threading.Lock()
+        self._connection: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+
+        with self._lock, self._connection:
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)'
+            )
+
+    @staticmethod
+    def status_key(address: str, port: int, race: bool, fields: Optional[Iterable[str]] = None) -> str:
+        """
+        Get the key of a status result.
+        Results built with a field projection are cached apart from the complete results.
+
+        :param address: The IP address of the server.
+        :param port: The port of the server.
+        :param race: Determines if both editions were queried concurrently.
+        :param fields: The fields of the projection (None for every field).
+        :return str: The key.
+        """
+        return json.dumps(['status', address, port, race, None if fields is None else sorted(fields)])
+
+    @staticmethod
+    def bot_key(address: str, port: int) -> str:
+        """
+        Get the key of a bot response.
+        The bot switches to the BungeeCord hack by itself when the server needs it, so the option is not part of the key.
+
+        :param address: The IP address of the server.
+        :param port: The port of the server.
+        :return str: The key.
+        """
+        return json.dumps(['bot', address, port])
+
+    def get_status(self, key: str) -> Tuple[Union[JavaServerResponse, BedrockServerResponse, None], bool]:
+        """
+        Get a cached status result.
+
+        :param key: The key of the result (see status_key).
+        :return Tuple[Union[JavaServerResponse, BedrockServerResponse, None], bool]: The server data (None if it must be
+            queried again) and whether it is stale and should be refreshed in the background.
+        """
+        value, stale = self._get(key, 'status')
+        return (from_dict(value) if value is not None else None), stale
+
+    def put_status(self, key: str, server_data: Union[JavaServerResponse, BedrockServerResponse]) -> None:
+        """
+        Cache a status result.
+
+        :param key: The key of the result (see status_key).
+        :param server_data: The server data.
+        """
+        self._put(key, to_dict(server_data))
+
+    def get_bot(self, key: str) -> Tuple[Optional[str], bool]:
+        """
+        Get a cached bot response.
+
+        :param key: The key of the response (see bot_key).
+        :return Tuple[Optional[str], bool]: The bot response (None if the bot must connect again)
+            and whether it is stale and should be refreshed in the background.
+        """
+        return self._get(key, 'bot')
+
+    def put_bot(self, key: str, bot_response: str) -> None:
+        """
+        Cache a bot response.
+
+        :param key: The key of the response (see bot_key).
+        :param bot_response: The bot response.
+        """
+        self._put(key, bot_response)
+
+    def claim_revalidation(self, key: str) -> bool:
+        """
+        Claim the background refresh of a result, so a stale result is only refreshed once at a time.
+
+        :param key: The key of the result.
+        :return bool: True if the caller must refresh the result, False if it is already being refreshed.
+        """
+        with self._lock:
+            if key in self._revalidating:
+                return False
+
+            self._revalidating.add(key)
+            return True
+
+    def release_revalidation(self, key: str) -> None:
+        """
+        Release the background refresh of a result claimed with claim_revalidation.
+
+        :param key: The key of the result.
+        """
+        with self._lock:
+            self._revalidating.discard(key)
+
+    def prune(self) -> int:
+        """
+        Remove the results that can no longer be returned.
+
+        :return int: The number of removed results.
+        """
+        now: float = time.time()
+        removed: int = 0
+
+        with self._lock, self._connection:
+            for kind, ttl in self.ttls.items():
+                removed += self._connection.execute(
+                    'DELETE FROM results WHERE key LIKE ? AND stored_at < ?',
+                    (f'["{kind}"%', now - ttl - self.max_stale)
+                ).rowcount
+
+        return removed
+
+    def clear(self) -> None:
+        """ Remove every cached result and reset the counters """
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM results')
+            self.hits = 0
+            self.misses = 0
+
+    def close(self) -> None:
+        """ Close the database """
+        with self._lock:
+            self._connection.close()
+
+    def stats(self) -> dict:
+        """
+        Get the statistics of the cache.
+
+        :return dict: The number of cached results, hits and misses.
+        """
+        with self._lock:
+            size: int = self._connection.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+        return {'size': size, 'hits': self.hits, 'misses': self.misses}
+
+    def _get(self, key: str, kind: str) -> Tuple[Optional[Union[dict, str]], bool]:
+        """
+        Get a cached value.
+
+        :param key: The key of the value.
+        :param kind: The kind of value ("status" or "bot"), which sets its TTL.
+        :return Tuple[Optional[Union[dict, str]], bool]: The value (None if it is missing or expired) and whether it is stale.
+        """
+        with self._lock:
+            row: Optional[tuple] = self._connection.execute('SELECT value, stored_at FROM results WHERE key = ?', (key,)).fetchone()
+
+            age: float = time.time() - row[1] if row is not None else 0.0
+            ttl: float = self.ttls[kind]
+
+            if row is None or age > ttl and not (self.stale_while_revalidate and age <= ttl + self.max_stale):
+                self.misses += 1
+                return None, False
+
+            self.hits += 1
+
+        return json.loads(row[0]), age > ttl
+
+    def _put(self, key: str, value: Union[dict, str]) -> None:
+        """
+        Cache a value.
+
+        :param key: The key of the value.
+        :param value: The JSON serializable value.
+        """
+        encoded: str = json.dumps(value)
+
+        with self._lock, self._connection:
+            self._connection.execute('INSERT OR REPLACE INTO results (key, value, stored_at) VALUES (?, ?, ?)', (key, encoded, time.time()))
@@ -0,0 +1,157 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Dict, Hashable, List, Optional, Tuple, Union
+
+
+class RetryLater(Exception):
+    """
+    Raised by the bot when a connection attempt has to wait for the backoff of the server.
+    The state of the attempt is kept by the client, so it can be resumed by calling the bot again with the same version.
+    """
+    def __init__(self, delay: float, version: Union[str, int, None] = None):
+        """
+        Initialize a new RetryLater exception.
+
+        :param delay: Time in seconds before the attempt can be retried.
+        :param version: The version the bot has to be called with to resume the attempt.
+        """
+        super().__init__(f'Retry in {delay:.2f} seconds')
+        self.delay: float = delay
+        self.version: Union[str, int, None] = version
+
+
+class BackoffRegistry:
+    """
+    Thread-safe registry of the backoff of each server.
+    Each consecutive backoff of a server is longer than the previous one (up to max_delay), and the state
+    is kept across queries, so every client of the process waits before reconnecting to a throttled server.
+    """
+    def __init__(self, factor: float = 2, max_delay: float = 60, max_size: int = 10000):
+        """
+        Initialize a new BackoffRegistry.
+
+        :param factor: Multiplier applied to the delay for each consecutive backoff of a server.
+        :param max_delay: Maximum backoff delay in seconds.
+        :param max_size: Maximum number of servers kept, expired backoffs are removed first.
+        """
+        self.factor: float = factor
+        self.max_delay: float = max_delay
+        self.max_size: int = max_size
+        self._entries: Dict[Hashable, Tuple[float, int]] = {}  # Key -> (end of the backoff, consecutive backoffs)
+        self._lock: threading.Lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def backoff(self, key: Hashable, delay: float) -> float:
+        """
+        Start a backoff for a server.
+
+        :param key: The server (address, port).
+        :param delay: The base delay in seconds of the backoff.
+        :return float: The delay in seconds until the end of the backoff.
+        """
+        now: float = time.monotonic()
+
+        with self._lock:
+            _, count = self._entries.get(key, (0.0, 0))
+            delay = min(delay * self.factor ** count, self.max_delay)
+            self._entries[key] = (now + delay, count + 1)
+
+            if len(self._entries) > self.max_size:
+                self._prune(now)
+
+        return delay
+
+    def remaining(self, key: Hashable) -> float:
+        """
+        Get the remaining time of the backoff of a server.
+
+        :param key: The server (address, port).
+        :return float: The remaining time in seconds, 0 if the server is not in backoff.
+        """
+        entry: Optional[Tuple[float, int]] = self._entries.get(key)
+
+        if entry is None:
+            return 0.0
+
+        return max(entry[0] - time.monotonic(), 0.0)
+
+    def reset(self, key: Hashable) -> None:
+        """
+        Forget the backoff of a server, after a connection that was not throttled.
+
+        :param key: The server (address, port).
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """ Forget the backoff of every server """
+        with self._lock:
+            self._entries.clear()
+
+    def _prune(self, now: float) -> None:
+        """
+        Remove the expired backoffs, and the oldest ones if the registry is still full.
+        Must be called with the lock held.
+
+        :param now: The current monotonic time.
+        """
+        for key in [key for key, (end, _) in self._entries.items() if end <= now]:
+            del self._entries[key]
+
+        while len(self._entries) > self.max_size:
+            del self._entries[next(iter(self._entries))]
+
+
+class RetryQueue:
+    """
+    Queue of deferred items, ordered by the time at which they can be retried.
+    """
+    def __init__(self):
+        self._heap: List[Tuple[float, int, Any]] = []  # (ready time, insertion order, item)
+        self._counter: itertools.count = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, item: Any, delay: float) -> None:
+        """
+        Add an item to the queue.
+
+        :param item: The item to retry.
+        :param delay: Time in seconds before the item is ready.
+        """
+        heapq.heappush(self._heap, (time.monotonic() + delay, next(self._counter), item))
+
+    def pop_ready(self) -> List[Any]:
+        """
+        Remove and return the items that are ready, in the order they became ready.
+
+        :return List[Any]: The ready items.
+        """
+        now: float = time.monotonic()
+        ready: List[Any] = []
+
+        while self._heap and self._heap[0][0] <= now:
+            ready.append(heapq.heappop(self._heap)[2])
+
+        return ready
+
+    def next_delay(self) -> Optional[float]:
+        """
+        Get the time until the next item is ready.
+
+        :return Optional[float]: The time in seconds (0 if an item is ready), or None if the queue is empty.
+        """
+        if not self._heap:
+            return None
+
+        return max(self._heap[0][0] - time.monotonic(), 0.0)
+
+
+# Backoff of the servers shared by every client of the process
+backoff_registry: BackoffRegistry = BackoffRegistry()
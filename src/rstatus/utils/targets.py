@@ -0,0 +1,208 @@
+import bisect
+import ipaddress
+import random
+import socket
+import struct
+from typing import Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+Endpoint = Tuple[str, int]
+
+MASK_64: int = 0xFFFFFFFFFFFFFFFF
+
+
+class FeistelPermutation:
+    """
+    Pseudo-random permutation of range(size) in constant memory.
+
+    A balanced Feistel network is a bijection on the integers of an even number of bits, whatever its round function.
+    The smallest such domain that holds size is at most 4 times larger, so values outside of range(size) are encrypted
+    again until they fall inside (cycle walking), which keeps the bijection on range(size).
+    """
+    ROUNDS: int = 4
+
+    def __init__(self, size: int, seed: int):
+        """
+        Initialize a new FeistelPermutation.
+
+        :param size: The number of values to permute.
+        :param seed: The seed of the permutation, the same seed always gives the same permutation.
+        """
+        if size < 1:
+            raise ValueError('A permutation needs at least one value')
+
+        bits: int = max((size - 1).bit_length(), 2)
+        self.size: int = size
+        self.half_bits: int = (bits + 1) // 2
+        self.half_mask: int = (1 << self.half_bits) - 1
+        self.keys: List[int] = [self._mix(seed * self.ROUNDS + index) for index in range(self.ROUNDS)]
+
+    @staticmethod
+    def _mix(value: int) -> int:
+        """
+        Mix the bits of a value (SplitMix64 finalizer).
+
+        :param value: The value.
+        :return int: The mixed 64-bit value.
+        """
+        value = (value + 0x9E3779B97F4A7C15) & MASK_64
+        value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+        value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK_64
+        return value ^ (value >> 31)
+
+    def _encrypt(self, value: int) -> int:
+        """
+        Apply the Feistel network to a value of the domain.
+
+        :param value: The value.
+        :return int: The encrypted value.
+        """
+        half_bits: int = self.half_bits
+        half_mask: int = self.half_mask
+        left: int = value >> half_bits
+        right: int = value & half_mask
+
+        for key in self.keys:
+            left, right = right, left ^ (self._mix(right ^ key) & half_mask)
+
+        return (left << half_bits) | right
+
+    def __getitem__(self, index: int) -> int:
+        """
+        Get the value at a position of the permutation.
+
+        :param index: The position, in range(size).
+        :return int: The value, in range(size).
+        """
+        value: int = self._encrypt(index)
+
+        while value >= self.size:
+            value = self._encrypt(value)
+
+        return value
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class TargetGenerator:
+    """
+    Lazy expansion of CIDR blocks and port ranges into (address, port) endpoints.
+
+    Endpoints are computed from their position, so ranges of billions of endpoints are expanded in constant memory.
+    With a seed, the endpoints come in a pseudo-random order (see FeistelPermutation), which spreads the load over
+    the subnets; a scan can be resumed from the number of endpoints already scanned with the same seed.
+    """
+    def __init__(self, networks: Iterable[str], ports: Union[str, Iterable[int]] = (25565,), seed: Optional[int] = None):
+        """
+        Initialize a new TargetGenerator.
+
+        :param networks: The IPv4 CIDR blocks ("10.0.0.0/8") or addresses, they should not overlap.
+        :param ports: The ports, as a specification ("25565-25575,19132") or a list.
+        :param seed: The seed of the order of the endpoints, the blocks are expanded in order if not provided.
+        """
+        self.networks: List[ipaddress.IPv4Network] = []
+        self.ports: List[int] = self.parse_ports(ports) if isinstance(ports, str) else sorted(set(ports))
+        self.seed: Optional[int] = seed
+
+        # Index of the first address of each network, for the lookup of the network of a position
+        self._offsets: List[int] = []
+        self._first_addresses: List[int] = []
+        addresses: int = 0
+
+        for network in networks:
+            try:
+                # The clients only connect to IPv4 addresses
+                parsed: ipaddress.IPv4Network = ipaddress.IPv4Network(network.strip(), strict=False)
+
+            except ValueError:
+                raise ValueError(f'Invalid network: {network} (expected an IPv4 CIDR block or address)')
+
+            self.networks.append(parsed)
+            self._first_addresses.append(int(parsed.network_address))
+            self._offsets.append(addresses)
+            addresses += parsed.num_addresses
+
+        if not self.networks or not self.ports:
+            raise ValueError('A target generator needs at least one network and one port')
+
+        if any(not 0 < port < 65536 for port in self.ports):
+            raise ValueError('Ports must be between 1 and 65535')
+
+        self.size: int = addresses * len(self.ports)
+        self._permutation: Optional[FeistelPermutation] = None if seed is None else FeistelPermutation(self.size, seed)
+
+    @staticmethod
+    def parse_ports(specification: str) -> List[int]:
+        """
+        Parse a port specification.
+
+        :param specification: Ports and ranges separated by commas ("25565-25575,19132").
+        :return List[int]: The ports, sorted and without duplicates.
+        """
+        ports: Set[int] = set()
+
+        for part in specification.split(','):
+            part = part.strip()
+
+            try:
+                if '-' in part:
+                    first, last = part.split('-', 1)
+                    ports.update(range(int(first), int(last) + 1))
+
+                elif part:
+                    ports.add(int(part))
+
+            except ValueError:
+                raise ValueError(f'Invalid port specification: {part}')
+
+        return sorted(ports)
+
+    @staticmethod
+    def random_seed() -> int:
+        """
+        Get a new random seed, to be kept for resuming the scan.
+
+        :return int: The seed.
+        """
+        return random.getrandbits(32)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[Endpoint]:
+        return self.endpoints()
+
+    def endpoint(self, position: int) -> Endpoint:
+        """
+        Get the endpoint at a position of the expansion.
+
+        :param position: The position, in range(len(self)).
+        :return Endpoint: The (address, port) endpoint.
+        """
+        if self._permutation is not None:
+            position = self._permutation[position]
+
+        address_index, port_index = divmod(position, len(self.ports))
+        network_index: int = bisect.bisect_right(self._offsets, address_index) - 1
+        address: int = self._first_addresses[network_index] + address_index - self._offsets[network_index]
+        return socket.inet_ntoa(struct.pack('>I', address)), self.ports[port_index]
+
+    def endpoints(self, start: int = 0) -> Iterator[Endpoint]:
+        """
+        Expand the endpoints lazily.
+
+        :param start: The number of endpoints to skip (the cursor of a scan to resume), skipped in constant time.
+        :return Iterator[Endpoint]: The (address, port) endpoints.
+        """
+        for position in range(start, self.size):
+            yield self.endpoint(position)
+
+    def targets(self, start: int = 0) -> Iterator[str]:
+        """
+        Expand the endpoints lazily as targets of the clients ("address:port").
+
+        :param start: The number of endpoints to skip.
+        :return Iterator[str]: The targets.
+        """
+        for address, port in self.endpoints(start):
+            yield f'{address}:{port}'
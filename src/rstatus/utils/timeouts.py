@@ -0,0 +1,171 @@
+import math
+import socket
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Hashable, List, Optional
+
+
+@dataclass
+class Timeouts:
+    """ Deadlines of a connection, in seconds """
+    __slots__ = ('connect', 'read', 'total')
+
+    connect: float  # Reaching the server: the TCP connection (Java), the round trip of the ping (Bedrock)
+    read: float  # Each receive once connected
+    total: Optional[float]  # The whole connection, from the connect to the last packet (unbounded if None)
+
+    @classmethod
+    def single(cls, timeout: float) -> 'Timeouts':
+        """
+        Get the timeouts of a single timeout value, which bounds the connect and each receive.
+
+        :param timeout: The timeout in seconds.
+        :return Timeouts: The timeouts.
+        """
+        return cls(connect=timeout, read=timeout, total=None)
+
+
+class AdaptiveTimeouts:
+    """
+    Thread-safe connect timeouts derived from the round-trip times observed by the clients.
+
+    A dead or filtered host never answers, so waiting for it much longer than the round trips of the other servers
+    of its network only wastes time. The connect timeout of a server is a multiple of a percentile of the recent round
+    trips of its bucket (its /16 network by default, or any key such as an ASN), and the default connect timeout while
+    its bucket does not have enough samples yet. A connect that timed out is recorded as a round trip of the timeout,
+    so a bucket whose timeout is too tight for its servers gets a longer one. A server that answered the connect is
+    alive, so the read and total timeouts are never shortened: slow servers are not dropped.
+    """
+    def __init__(
+            self,
+            default: Timeouts,
+            percentile: float = 0.95,
+            factor: float = 3,
+            minimum: float = 0.25,
+            min_samples: int = 16,
+            window: int = 128,
+            prefix_length: int = 16,
+            bucket: Optional[Callable[[str], Hashable]] = None,
+            max_buckets: int = 4096,
+    ):
+        """
+        Initialize a new AdaptiveTimeouts.
+
+        :param default: The timeouts used until a bucket has enough samples, its connect timeout is also the maximum.
+        :param percentile: The percentile of the round-trip times (0.95 for the 95th percentile).
+        :param factor: Multiplier applied to the percentile, the margin for the round trips above it.
+        :param minimum: Minimum connect timeout in seconds.
+        :param min_samples: Number of samples needed before a bucket gets its own timeout.
+        :param window: Number of recent samples kept for each bucket.
+        :param prefix_length: Length of the IPv4 prefix of the buckets, unused with a bucket function.
+        :param bucket: Function returning the bucket of a server address (an ASN lookup...), by IPv4 prefix if not provided.
+        :param max_buckets: Maximum number of buckets kept, the least recently used buckets are removed first.
+        """
+        if not 0 < percentile <= 1:
+            raise ValueError('The percentile must be between 0 (excluded) and 1')
+
+        if not 0 <= prefix_length <= 32:
+            raise ValueError('The prefix length must be between 0 and 32')
+
+        self.default: Timeouts = default
+        self.percentile: float = percentile
+        self.factor: float = factor
+        self.minimum: float = minimum
+        self.min_samples: int = min_samples
+        self.window: int = window
+        self.prefix_length: int = prefix_length
+        self.bucket: Callable[[str], Hashable] = bucket or self._network_bucket
+        self.max_buckets: int = max_buckets
+        self._samples: 'OrderedDict[Hashable, Deque[float]]' = OrderedDict()  # Bucket -> round-trip times
+        self._global: Deque[float] = deque(maxlen=window)  # Recent round trips of every bucket, for monitoring
+        self._connect: Dict[Hashable, float] = {}  # Bucket -> connect timeout, until its next sample
+        self._lock: threading.Lock = threading.Lock()
+
+    def _network_bucket(self, address: str) -> Hashable:
+        """
+        Get the IPv4 network of an address.
+
+        :param address: The address of the server.
+        :return Hashable: The first address of its network as an integer, or the address itself if it is not IPv4.
+        """
+        try:
+            return int.from_bytes(socket.inet_aton(address), 'big') >> (32 - self.prefix_length)
+
+        except OSError:
+            return address
+
+    def _connect_timeout(self, samples: Deque[float]) -> float:
+        """
+        Derive the connect timeout of round-trip times.
+
+        :param samples: The round-trip times in seconds, at least min_samples.
+        :return float: The connect timeout in seconds.
+        """
+        ordered: List[float] = sorted(samples)
+        rtt: float = ordered[max(math.ceil(self.percentile * len(ordered)) - 1, 0)]
+        return min(max(rtt * self.factor, self.minimum), self.default.connect)
+
+    def observe(self, address: str, rtt: float) -> None:
+        """
+        Record the round-trip time of a server (the duration of a TCP connect, or of a Bedrock ping).
+        A connect or ping that timed out is recorded with its timeout, the round trip was at least that long.
+
+        :param address: The address of the server.
+        :param rtt: The round-trip time in seconds.
+        :return None: This function does not return a value.
+        """
+        key: Hashable = self.bucket(address)
+
+        with self._lock:
+            samples: Optional[Deque[float]] = self._samples.get(key)
+
+            if samples is None:
+                if len(self._samples) >= self.max_buckets:
+                    evicted, _ = self._samples.popitem(last=False)
+                    self._connect.pop(evicted, None)
+
+                samples = self._samples[key] = deque(maxlen=self.window)
+
+            else:
+                self._samples.move_to_end(key)
+
+            samples.append(rtt)
+            self._global.append(rtt)
+            self._connect.pop(key, None)
+
+    def timeouts(self, address: str) -> Timeouts:
+        """
+        Get the timeouts of a connection to a server.
+
+        :param address: The address of the server.
+        :return Timeouts: The timeouts.
+        """
+        key: Hashable = self.bucket(address)
+
+        with self._lock:
+            connect: Optional[float] = self._connect.get(key)
+
+            if connect is None:
+                samples: Optional[Deque[float]] = self._samples.get(key)
+
+                # The round trips of other networks say nothing about a network that was not seen yet
+                if samples is None or len(samples) < self.min_samples:
+                    return self.default
+
+                connect = self._connect[key] = self._connect_timeout(samples)
+
+        return Timeouts(connect=connect, read=self.default.read, total=self.default.total)
+
+    def stats(self) -> dict:
+        """
+        Get the state of the adaptive timeouts, for monitoring.
+
+        :return dict: The number of buckets and samples, and the connect timeout derived from every bucket.
+        """
+        with self._lock:
+            return {
+                'buckets': len(self._samples),
+                'samples': len(self._global),
+                'connect': self._connect_timeout(self._global) if len(self._global) >= self.min_samples else self.default.connect,
+            }
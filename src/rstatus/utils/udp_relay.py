@@ -0,0 +1,325 @@
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Deque, Dict, List, Optional, Tuple
+
+# Longest header of a relayed datagram: RSV, FRAG, ATYP, a 255 bytes domain with its length, and the port
+MAX_HEADER_SIZE: int = 262
+
+
+class UdpAssociation:
+    """
+    SOCKS5 UDP association (UDP ASSOCIATE command of RFC 1928).
+
+    The proxy relays the datagrams of a UDP socket for as long as the TCP control connection stays open, so one
+    association carries any number of datagrams to any number of servers. Each datagram sent to the relay starts with
+    a header holding the address of the server, and each datagram received from it with the address of the sender.
+    Only proxies without authentication are supported, like the TCP proxy settings of MinecraftClient.
+    """
+    def __init__(self, proxy_address: str, proxy_port: int, timeout: float = 5):
+        """
+        Initialize a new UdpAssociation, see open.
+
+        :param proxy_address: The address of the SOCKS5 proxy.
+        :param proxy_port: The port of the SOCKS5 proxy.
+        :param timeout: Timeout in seconds of the handshake with the proxy.
+        """
+        self.proxy_address: str = proxy_address
+        self.proxy_port: int = proxy_port
+        self.timeout: float = timeout
+        self.control: Optional[socket.socket] = None  # TCP control connection, the association ends when it is closed
+        self.sock: Optional[socket.socket] = None  # UDP socket connected to the relay of the proxy
+        self.checkouts: int = 0  # Number of queries that used the association (see UdpAssociationPool)
+
+    def open(self) -> None:
+        """
+        Ask the proxy for a UDP association and connect the UDP socket to its relay.
+
+        :return None: This function does not return a value.
+        """
+        control: socket.socket = socket.create_connection((self.proxy_address, self.proxy_port), timeout=self.timeout)
+        sock: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+        try:
+            # Greeting: version 5, one method, no authentication
+            control.sendall(b'\x05\x01\x00')
+
+            if self._read_exactly(control, 2) != b'\x05\x00':
+                raise Exception('The proxy requires an authentication method that is not supported')
+
+            # The request holds the local port of the UDP socket, some relays drop datagrams from other ports
+            sock.bind(('', 0))
+            control.sendall(b'\x05\x03\x00\x01\x00\x00\x00\x00' + struct.pack('>H', sock.getsockname()[1]))
+            reply: bytes = self._read_exactly(control, 4)
+
+            if reply[0] != 5:
+                raise Exception(f'Invalid SOCKS5 reply version: {reply[0]}')
+
+            if reply[1] != 0:
+                raise Exception(f'The proxy refused the UDP association (reply code {reply[1]})')
+
+            address_length: int = {1: 4, 4: 16}.get(reply[3]) or self._read_exactly(control, 1)[0]
+            relay_port: int = struct.unpack('>H', self._read_exactly(control, address_length + 2)[-2:])[0]
+
+            # The relay runs on the proxy host, the address it reports may be private or unspecified
+            sock.connect((control.getpeername()[0], relay_port))
+            sock.settimeout(self.timeout)
+
+        except BaseException:
+            sock.close()
+            control.close()
+            raise
+
+        # Nothing is read from the control connection anymore, see is_alive
+        control.setblocking(False)
+        self.control = control
+        self.sock = sock
+
+    @staticmethod
+    def _read_exactly(sock: socket.socket, length: int) -> bytes:
+        """
+        Read exactly length bytes from the control connection.
+
+        :param sock: The control connection.
+        :param length: The number of bytes to read.
+        :return bytes: The bytes read.
+        """
+        data: bytes = b''
+
+        while len(data) < length:
+            chunk: bytes = sock.recv(length - len(data))
+
+            if not chunk:
+                raise Exception('The proxy closed the connection during the handshake')
+
+            data += chunk
+
+        return data
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _header(address: str, port: int) -> bytes:
+        """
+        Build the header of a datagram sent to a server through the relay.
+
+        :param address: The IP address or domain of the server.
+        :param port: The port of the server.
+        :return bytes: The header.
+        """
+        try:
+            return b'\x00\x00\x00\x01' + socket.inet_pton(socket.AF_INET, address) + struct.pack('>H', port)
+
+        except OSError:
+            pass
+
+        try:
+            return b'\x00\x00\x00\x04' + socket.inet_pton(socket.AF_INET6, address) + struct.pack('>H', port)
+
+        except OSError:
+            encoded: bytes = address.encode('idna')
+            return b'\x00\x00\x00\x03' + bytes([len(encoded)]) + encoded + struct.pack('>H', port)
+
+    def pack(self, data: bytes, address: Tuple[str, int]) -> bytes:
+        """
+        Wrap a datagram for the relay.
+
+        :param data: The datagram sent to the server.
+        :param address: The (address, port) of the server.
+        :return bytes: The datagram sent to the relay.
+        """
+        return self._header(address[0], address[1]) + data
+
+    @staticmethod
+    def unpack(datagram: bytes) -> Tuple[bytes, Tuple[str, int]]:
+        """
+        Unwrap a datagram received from the relay.
+
+        :param datagram: The datagram received from the relay.
+        :return Tuple[bytes, Tuple[str, int]]: The datagram of the server and the (address, port) of the server.
+        """
+        if len(datagram) < 10 or datagram[2] != 0:
+            # Fragments are never sent by the relays in practice, they are dropped like invalid datagrams
+            raise OSError('Invalid or fragmented SOCKS5 UDP datagram')
+
+        address_type: int = datagram[3]
+
+        if address_type == 1:
+            address: str = socket.inet_ntop(socket.AF_INET, datagram[4:8])
+            offset: int = 8
+
+        elif address_type == 4:
+            address = socket.inet_ntop(socket.AF_INET6, datagram[4:20])
+            offset = 20
+
+        elif address_type == 3:
+            offset = 5 + datagram[4]
+            address = datagram[5:offset].decode('idna')
+
+        else:
+            raise OSError(f'Invalid SOCKS5 address type: {address_type}')
+
+        if len(datagram) < offset + 2:
+            raise OSError('Truncated SOCKS5 UDP datagram')
+
+        return datagram[offset + 2:], (address, struct.unpack_from('>H', datagram, offset)[0])
+
+    def sendto(self, data: bytes, address: Tuple[str, int]) -> int:
+        """
+        Send a datagram to a server through the relay.
+
+        :param data: The datagram.
+        :param address: The (address, port) of the server.
+        :return int: The number of bytes of the datagram sent.
+        """
+        packet: bytes = self.pack(data, address)
+        return self.sock.send(packet) - (len(packet) - len(data))
+
+    def recvfrom(self, bufsize: int) -> Tuple[bytes, Tuple[str, int]]:
+        """
+        Receive a datagram of a server through the relay.
+
+        :param bufsize: The maximum size of the datagram.
+        :return Tuple[bytes, Tuple[str, int]]: The datagram and the (address, port) of the server that sent it.
+        """
+        data, address = self.unpack(self.sock.recv(bufsize + MAX_HEADER_SIZE))
+        return data[:bufsize], address
+
+    def is_alive(self) -> bool:
+        """
+        Check if the association can still be used (the proxy did not close the control connection).
+
+        :return bool: True if the association is open.
+        """
+        if self.sock is None:
+            return False
+
+        try:
+            return self.control.recv(1, socket.MSG_PEEK) != b''
+
+        except BlockingIOError:
+            return True
+
+        except OSError:
+            return False
+
+    def fileno(self) -> int:
+        return self.sock.fileno()
+
+    def settimeout(self, timeout: Optional[float]) -> None:
+        self.sock.settimeout(timeout)
+
+    def setblocking(self, flag: bool) -> None:
+        self.sock.setblocking(flag)
+
+    def setsockopt(self, level: int, option: int, value: int) -> None:
+        self.sock.setsockopt(level, option, value)
+
+    def shutdown(self, how: int) -> None:
+        self.sock.shutdown(how)
+
+    def close(self) -> None:
+        """ End the association. """
+        if self.sock is not None:
+            self.sock.close()
+            self.control.close()
+            self.sock = None
+
+
+class UdpAssociationPool:
+    """
+    Thread-safe pool of idle SOCKS5 UDP associations, shared by the Bedrock queries of the process.
+
+    A query takes an idle association of its proxy (or opens a new one) and gives it back when it is done, so the
+    handshake with the proxy is made once for many pings. An association is only used by one query at a time,
+    so its pongs never reach another query.
+    """
+    def __init__(self, max_idle: int = 8, idle_timeout: float = 60):
+        """
+        Initialize a new UdpAssociationPool.
+
+        :param max_idle: Maximum number of idle associations kept for each proxy.
+        :param idle_timeout: Time in seconds after which an idle association is closed (proxies close idle relays).
+        """
+        self.max_idle: int = max_idle
+        self.idle_timeout: float = idle_timeout
+        self._idle: Dict[Tuple[str, int], Deque[Tuple[float, UdpAssociation]]] = {}  # Proxy -> (idle since, association)
+        self._lock: threading.Lock = threading.Lock()
+
+    def checkout(self, proxy_address: str, proxy_port: int, timeout: float = 5) -> UdpAssociation:
+        """
+        Take an idle association of a proxy, or open a new one.
+
+        :param proxy_address: The address of the SOCKS5 proxy.
+        :param proxy_port: The port of the SOCKS5 proxy.
+        :param timeout: Timeout in seconds of the handshake and of the socket operations.
+        :return UdpAssociation: The association, to give back with checkin.
+        """
+        association: Optional[UdpAssociation] = None
+        expired: List[UdpAssociation] = []
+
+        with self._lock:
+            idle: Deque[Tuple[float, UdpAssociation]] = self._idle.get((proxy_address, proxy_port), deque())
+            now: float = time.monotonic()
+
+            # The most recently used associations are the most likely to be alive
+            while idle:
+                idle_since, candidate = idle.pop()
+
+                if now - idle_since < self.idle_timeout:
+                    association = candidate
+                    break
+
+                expired.append(candidate)
+
+            # The remaining associations are older, so they expired too
+            while idle and now - idle[0][0] >= self.idle_timeout:
+                expired.append(idle.popleft()[1])
+
+        for candidate in expired:
+            candidate.close()
+
+        if association is None or not association.is_alive():
+            if association is not None:
+                association.close()
+
+            association = UdpAssociation(proxy_address, proxy_port, timeout)
+            association.open()
+
+        association.checkouts += 1
+        association.settimeout(timeout)
+        return association
+
+    def checkin(self, association: UdpAssociation) -> None:
+        """
+        Give back an association taken with checkout.
+
+        :param association: The association.
+        :return None: This function does not return a value.
+        """
+        if not association.is_alive():
+            association.close()
+            return
+
+        with self._lock:
+            idle: Deque[Tuple[float, UdpAssociation]] = self._idle.setdefault((association.proxy_address, association.proxy_port), deque())
+
+            if len(idle) < self.max_idle:
+                idle.append((time.monotonic(), association))
+                return
+
+        association.close()
+
+    def clear(self) -> None:
+        """ Close every idle association. """
+        with self._lock:
+            associations: List[UdpAssociation] = [association for idle in self._idle.values() for _, association in idle]
+            self._idle.clear()
+
+        for association in associations:
+            association.close()
+
+
+udp_association_pool: UdpAssociationPool = UdpAssociationPool()